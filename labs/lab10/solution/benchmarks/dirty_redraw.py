@@ -0,0 +1,71 @@
+"""
+Animates the raster_throughput scene by moving 1% of its shapes every
+frame and compares the frame time of a full render() with redraw(), which
+only repaints the tiles around the shapes that moved. The last incremental
+frame is checked against a full render of the same scene.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.dirty_redraw [shapes] [frames] [tile_size]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.raster_throughput import HEIGHT, WIDTH, make_scene
+from renderers.framebuffer_renderer import FramebufferRenderer
+from shapes.triangle import Triangle
+
+
+def move(shapes, rng: random.Random, fraction: float = 0.01) -> None:
+    for shape in rng.sample(shapes, max(1, int(len(shapes) * fraction))):
+        dx, dy = rng.uniform(-10, 10), rng.uniform(-10, 10)
+        if isinstance(shape, Triangle):
+            shape.x1, shape.y1 = shape.x1 + dx, shape.y1 + dy
+            shape.x2, shape.y2 = shape.x2 + dx, shape.y2 + dy
+            shape.x3, shape.y3 = shape.x3 + dx, shape.y3 + dy
+        else:
+            shape.x, shape.y = shape.x + dx, shape.y + dy
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tile_size = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    renderer = FramebufferRenderer(WIDTH, HEIGHT)
+    scene = make_scene(count, renderer)
+    shapes = [shape for group in scene.children for shape in group.children]
+    rng = random.Random(2)
+
+    # Shapes print a line per draw(); send it to the null device
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        for _ in range(frames):
+            move(shapes, rng)
+            renderer.render(scene)
+        full = (time.perf_counter() - start) / frames
+
+        tiles = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            move(shapes, rng)
+            tiles += renderer.redraw(scene, tile_size)
+        incremental = (time.perf_counter() - start) / frames
+
+        incremental_frame = renderer.framebuffer.copy()
+        renderer.render(scene)
+    same = np.array_equal(incremental_frame, renderer.framebuffer)
+
+    total_tiles = -(-WIDTH // tile_size) * -(-HEIGHT // tile_size)
+    print(f"{count:,} shapes, {WIDTH}x{HEIGHT}, 1% moving per frame, {frames} frames each")
+    print(f"  full render:  {full * 1000:8.1f} ms/frame")
+    print(f"  dirty redraw: {incremental * 1000:8.1f} ms/frame "
+          f"({tiles / frames:,.0f} of {total_tiles:,} {tile_size}px tiles, {full / incremental:.1f}x faster)")
+    print(f"  last incremental frame matches a full render: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Sends the same stream of circle, rectangle and triangle draws to
+OpenGLRenderer directly (one simulated glBegin/glEnd per shape) and through
+a BatchingRenderer (one per primitive kind), and reports draws per second.
+Does the same for FramebufferRenderer, whose bulk methods fill each batch
+with a few array operations.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.draw_batching [draws]
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+
+from renderers.batching_renderer import BatchingRenderer
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.opengl_renderer import OpenGLRenderer
+
+
+def issue_draws(renderer, count: int) -> None:
+    rng = random.Random(2)
+    draw_circle, draw_rectangle, draw_triangle = \
+        renderer.draw_circle, renderer.draw_rectangle, renderer.draw_triangle
+    for i in range(count):
+        x, y = rng.random() * 1000, rng.random() * 1000
+        kind = i % 3
+        if kind == 0:
+            draw_circle(x, y, 5.0)
+        elif kind == 1:
+            draw_rectangle(x, y, 10.0, 6.0)
+        else:
+            draw_triangle(x, y, x + 5, y + 8, x + 10, y)
+
+
+def bench(make_renderer, count: int) -> tuple:
+    # Renderer output is captured in memory: its size is the work the backend was given
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        start = time.perf_counter()
+        renderer = make_renderer()
+        issue_draws(renderer, count)
+        if isinstance(renderer, BatchingRenderer):
+            renderer.flush()
+        elapsed = time.perf_counter() - start
+    return count / elapsed, out.getvalue().count("glBegin")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    results = [("OpenGLRenderer", bench(OpenGLRenderer, count)),
+               ("BatchingRenderer(OpenGLRenderer)", bench(lambda: BatchingRenderer(OpenGLRenderer()), count)),
+               ("  batch_size=10,000", bench(lambda: BatchingRenderer(OpenGLRenderer(), 10_000), count))]
+    rasterized = [("FramebufferRenderer", bench(lambda: FramebufferRenderer(1024, 1024), count)),
+                  ("BatchingRenderer(FramebufferRenderer)",
+                   bench(lambda: BatchingRenderer(FramebufferRenderer(1024, 1024)), count))]
+
+    print(f"{count:,} draws (circles, rectangles, triangles)")
+    for label, (rate, batches) in results:
+        print(f"{label:<38} {rate:>12,.0f} draws/s  {batches:>9,} glBegin/glEnd pairs")
+    for label, (rate, _) in rasterized:
+        print(f"{label:<38} {rate:>12,.0f} draws/s")
+
+
+if __name__ == "__main__":
+    main()
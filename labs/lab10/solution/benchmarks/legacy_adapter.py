@@ -0,0 +1,75 @@
+"""
+Measures what the LegacyRendererAdapter costs over renderers that draw
+directly. A large scene is sent (with output going to the null device)
+to RasterRenderer and VectorRenderer, to the adapter shape by shape, and
+to the adapter through its batched draw_*s path, which is what a
+ShapeRange or a BatchingRenderer uses. NullRenderer shows the cost of
+the calls alone.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.legacy_adapter [shapes]
+"""
+import contextlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.viewport_culling import NullRenderer
+from renderers.legacy_renderer_adapter import LegacyRendererAdapter
+from renderers.raster_renderer import RasterRenderer
+from renderers.vector_renderer import VectorRenderer
+
+
+def primitives(count: int):
+    rng = np.random.default_rng(11)
+    third = count // 3
+    x, y = rng.uniform(0, 1_000, (2, third))
+    size = rng.uniform(1, 4, (2, third))
+    return ((x, y, size[0]),
+            (x, y, size[0], size[1]),
+            (x, y, x + size[0], y, x, y + size[1]))
+
+
+def shape_by_shape(renderer, scene) -> None:
+    circles, rectangles, triangles = ([column.tolist() for column in kind] for kind in scene)
+    draw_circle, draw_rectangle, draw_triangle = renderer.draw_circle, renderer.draw_rectangle, renderer.draw_triangle
+    for args in zip(*circles):
+        draw_circle(*args)
+    for args in zip(*rectangles):
+        draw_rectangle(*args)
+    for args in zip(*triangles):
+        draw_triangle(*args)
+
+
+def batched(renderer, scene) -> None:
+    circles, rectangles, triangles = ([column.tolist() for column in kind] for kind in scene)
+    renderer.draw_circles(*circles)
+    renderer.draw_rectangles(*rectangles)
+    renderer.draw_triangles(*triangles)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    scene = primitives(count)
+    runs = (("NullRenderer", NullRenderer(), shape_by_shape),
+            ("RasterRenderer", RasterRenderer(), shape_by_shape),
+            ("VectorRenderer (printing)", VectorRenderer(), shape_by_shape),
+            ("adapter, shape by shape", LegacyRendererAdapter(), shape_by_shape),
+            ("adapter, batched", LegacyRendererAdapter(), batched))
+    print(f"{count:,} shapes (a third each of circles, rectangles and triangles)")
+    baseline = None
+    for name, renderer, draw in runs:
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            draw(renderer, scene)
+            elapsed = time.perf_counter() - start
+        if name == "RasterRenderer":
+            baseline = elapsed
+        relative = f", {elapsed / baseline:4.2f}x RasterRenderer" if baseline else ""
+        print(f"  {name:<26} {elapsed:6.2f} s, {elapsed / count * 1e6:5.2f} µs/shape{relative}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Rasterizes a CompositeShape scene of random circles, rectangles and
+triangles into a FramebufferRenderer and reports shapes per second.
+Pass an output path to also save the frame (.png or .ppm).
+
+Run from the lab10/solution folder:
+    python -m benchmarks.raster_throughput [shapes] [output]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from renderers.framebuffer_renderer import FramebufferRenderer
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def make_scene(count: int, renderer, seed: int = 1, group_size: int = 1_000) -> CompositeShape:
+    rng = random.Random(seed)
+    scene = CompositeShape()
+    group = None
+    for i in range(count):
+        if i % group_size == 0:
+            group = CompositeShape()
+            scene.add(group)
+        x, y = rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)
+        kind = i % 3
+        if kind == 0:
+            group.add(Circle(renderer, x, y, rng.uniform(2, 20)))
+        elif kind == 1:
+            group.add(Rectangle(renderer, x, y, rng.uniform(4, 40), rng.uniform(4, 40)))
+        else:
+            group.add(Triangle(renderer, x, y, x + rng.uniform(-30, 30), y + rng.uniform(-30, 30),
+                               x + rng.uniform(-30, 30), y + rng.uniform(-30, 30)))
+    return scene
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    output = sys.argv[2] if len(sys.argv) > 2 else None
+    renderer = FramebufferRenderer(WIDTH, HEIGHT)
+    scene = make_scene(count, renderer)
+
+    # Shapes print a line per draw(); send it to the null device
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        scene.draw()
+        elapsed = time.perf_counter() - start
+
+    print(f"{count:,} shapes into a {WIDTH}x{HEIGHT} framebuffer in {elapsed:.2f} s "
+          f"({count / elapsed:,.0f} shapes/s)")
+    if output:
+        renderer.save(output)
+        print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
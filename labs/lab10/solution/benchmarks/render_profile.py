@@ -0,0 +1,104 @@
+"""
+Profiles a nested scene (regions of blocks of shapes) on several
+renderers with ProfilingRenderer: calls, primitives and time per draw
+method for each renderer, the most expensive composite stacks, and what
+profiling costs over an unprofiled draw. Renderer output goes to the
+null device.
+
+With a path, the collapsed stacks of all renderers are written there,
+ready for flamegraph.pl or speedscope.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.render_profile [shapes] [collapsed-stacks-path]
+"""
+import contextlib
+import gc
+import os
+import random
+import sys
+import time
+
+from benchmarks.viewport_culling import NullRenderer
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.profiling_renderer import ProfilingRenderer
+from renderers.raster_renderer import RasterRenderer
+from renderers.vector_renderer import VectorRenderer
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+def make_scene(renderer, count: int, regions: int = 4, blocks: int = 5) -> CompositeShape:
+    rng = random.Random(5)
+    scene = CompositeShape("scene")
+    per_block = max(count // (regions * blocks), 1)
+    for region_number in range(regions):
+        region = CompositeShape(f"region {region_number}")
+        for block_number in range(blocks):
+            block = CompositeShape(f"block {block_number}")
+            for i in range(per_block):
+                x, y = rng.uniform(0, 500), rng.uniform(0, 500)
+                kind = (i + region_number) % 3
+                if kind == 0:
+                    block.add(Circle(renderer, x, y, rng.uniform(1, 6)))
+                elif kind == 1:
+                    block.add(Rectangle(renderer, x, y, rng.uniform(2, 12), rng.uniform(2, 12)))
+                else:
+                    block.add(Triangle(renderer, x, y, x + 6, y + 10, x + 12, y))
+            region.add(block)
+        scene.add(region)
+    return scene
+
+
+def timed_draw(scene, repeat: int = 3) -> float:
+    # Best of a few draws
+    best = float("inf")
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            scene.draw()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    path = sys.argv[2] if len(sys.argv) > 2 else None
+    targets = [("NullRenderer", NullRenderer),
+               ("RasterRenderer", RasterRenderer),
+               ("VectorRenderer", VectorRenderer),
+               ("FramebufferRenderer", lambda: FramebufferRenderer(512, 512))]
+
+    print(f"{count:,} shapes in 4 regions of 5 blocks")
+    profiles = []
+    for label, make_target in targets:
+        plain = timed_draw(make_scene(make_target(), count))
+        profiler = ProfilingRenderer(make_target())
+        scene = make_scene(profiler, count)
+        with profiler.trace():
+            profiled = timed_draw(scene)
+        # Keep the profile of one draw
+        profiler.reset()
+        with profiler.trace():
+            timed_draw(scene, repeat=1)
+        profiles.append(profiler)
+        print()
+        print(profiler.report())
+        print(f"  unprofiled {plain * 1e3:.1f} ms, profiled {profiled * 1e3:.1f} ms "
+              f"({profiled / plain:.2f}x)")
+        stacks = sorted((line.rsplit(" ", 1) for line in profiler.collapsed_stacks()),
+                        key=lambda stack: -int(stack[1]))
+        for stack, nanoseconds in stacks[:3]:
+            print(f"  {int(nanoseconds) / 1e6:>9.2f} ms  {stack}")
+
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            for profiler in profiles:
+                profiler.write_collapsed(f)
+        print(f"\nCollapsed stacks written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Saves a large scene (groups of groups of ShapeStore blocks) in the binary
+scene format and measures opening it and drawing one small subtree
+lazily, against reading all of it. For scenes up to 300,000 shapes it
+also compares JSON export and import.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.scene_load [shapes]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.viewport_culling import NullRenderer
+from shapes.composite_shape import CompositeShape
+from shapes.scene_file import SceneFile, load_json, load_scene, save_json, save_scene
+from shapes.shape_store import ShapeStore
+
+FANOUT = 100
+
+
+def make_scene(count: int, renderer) -> CompositeShape:
+    # FANOUT groups of FANOUT leaf groups, each with a block of circles, rectangles and triangles
+    rng = np.random.default_rng(9)
+    store = ShapeStore(renderer, capacity=count)
+    per_leaf = max(count // (FANOUT * FANOUT * 3), 1)
+    scene = CompositeShape()
+    for i in range(FANOUT):
+        group = CompositeShape()
+        for j in range(FANOUT):
+            x0, y0 = i * 1_000.0, j * 1_000.0
+            x, y = rng.uniform(x0, x0 + 1_000, (2, per_leaf))
+            size = rng.uniform(1, 20, (4, per_leaf))
+            leaf = CompositeShape()
+            leaf.add(store.add_circles(x, y, size[0]))
+            leaf.add(store.add_rectangles(x, y, size[0], size[1]))
+            leaf.add(store.add_triangles(x, y, x + size[0], y, x, y + size[1]))
+            group.add(leaf)
+        scene.add(group)
+    return scene
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    renderer = NullRenderer()
+    scene = make_scene(count, renderer)
+    shapes = len(scene.children[0].children[0].children[0]) * 3 * FANOUT * FANOUT
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as sink, \
+            contextlib.redirect_stdout(sink):
+        path = os.path.join(directory, "scene.bin")
+        _, saved = timed(lambda: save_scene(scene, path))
+        size = os.path.getsize(path)
+
+        def open_and_draw_one_leaf():
+            with SceneFile(path, renderer) as scene_file:
+                scene_file.root.load().children[42].load().children[7].draw()
+        _, lazy = timed(open_and_draw_one_leaf)
+        _, into_store = timed(lambda: load_scene(path, renderer, ShapeStore(renderer, capacity=count)))
+        loaded, as_objects = timed(lambda: load_scene(path, renderer)) if shapes <= 300_000 else (None, None)
+        del loaded
+
+        if shapes <= 300_000:
+            json_path = os.path.join(directory, "scene.json")
+            _, json_saved = timed(lambda: save_json(scene, json_path))
+            json_size = os.path.getsize(json_path)
+            _, json_loaded = timed(lambda: load_json(json_path, renderer))
+
+    def line(name, seconds, note=""):
+        print(f"  {name:<36} {seconds:8.3f} s{note}")
+
+    print(f"{shapes:,} shapes in {FANOUT * FANOUT:,} leaf groups")
+    line("binary save", saved, f"  ({size / 2**20:.1f} MiB, {size / shapes:.1f} B/shape)")
+    line("open + draw one leaf group (lazy)", lazy)
+    line("load everything into a ShapeStore", into_store)
+    if as_objects is not None:
+        line("load everything as shape objects", as_objects)
+        line("JSON save", json_saved, f"  ({json_size / 2**20:.1f} MiB, {json_size / shapes:.1f} B/shape)")
+        line("JSON load (shape objects)", json_loaded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares a scene of ordinary Circle/Rectangle/Triangle objects with the
+same scene kept in a ShapeStore (one ShapeRange per block of shapes):
+memory used, time to build, and time to draw everything and a small
+viewport into a renderer that does nothing.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.shape_store [shapes] [block_size]
+"""
+import contextlib
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.viewport_culling import NullRenderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.shape_store import ShapeStore
+from shapes.triangle import Triangle
+
+WORLD = 10_000.0
+
+
+def geometry(count: int, seed: int = 4):
+    # Thirds of circles, rectangles and triangles, each third as one array per field. Sorted
+    # by x, so that each block of consecutive shapes covers a strip of the world and culls well.
+    rng = np.random.default_rng(seed)
+    third = count // 3
+    x, y = np.sort(rng.uniform(0, WORLD, third)), rng.uniform(0, WORLD, third)
+    circles = (x, y, rng.uniform(1, 10, third))
+    rectangles = (x, y, rng.uniform(1, 20, third), rng.uniform(1, 20, third))
+    triangles = (x, y, x + rng.uniform(-15, 15, third), y + rng.uniform(-15, 15, third),
+                 x + rng.uniform(-15, 15, third), y + rng.uniform(-15, 15, third))
+    return circles, rectangles, triangles
+
+
+def object_scene(data, renderer, block_size: int) -> CompositeShape:
+    scene = CompositeShape()
+    for kind, columns in zip((Circle, Rectangle, Triangle), data):
+        rows = list(zip(*(column.tolist() for column in columns)))
+        for start in range(0, len(rows), block_size):
+            group = CompositeShape()
+            for row in rows[start:start + block_size]:
+                group.add(kind(renderer, *row))
+            scene.add(group)
+    return scene
+
+
+def store_scene(data, renderer, block_size: int) -> CompositeShape:
+    scene = CompositeShape()
+    store = ShapeStore(renderer)
+    for add, columns in zip((store.add_circles, store.add_rectangles, store.add_triangles), data):
+        for start in range(0, len(columns[0]), block_size):
+            scene.add(add(*(column[start:start + block_size] for column in columns)))
+    return scene
+
+
+def measure(build, data, renderer, block_size: int):
+    # Build once for memory and once for time, since tracing allocations slows building down
+    gc.collect()
+    tracemalloc.start()
+    scene = build(data, renderer, block_size)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del scene
+    gc.collect()
+    start = time.perf_counter()
+    scene = build(data, renderer, block_size)
+    built = time.perf_counter() - start
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        start = time.perf_counter()
+        scene.draw()
+        drawn = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(100):
+            corner = i * WORLD / 100
+            scene.draw(BoundingBox(corner, corner, corner + 200, corner + 200))
+        culled = (time.perf_counter() - start) / 100
+    return memory, built, drawn, culled
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    data = geometry(count)
+    renderer = NullRenderer()
+    print(f"{count:,} shapes in blocks of {block_size:,}")
+    for name, build in (("objects", object_scene), ("ShapeStore", store_scene)):
+        memory, built, drawn, culled = measure(build, data, renderer, block_size)
+        print(f"  {name:<10} {memory / 2**20:8.1f} MiB ({memory / count:5.0f} B/shape), "
+              f"build {built:6.2f} s, draw all {drawn:6.2f} s, draw 200x200 viewport {culled * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
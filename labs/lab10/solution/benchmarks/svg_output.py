@@ -0,0 +1,67 @@
+"""
+Streams a scene of circles, rectangles and triangles (kept in a
+ShapeStore, with sizes and triangle shapes drawn from small sets so that
+geometry repeats) to SVG files with different VectorRenderer settings,
+and reports elements per second and file sizes.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.svg_output [shapes]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from renderers.vector_renderer import VectorRenderer
+from shapes.composite_shape import CompositeShape
+from shapes.shape_store import ShapeStore
+
+WIDTH, HEIGHT = 1920, 1080
+SETTINGS = (("full precision", dict(precision=None, dedupe=False)),
+            ("2 decimals", dict(precision=2, dedupe=False)),
+            ("2 decimals + <use>", dict(precision=2, dedupe=True)),
+            ("0 decimals + <use>", dict(precision=0, dedupe=True)))
+
+
+def make_scene(count: int, renderer, block_size: int = 10_000, seed: int = 8) -> CompositeShape:
+    rng = np.random.default_rng(seed)
+    third = count // 3
+    x, y = rng.uniform(0, WIDTH, third), rng.uniform(0, HEIGHT, third)
+    corners = rng.integers(-20, 21, (50, 4))[rng.integers(0, 50, third)]
+    store = ShapeStore(renderer)
+    blocks = (store.add_circles(x, y, rng.integers(1, 21, third)),
+              store.add_rectangles(x, y, 5 * rng.integers(1, 9, third), 5 * rng.integers(1, 9, third)),
+              store.add_triangles(x, y, x + corners[:, 0], y + corners[:, 1], x + corners[:, 2], y + corners[:, 3]))
+    scene = CompositeShape()
+    for block in blocks:
+        for start in range(block.start, block.stop, block_size):
+            scene.add(store.range(block.columns.kind, start, min(start + block_size, block.stop)))
+    return scene
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    print(f"{count:,} shapes")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as sink:
+        for name, options in SETTINGS:
+            path = os.path.join(directory, "scene.svg")
+            renderer = VectorRenderer(path, WIDTH, HEIGHT, **options)
+            scene = make_scene(count, renderer)
+            with contextlib.redirect_stdout(sink):
+                start = time.perf_counter()
+                scene.draw()
+                renderer.close()
+                elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            baseline = baseline or size
+            print(f"  {name:<20} {renderer.elements / elapsed:9,.0f} elements/s, {size / 2**20:6.1f} MiB "
+                  f"({size / renderer.elements:4.1f} B/element, {size / baseline:4.0%} of full precision), "
+                  f"{renderer.templates} templates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Renders the raster_throughput scene with a TiledRenderer using 1, 2, ...
+up to N worker processes and reports the time and speedup of each, next
+to a single FramebufferRenderer. Recording the scene (calling draw() on
+every shape) stays in the main process; the table shows it separately
+from the parallel rasterization. Every image is checked against the
+single renderer's.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.tiled_scaling [shapes] [max_workers] [tile_size]
+"""
+import contextlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.raster_throughput import HEIGHT, WIDTH, make_scene
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.tiled_renderer import TiledRenderer
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    tile_size = int(sys.argv[3]) if len(sys.argv) > 3 else 128
+
+    print(f"{count:,} shapes into {WIDTH}x{HEIGHT}, {tile_size}px tiles, {os.cpu_count()} CPU(s) available")
+    with open(os.devnull, "w") as sink:
+        single = FramebufferRenderer(WIDTH, HEIGHT)
+        scene = make_scene(count, single)
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            single.render(scene)
+            baseline = time.perf_counter() - start
+        print(f"  FramebufferRenderer: {baseline:6.2f} s")
+
+        for workers in range(1, max_workers + 1):
+            with TiledRenderer(WIDTH, HEIGHT, workers=workers, tile_size=tile_size) as renderer:
+                scene = make_scene(count, renderer)
+                with contextlib.redirect_stdout(sink):
+                    if workers > 1:
+                        # Start the pool before timing
+                        renderer.flush()
+                    start = time.perf_counter()
+                    scene.take_dirty_regions()
+                    renderer.clear()
+                    scene.draw()
+                    recorded = time.perf_counter() - start
+                    tiles = renderer.flush()
+                    total = time.perf_counter() - start
+                same = np.array_equal(renderer.framebuffer, single.framebuffer)
+            if workers == 1:
+                serial = total - recorded
+            print(f"  {workers:2} worker(s): record {recorded:5.2f} s + rasterize {total - recorded:6.2f} s "
+                  f"({tiles} tiles) = {total:6.2f} s, rasterize speedup {serial / (total - recorded):4.2f}x, "
+                  f"overall {baseline / total:4.2f}x, same image: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Builds a large scene (tiles of shapes grouped into CompositeShapes) and
+compares drawing all of it with drawing small viewports, which only visits
+the children the quadtree finds there. Also measures shapes_at() hit tests.
+
+Run from the lab10/solution folder:
+    python -m benchmarks.viewport_culling [shapes]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+WORLD = 100_000.0
+
+
+class NullRenderer(Renderer):
+    def draw_circle(self, x, y, radius):
+        pass
+
+    def draw_rectangle(self, x, y, width, height):
+        pass
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        pass
+
+
+def make_scene(count: int, renderer: Renderer, tiles: int = 100) -> CompositeShape:
+    rng = random.Random(6)
+    tile = WORLD / tiles
+    groups = [CompositeShape() for _ in range(tiles * tiles)]
+    for i in range(count):
+        x, y = rng.uniform(0, WORLD), rng.uniform(0, WORLD)
+        kind = i % 3
+        if kind == 0:
+            shape = Circle(renderer, x, y, rng.uniform(1, 20))
+        elif kind == 1:
+            shape = Rectangle(renderer, x, y, rng.uniform(2, 40), rng.uniform(2, 40))
+        else:
+            shape = Triangle(renderer, x, y, x + rng.uniform(-20, 20), y + rng.uniform(-20, 20),
+                             x + rng.uniform(-20, 20), y + rng.uniform(-20, 20))
+        groups[int(y // tile) * tiles + int(x // tile)].add(shape)
+    scene = CompositeShape()
+    for group in groups:
+        scene.add(group)
+    return scene
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(3)
+    start = time.perf_counter()
+    scene = make_scene(count, NullRenderer())
+    build = time.perf_counter() - start
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        full = timed(scene.draw)
+        viewport_results = []
+        for size in (2_000.0, 500.0):
+            viewports = [BoundingBox(x, y, x + size, y + size)
+                         for x, y in ((rng.uniform(0, WORLD - size), rng.uniform(0, WORLD - size))
+                                      for _ in range(100))]
+            elapsed = timed(lambda: [scene.draw(viewport) for viewport in viewports])
+            viewport_results.append((size, elapsed / len(viewports)))
+    points = [(rng.uniform(0, WORLD), rng.uniform(0, WORLD)) for _ in range(10_000)]
+    hits = timed(lambda: [scene.shapes_at(x, y) for x, y in points])
+
+    print(f"{count:,} shapes in a {WORLD:,.0f} x {WORLD:,.0f} world, built in {build:.1f} s")
+    print(f"full draw                      {full * 1e3:>10,.1f} ms")
+    for size, elapsed in viewport_results:
+        label = f"{size:,.0f} x {size:,.0f} viewport"
+        print(f"{label:<30} {elapsed * 1e3:>10,.2f} ms  ({full / elapsed:,.0f}x faster)")
+    print(f"shapes_at()                    {len(points) / hits:>10,.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
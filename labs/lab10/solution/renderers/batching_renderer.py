@@ -0,0 +1,108 @@
+from array import array
+from typing import Optional
+from renderers.renderer import Renderer, column_length
+
+class BatchingRenderer(Renderer):
+    """
+    A Renderer that records draw calls instead of drawing them, and later
+    hands them to the wrapped Renderer in bulk.
+
+    Each primitive kind has struct-of-arrays buffers (one compact array of
+    doubles per coordinate). flush() sends each non-empty buffer to the
+    target's draw_circles/draw_rectangles/draw_triangles in one call, so the
+    target does work per primitive kind rather than per shape.
+
+    Batching groups primitives by kind: within a flush all circles are drawn
+    first, then rectangles, then triangles. Where overlapping shapes must keep
+    their draw order, call flush() between the layers.
+
+    Buffers flush on their own once batch_size primitives are pending, and
+    when the renderer is used as a context manager, on exit.
+    """
+
+    def __init__(self, target: Renderer, batch_size: Optional[int] = None):
+        self.target = target
+        self.batch_size = batch_size
+        self._circles = tuple(array("d") for _ in range(3))
+        self._rectangles = tuple(array("d") for _ in range(4))
+        self._triangles = tuple(array("d") for _ in range(6))
+        self._pending = 0
+        # Pre-bound appends: recording a call is then just a few appends
+        self._circle_appends = tuple(column.append for column in self._circles)
+        self._rectangle_appends = tuple(column.append for column in self._rectangles)
+        self._triangle_appends = tuple(column.append for column in self._triangles)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of recorded primitives not yet flushed.
+        """
+        return self._pending
+
+    def draw_circle(self, x: float, y: float, radius: float) -> None:
+        add_x, add_y, add_radius = self._circle_appends
+        add_x(x)
+        add_y(y)
+        add_radius(radius)
+        self._recorded()
+
+    def draw_rectangle(self, x: float, y: float, width: float, height: float) -> None:
+        add_x, add_y, add_width, add_height = self._rectangle_appends
+        add_x(x)
+        add_y(y)
+        add_width(width)
+        add_height(height)
+        self._recorded()
+
+    def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
+        add_x1, add_y1, add_x2, add_y2, add_x3, add_y3 = self._triangle_appends
+        add_x1(x1)
+        add_y1(y1)
+        add_x2(x2)
+        add_y2(y2)
+        add_x3(x3)
+        add_y3(y3)
+        self._recorded()
+
+    def draw_circles(self, xs, ys, radii) -> None:
+        count = column_length(xs, ys, radii)
+        for column, values in zip(self._circles, (xs, ys, radii)):
+            column.extend(values)
+        self._recorded(count)
+
+    def draw_rectangles(self, xs, ys, widths, heights) -> None:
+        count = column_length(xs, ys, widths, heights)
+        for column, values in zip(self._rectangles, (xs, ys, widths, heights)):
+            column.extend(values)
+        self._recorded(count)
+
+    def draw_triangles(self, x1s, y1s, x2s, y2s, x3s, y3s) -> None:
+        count = column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        for column, values in zip(self._triangles, (x1s, y1s, x2s, y2s, x3s, y3s)):
+            column.extend(values)
+        self._recorded(count)
+
+    def flush(self) -> None:
+        """
+        Send everything recorded so far to the target, one bulk call per primitive kind.
+        """
+        if self._circles[0]:
+            self.target.draw_circles(*self._circles)
+        if self._rectangles[0]:
+            self.target.draw_rectangles(*self._rectangles)
+        if self._triangles[0]:
+            self.target.draw_triangles(*self._triangles)
+        for column in self._circles + self._rectangles + self._triangles:
+            del column[:]
+        self._pending = 0
+
+    def __enter__(self) -> "BatchingRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def _recorded(self, count: int = 1) -> None:
+        self._pending += count
+        if self.batch_size is not None and self._pending >= self.batch_size:
+            self.flush()
@@ -0,0 +1,303 @@
+import math
+import struct
+import zlib
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from renderers.renderer import Renderer, column_length
+from shapes.bounds import BoundingBox
+
+if TYPE_CHECKING:
+    from shapes.composite_shape import CompositeShape
+
+Color = Tuple[int, int, int]
+
+class FramebufferRenderer(Renderer):
+    """
+    A concrete Renderer that really rasterizes: shapes are filled into an
+    RGB framebuffer (a height x width x 3 NumPy array) that can be saved as
+    PPM or PNG.
+
+    Each fill only touches the shape's bounding box, clipped to the
+    framebuffer, and tests all of its pixels at once: rectangles are a slice
+    assignment, circles a distance mask and triangles three edge functions.
+    A pixel is filled when its center lies inside the shape. Scene units are
+    multiplied by scale to get pixels; y grows downwards as in image files.
+
+    render(scene) draws a whole frame; after that, redraw(scene) repaints
+    only the tiles touched by the scene's dirty regions (see CompositeShape):
+    it clears them and draws each shape overlapping them once, in draw
+    order, with every fill masked to the dirty tiles. When more than
+    FULL_REDRAW_FRACTION of the tiles are dirty, drawing the whole scene is
+    cheaper, so it does that instead.
+
+    The renderer can also draw into an existing array (framebuffer) that
+    holds just a part of a larger image whose top-left pixel is origin,
+    in the larger image's coordinates; fills are clipped to that part.
+
+    The bulk draw_*s methods fill a whole batch with a few array operations:
+    the pixels of every primitive's clipped bounding box are laid out in flat
+    arrays, BULK_PIXELS at a time, tested with the same formulas as the
+    single-primitive methods, and painted with one scatter. Dense batches of
+    rectangles are summed into a coverage mask instead. Either way they fill
+    the same pixels as drawing the primitives one by one.
+    """
+
+    FULL_REDRAW_FRACTION = 0.25
+    BULK_PIXELS = 1 << 20
+
+    def __init__(self, width: int, height: int, scale: float = 1.0,
+                 background: Color = (255, 255, 255), color: Color = (0, 0, 0),
+                 framebuffer: Optional[np.ndarray] = None, origin: Tuple[int, int] = (0, 0)):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.background = background
+        self.color = color
+        self.origin = origin
+        # While redrawing, fills only touch the pixels where this is True
+        self._mask: Optional[np.ndarray] = None
+        if framebuffer is None:
+            self.framebuffer = np.empty((height, width, 3), dtype=np.uint8)
+            self.clear()
+        elif framebuffer.shape != (height, width, 3) or framebuffer.dtype != np.uint8:
+            raise ValueError(f"framebuffer must be a {height}x{width}x3 uint8 array.")
+        else:
+            self.framebuffer = framebuffer
+
+    def clear(self) -> None:
+        self.framebuffer[:] = self.background
+
+    def set_color(self, color: Color) -> None:
+        self.color = color
+
+    def draw_circle(self, x: float, y: float, radius: float) -> None:
+        s = self.scale
+        cx, cy, r = x * s, y * s, radius * s
+        x0, x1 = self._columns(cx - r, cx + r)
+        y0, y1 = self._rows(cy - r, cy + r)
+        if x0 >= x1 or y0 >= y1:
+            return
+        dx = np.arange(x0, x1) + 0.5 - cx
+        dy = np.arange(y0, y1)[:, None] + 0.5 - cy
+        self._fill(y0, y1, x0, x1, dx * dx + dy * dy <= r * r)
+
+    def draw_rectangle(self, x: float, y: float, width: float, height: float) -> None:
+        s = self.scale
+        x0, x1 = self._columns(x * s, (x + width) * s)
+        y0, y1 = self._rows(y * s, (y + height) * s)
+        if x0 < x1 and y0 < y1:
+            self._fill(y0, y1, x0, x1)
+
+    def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
+        s = self.scale
+        ax, ay, bx, by, cx, cy = x1 * s, y1 * s, x2 * s, y2 * s, x3 * s, y3 * s
+        c0, c1 = self._columns(min(ax, bx, cx), max(ax, bx, cx))
+        r0, r1 = self._rows(min(ay, by, cy), max(ay, by, cy))
+        if c0 >= c1 or r0 >= r1:
+            return
+        px = np.arange(c0, c1) + 0.5
+        py = np.arange(r0, r1)[:, None] + 0.5
+        # Edge functions: a pixel is inside when it is on the same side of all three edges
+        e0 = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+        e1 = (cx - bx) * (py - by) - (cy - by) * (px - bx)
+        e2 = (ax - cx) * (py - cy) - (ay - cy) * (px - cx)
+        self._fill(r0, r1, c0, c1, ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)) | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0)))
+
+    def draw_circles(self, xs: Sequence[float], ys: Sequence[float], radii: Sequence[float]) -> None:
+        column_length(xs, ys, radii)
+        s = self.scale
+        cx, cy, r = (np.asarray(column, dtype=float) * s for column in (xs, ys, radii))
+        x0, x1 = self._column_arrays(cx - r, cx + r)
+        y0, y1 = self._row_arrays(cy - r, cy + r)
+        for index, px, py in self._box_pixels(x0, x1, y0, y1):
+            dx = px + 0.5 - cx[index]
+            dy = py + 0.5 - cy[index]
+            radius = r[index]
+            self._fill_pixels(py, px, dx * dx + dy * dy <= radius * radius)
+
+    def draw_rectangles(self, xs: Sequence[float], ys: Sequence[float],
+                        widths: Sequence[float], heights: Sequence[float]) -> None:
+        column_length(xs, ys, widths, heights)
+        s = self.scale
+        x, y, width, height = (np.asarray(column, dtype=float) for column in (xs, ys, widths, heights))
+        x0, x1 = self._column_arrays(x * s, (x + width) * s)
+        y0, y1 = self._row_arrays(y * s, (y + height) * s)
+        boxes = (x0 < x1) & (y0 < y1)
+        x0, x1, y0, y1 = x0[boxes], x1[boxes], y0[boxes], y1[boxes]
+        if not len(x0):
+            return
+        c0, c1, r0, r1 = int(x0.min()), int(x1.max()), int(y0.min()), int(y1.max())
+        if (c1 - c0) * (r1 - r0) > 4 * int(((x1 - x0) * (y1 - y0)).sum()):
+            # Sparse batch: the pixels of the boxes alone are fewer than the area they span
+            for _, px, py in self._box_pixels(x0, x1, y0, y1):
+                self._fill_pixels(py, px)
+            return
+        # Coverage over the batch's span: +1/-1 at each box's corners, then prefix sums along both axes
+        counts = np.zeros((r1 - r0 + 1, c1 - c0 + 1), dtype=np.int32)
+        np.add.at(counts, (y0 - r0, x0 - c0), 1)
+        np.add.at(counts, (y0 - r0, x1 - c0), -1)
+        np.add.at(counts, (y1 - r0, x0 - c0), -1)
+        np.add.at(counts, (y1 - r0, x1 - c0), 1)
+        self._fill(r0, r1, c0, c1, counts.cumsum(axis=0).cumsum(axis=1)[:-1, :-1] > 0)
+
+    def draw_triangles(self, x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                       y2s: Sequence[float], x3s: Sequence[float], y3s: Sequence[float]) -> None:
+        column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        s = self.scale
+        ax, ay, bx, by, cx, cy = (np.asarray(column, dtype=float) * s
+                                  for column in (x1s, y1s, x2s, y2s, x3s, y3s))
+        c0, c1 = self._column_arrays(np.minimum(np.minimum(ax, bx), cx), np.maximum(np.maximum(ax, bx), cx))
+        r0, r1 = self._row_arrays(np.minimum(np.minimum(ay, by), cy), np.maximum(np.maximum(ay, by), cy))
+        for i, columns, rows in self._box_pixels(c0, c1, r0, r1):
+            px = columns + 0.5
+            py = rows + 0.5
+            tax, tay, tbx, tby, tcx, tcy = ax[i], ay[i], bx[i], by[i], cx[i], cy[i]
+            e0 = (tbx - tax) * (py - tay) - (tby - tay) * (px - tax)
+            e1 = (tcx - tbx) * (py - tby) - (tcy - tby) * (px - tbx)
+            e2 = (tax - tcx) * (py - tcy) - (tay - tcy) * (px - tcx)
+            self._fill_pixels(rows, columns,
+                              ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)) | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0)))
+
+    def render(self, scene: "CompositeShape") -> None:
+        """
+        Clear the framebuffer and draw the whole scene, discarding its dirty regions.
+        """
+        scene.take_dirty_regions()
+        self.clear()
+        scene.draw()
+
+    def redraw(self, scene: "CompositeShape", tile_size: int = 16) -> int:
+        """
+        Repaint the tiles of tile_size pixels that the scene's dirty regions
+        touch and return how many there were. Every shape overlapping them
+        is drawn once, so the cost follows the number of shapes near the
+        changes rather than the size of the scene.
+        """
+        s = self.scale
+        ox, oy = self.origin
+        rows, columns = -(-self.height // tile_size), -(-self.width // tile_size)
+        dirty = np.zeros((rows, columns), dtype=bool)
+        for box in scene.take_dirty_regions():
+            # Every pixel of the framebuffer the box could reach, rounded outwards
+            x0, x1 = max(math.floor(box.min_x * s) - ox, 0), min(math.ceil(box.max_x * s) + 1 - ox, self.width)
+            y0, y1 = max(math.floor(box.min_y * s) - oy, 0), min(math.ceil(box.max_y * s) + 1 - oy, self.height)
+            if x0 < x1 and y0 < y1:
+                dirty[y0 // tile_size:(y1 - 1) // tile_size + 1, x0 // tile_size:(x1 - 1) // tile_size + 1] = True
+        tiles = int(dirty.sum())
+        if not tiles:
+            return 0
+        if tiles > self.FULL_REDRAW_FRACTION * dirty.size:
+            self.clear()
+            scene.draw()
+            return dirty.size
+        mask = dirty.repeat(tile_size, axis=0).repeat(tile_size, axis=1)[:self.height, :self.width]
+        self.framebuffer[mask] = self.background
+        regions = [BoundingBox((left + ox) / s, (top + oy) / s, (right + ox) / s, (bottom + oy) / s)
+                   for left, top, right, bottom in _tile_runs(dirty, tile_size)]
+        self._mask = mask
+        try:
+            scene.draw_regions(regions)
+        finally:
+            self._mask = None
+        return tiles
+
+    def save(self, path: str) -> None:
+        """
+        Write the framebuffer to path: PNG if it ends in .png, binary PPM otherwise.
+        """
+        data = self.to_png() if path.lower().endswith(".png") else self.to_ppm()
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def to_ppm(self) -> bytes:
+        return b"P6\n%d %d\n255\n" % (self.width, self.height) + self.framebuffer.tobytes()
+
+    def to_png(self) -> bytes:
+        # Every row gets filter type 0 (None), then the whole image is deflated
+        rows = np.zeros((self.height, self.width * 3 + 1), dtype=np.uint8)
+        rows[:, 1:] = self.framebuffer.reshape(self.height, -1)
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+                + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + _png_chunk(b"IEND", b""))
+
+    def _columns(self, left: float, right: float) -> Tuple[int, int]:
+        # Pixels whose centers (i + 0.5) fall within [left, right], clipped to the framebuffer
+        ox = self.origin[0]
+        return max(math.ceil(left - 0.5), ox), min(math.floor(right - 0.5) + 1, ox + self.width)
+
+    def _rows(self, top: float, bottom: float) -> Tuple[int, int]:
+        oy = self.origin[1]
+        return max(math.ceil(top - 0.5), oy), min(math.floor(bottom - 0.5) + 1, oy + self.height)
+
+    def _column_arrays(self, left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # _columns() for many primitives; empty ranges end up with start >= stop
+        ox = self.origin[0]
+        return (np.clip(np.ceil(left - 0.5), ox, ox + self.width).astype(np.int64),
+                np.clip(np.floor(right - 0.5) + 1, ox, ox + self.width).astype(np.int64))
+
+    def _row_arrays(self, top: np.ndarray, bottom: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        oy = self.origin[1]
+        return (np.clip(np.ceil(top - 0.5), oy, oy + self.height).astype(np.int64),
+                np.clip(np.floor(bottom - 0.5) + 1, oy, oy + self.height).astype(np.int64))
+
+    def _box_pixels(self, x0: np.ndarray, x1: np.ndarray, y0: np.ndarray,
+                    y1: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # Every pixel of every non-empty box as flat (primitive index, column, row) arrays,
+        # in chunks of about BULK_PIXELS pixels; a larger box is a chunk of its own
+        widths = x1 - x0
+        heights = y1 - y0
+        boxes = np.flatnonzero((widths > 0) & (heights > 0))
+        if not len(boxes):
+            return
+        areas = widths[boxes] * heights[boxes]
+        ends = np.cumsum(areas)
+        start = 0
+        while start < len(boxes):
+            done = ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(ends, done + self.BULK_PIXELS, side="right")), start + 1)
+            index = np.repeat(boxes[start:stop], areas[start:stop])
+            offset = np.arange(ends[stop - 1] - done) - np.repeat(ends[start:stop] - areas[start:stop] - done,
+                                                                   areas[start:stop])
+            width = widths[index]
+            yield index, x0[index] + offset % width, y0[index] + offset // width
+            start = stop
+
+    def _fill_pixels(self, rows: np.ndarray, columns: np.ndarray, inside: Optional[np.ndarray] = None) -> None:
+        # _fill() for scattered pixels given in image coordinates
+        ox, oy = self.origin
+        if inside is not None:
+            rows, columns = rows[inside], columns[inside]
+        rows = rows - oy
+        columns = columns - ox
+        if self._mask is not None:
+            allowed = self._mask[rows, columns]
+            rows, columns = rows[allowed], columns[allowed]
+        self.framebuffer[rows, columns] = self.color
+
+    def _fill(self, r0: int, r1: int, c0: int, c1: int, inside: Optional[np.ndarray] = None) -> None:
+        # Paint the pixels of rows r0:r1, columns c0:c1 that are inside the shape and not masked off
+        ox, oy = self.origin
+        r0, r1, c0, c1 = r0 - oy, r1 - oy, c0 - ox, c1 - ox
+        if self._mask is not None:
+            allowed = self._mask[r0:r1, c0:c1]
+            inside = allowed if inside is None else inside & allowed
+        if inside is None:
+            self.framebuffer[r0:r1, c0:c1] = self.color
+        else:
+            self.framebuffer[r0:r1, c0:c1][inside] = self.color
+
+
+def _tile_runs(dirty: np.ndarray, tile_size: int) -> List[Tuple[int, int, int, int]]:
+    # Merge horizontally adjacent dirty tiles into (left, top, right, bottom) pixel rectangles
+    runs = []
+    for row, column in zip(*np.nonzero(dirty)):
+        top, left = int(row) * tile_size, int(column) * tile_size
+        if runs and runs[-1][1] == top and runs[-1][2] == left:
+            runs[-1] = (runs[-1][0], top, left + tile_size, top + tile_size)
+        else:
+            runs.append((left, top, left + tile_size, top + tile_size))
+    return runs
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
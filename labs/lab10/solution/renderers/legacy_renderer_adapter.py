@@ -1,4 +1,7 @@
-from renderers.renderer import Renderer
+import math
+from typing import List, Sequence, Tuple
+import numpy as np
+from renderers.renderer import Renderer, column_length
 from renderers.legacy_drawing import LegacyEllipse, LegacyRectangle
 
 class LegacyRendererAdapter(Renderer):
@@ -6,12 +9,22 @@ class LegacyRendererAdapter(Renderer):
     Adapter that wraps the legacy drawing API (LegacyEllipse & LegacyRectangle)
     and exposes the modern Renderer interface. This allows existing shape code
     to use the legacy library without modification.
+
+    The legacy API has no triangles, so a triangle is tessellated into
+    horizontal strips, each drawn as a legacy rectangle as wide as the
+    triangle at the strip's middle. Strips are at most strip_height high,
+    and there are at most max_strips per triangle.
+
+    The bulk draw_*s methods adapt a whole batch in one pass: one message
+    per batch and the legacy methods bound once, instead of once per shape.
     """
 
-    def __init__(self):
+    def __init__(self, strip_height: float = 1.0, max_strips: int = 32):
         # Instantiate legacy objects internally
         self.legacy_ellipse = LegacyEllipse()
         self.legacy_rectangle = LegacyRectangle()
+        self.strip_height = strip_height
+        self.max_strips = max_strips
 
     def draw_circle(self, x: float, y: float, radius: float) -> None:
         # LegacyEllipse’s draw_ellipse takes two radii. We pass radius for both rx and ry.
@@ -23,4 +36,87 @@ class LegacyRendererAdapter(Renderer):
         self.legacy_rectangle.draw_rectangle(x=x, y=y, width=width, height=height)
 
     def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float):
-        print(f"[LegacyRendererAdapter] Does not support TRIANGLE")
+        strips = self._strips(x1, y1, x2, y2, x3, y3)
+        print(f"[LegacyRendererAdapter] Adapting draw_triangle → {len(strips)} legacy rectangle strip(s)")
+        draw_rectangle = self.legacy_rectangle.draw_rectangle
+        for x, y, width, height in strips:
+            draw_rectangle(x, y, width, height)
+
+    def draw_circles(self, xs: Sequence[float], ys: Sequence[float], radii: Sequence[float]) -> None:
+        count = column_length(xs, ys, radii)
+        print(f"[LegacyRendererAdapter] Adapting {count} draw_circle calls → draw_ellipse")
+        draw_ellipse = self.legacy_ellipse.draw_ellipse
+        for x, y, radius in zip(xs, ys, radii):
+            draw_ellipse(x, y, radius, radius)
+
+    def draw_rectangles(self, xs: Sequence[float], ys: Sequence[float],
+                        widths: Sequence[float], heights: Sequence[float]) -> None:
+        count = column_length(xs, ys, widths, heights)
+        print(f"[LegacyRendererAdapter] Adapting {count} draw_rectangle calls → legacy rectangle draw")
+        draw_rectangle = self.legacy_rectangle.draw_rectangle
+        for x, y, width, height in zip(xs, ys, widths, heights):
+            draw_rectangle(x, y, width, height)
+
+    def draw_triangles(self, x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                       y2s: Sequence[float], x3s: Sequence[float], y3s: Sequence[float]) -> None:
+        count = column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        strips = self.tessellate(x1s, y1s, x2s, y2s, x3s, y3s)
+        print(f"[LegacyRendererAdapter] Adapting {count} draw_triangle calls → "
+              f"{len(strips[0])} legacy rectangle strips")
+        draw_rectangle = self.legacy_rectangle.draw_rectangle
+        for x, y, width, height in zip(*strips):
+            draw_rectangle(x, y, width, height)
+
+    def tessellate(self, x1s, y1s, x2s, y2s, x3s, y3s) -> Tuple[list, list, list, list]:
+        """
+        Cut triangles into horizontal strips. Returns the strips' x, y,
+        width and height as lists, the strips of each triangle together
+        and top to bottom.
+        """
+        xs = np.column_stack([x1s, x2s, x3s]).astype(np.float64)
+        ys = np.column_stack([y1s, y2s, y3s]).astype(np.float64)
+        # Corners sorted by y: a is the top, c the bottom, b in between
+        order = np.argsort(ys, axis=1)
+        xs, ys = np.take_along_axis(xs, order, axis=1), np.take_along_axis(ys, order, axis=1)
+        top, height = ys[:, 0], ys[:, 2] - ys[:, 0]
+        counts = np.clip(np.ceil(height / self.strip_height), 1, self.max_strips).astype(np.intp)
+
+        # One row per strip: its triangle and its position within the triangle
+        triangle = np.repeat(np.arange(len(counts)), counts)
+        position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        strip_height = height[triangle] / counts[triangle]
+        y = top[triangle] + position * strip_height
+        middle = y + strip_height / 2
+        (ax, bx, cx), (ay, by, cy) = xs[triangle].T, ys[triangle].T
+        # The strip spans from the long edge a-c to edge a-b above b, or edge b-c below it
+        long_edge = _edge_x(ax, ay, cx, cy, middle)
+        short_edge = np.where(middle < by, _edge_x(ax, ay, bx, by, middle), _edge_x(bx, by, cx, cy, middle))
+        left = np.minimum(long_edge, short_edge)
+        width = np.abs(long_edge - short_edge)
+        return left.tolist(), y.tolist(), width.tolist(), strip_height.tolist()
+
+    def _strips(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> List[Tuple]:
+        # tessellate() for a single triangle, without the cost of setting up arrays
+        (ay, ax), (by, bx), (cy, cx) = sorted(((y1, x1), (y2, x2), (y3, x3)), key=lambda corner: corner[0])
+        height = cy - ay
+        count = min(max(math.ceil(height / self.strip_height), 1), self.max_strips)
+        strip_height = height / count
+        strips = []
+        for position in range(count):
+            y = ay + position * strip_height
+            middle = y + strip_height / 2
+            long_edge = _point_x(ax, ay, cx, cy, middle)
+            short_edge = _point_x(ax, ay, bx, by, middle) if middle < by else _point_x(bx, by, cx, cy, middle)
+            strips.append((min(long_edge, short_edge), y, abs(long_edge - short_edge), strip_height))
+        return strips
+
+
+def _point_x(x0: float, y0: float, x1: float, y1: float, y: float) -> float:
+    return x0 + (y - y0) / (y1 - y0) * (x1 - x0) if y1 != y0 else x0
+
+
+def _edge_x(x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # x where the edge from (x0, y0) to (x1, y1) crosses height y; x0 for a horizontal edge
+    dy = y1 - y0
+    t = np.divide(y - y0, dy, out=np.zeros_like(y), where=dy != 0)
+    return x0 + t * (x1 - x0)
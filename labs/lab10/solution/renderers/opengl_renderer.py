@@ -1,4 +1,5 @@
-from renderers.renderer import Renderer
+from typing import Sequence
+from renderers.renderer import Renderer, column_length
 
 class OpenGLRenderer(Renderer):
     def draw_circle(self, x: float, y: float, radius: float) -> None:
@@ -13,3 +14,19 @@ class OpenGLRenderer(Renderer):
     def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
         print(f"[OpenGLRenderer] glBegin(GL_TRIANGLES); // Simulating triangle at "
               f"({x1},{y1}), ({x2},{y2}), ({x3},{y3}) … glEnd();")
+
+    # Bulk versions: one glBegin/glEnd pair for the whole batch instead of one per shape
+    def draw_circles(self, xs: Sequence[float], ys: Sequence[float], radii: Sequence[float]) -> None:
+        count = column_length(xs, ys, radii)
+        print(f"[OpenGLRenderer] glBegin(GL_TRIANGLES); // Simulating {count} circles "
+              f"as triangle fans in one batch … glEnd();")
+
+    def draw_rectangles(self, xs: Sequence[float], ys: Sequence[float],
+                        widths: Sequence[float], heights: Sequence[float]) -> None:
+        count = column_length(xs, ys, widths, heights)
+        print(f"[OpenGLRenderer] glBegin(GL_QUADS); // Simulating {count} rectangles in one batch … glEnd();")
+
+    def draw_triangles(self, x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                       y2s: Sequence[float], x3s: Sequence[float], y3s: Sequence[float]) -> None:
+        count = column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        print(f"[OpenGLRenderer] glBegin(GL_TRIANGLES); // Simulating {count} triangles in one batch … glEnd();")
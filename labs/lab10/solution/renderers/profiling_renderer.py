@@ -0,0 +1,219 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+from renderers.renderer import Renderer, column_length
+from renderers.tracing import tracing
+
+if TYPE_CHECKING:
+    from shapes.composite_shape import CompositeShape
+
+
+class _Frame:
+    """
+    One composite being drawn under a ProfilingRenderer's trace().
+    """
+    __slots__ = ("profiler", "path", "parent", "inner", "reached", "start")
+
+    def __init__(self, profiler: "ProfilingRenderer", path: str, parent: Optional["_Frame"]):
+        self.profiler = profiler
+        self.path = path
+        self.parent = parent
+        # Time spent in what the composite drew, and whether any of its draw calls reached the profiler
+        self.inner = 0
+        self.reached = False
+        self.start = perf_counter_ns()
+
+
+# Innermost composite frame of the current thread or task, for all profilers tracing there.
+# Frames link to the frame they were opened in, so each thread or task has its own stack.
+_frames: "ContextVar[Optional[_Frame]]" = ContextVar("profiling_frames", default=None)
+
+
+class ProfilingRenderer(Renderer):
+    """
+    A Renderer that passes every draw call on to the wrapped Renderer and
+    measures it: calls and time per method, and primitives drawn per kind
+    (a bulk call counts each primitive it draws).
+
+    Inside trace(), time is also attributed to the CompositeShapes being
+    drawn. Each draw call is charged to the stack of composites drawing it,
+    and each composite to the stack above it for its own time: what it
+    spent outside the draw calls and nested composites it made, which is
+    culling, traversal and the shapes' own draw() methods. Only composites
+    whose drawing reaches this profiler are charged: one that draws nothing
+    through it (culled, or drawing shapes on another renderer) is left out,
+    and its time is not counted as its parent's own. collapsed_stacks()
+    returns these as "frame;frame;frame nanoseconds" lines, the input format
+    of flamegraph.pl, speedscope and similar tools. The first frame is the
+    wrapped renderer's class, so profiles of several renderers can be
+    merged into one graph.
+
+    The measuring itself takes some time, which ends up in the composites'
+    own time: compare totals against an unprofiled run where it matters.
+    """
+
+    def __init__(self, target: Renderer):
+        self.target = target
+        self._root = type(target).__name__.replace(";", "_")
+        # (stack, draw method) -> nanoseconds, and (stack, "") -> the composite's own time
+        self._stacks: Dict[Tuple[str, str], int] = defaultdict(int)
+        # Draw method -> [calls, primitives]
+        self._counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    def draw_circle(self, x: float, y: float, radius: float) -> None:
+        start = perf_counter_ns()
+        self.target.draw_circle(x, y, radius)
+        self._record("draw_circle", 1, perf_counter_ns() - start)
+
+    def draw_rectangle(self, x: float, y: float, width: float, height: float) -> None:
+        start = perf_counter_ns()
+        self.target.draw_rectangle(x, y, width, height)
+        self._record("draw_rectangle", 1, perf_counter_ns() - start)
+
+    def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
+        start = perf_counter_ns()
+        self.target.draw_triangle(x1, y1, x2, y2, x3, y3)
+        self._record("draw_triangle", 1, perf_counter_ns() - start)
+
+    def draw_circles(self, xs, ys, radii) -> None:
+        count = column_length(xs, ys, radii)
+        start = perf_counter_ns()
+        self.target.draw_circles(xs, ys, radii)
+        self._record("draw_circles", count, perf_counter_ns() - start)
+
+    def draw_rectangles(self, xs, ys, widths, heights) -> None:
+        count = column_length(xs, ys, widths, heights)
+        start = perf_counter_ns()
+        self.target.draw_rectangles(xs, ys, widths, heights)
+        self._record("draw_rectangles", count, perf_counter_ns() - start)
+
+    def draw_triangles(self, x1s, y1s, x2s, y2s, x3s, y3s) -> None:
+        count = column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        start = perf_counter_ns()
+        self.target.draw_triangles(x1s, y1s, x2s, y2s, x3s, y3s)
+        self._record("draw_triangles", count, perf_counter_ns() - start)
+
+    @contextmanager
+    def trace(self) -> Iterator["ProfilingRenderer"]:
+        """
+        Attribute time to the composites drawn inside the with block by this
+        thread (or asyncio task). Other threads' draws are not traced, and
+        several profilers can trace at once.
+        """
+        with tracing(self):
+            yield self
+
+    def enter(self, composite: "CompositeShape") -> None:
+        name = (composite.name or type(composite).__name__).replace(";", "_")
+        outer = self._frame()
+        _frames.set(_Frame(self, f"{outer.path if outer else self._root};{name}", _frames.get()))
+
+    def leave(self) -> None:
+        # Tracers leave in the reverse order they entered, so the innermost frame is this profiler's
+        frame = _frames.get()
+        elapsed = perf_counter_ns() - frame.start
+        _frames.set(frame.parent)
+        if frame.reached:
+            self._stacks[frame.path, ""] += elapsed - frame.inner
+        outer = self._frame()
+        if outer is not None:
+            outer.inner += elapsed
+            outer.reached = outer.reached or frame.reached
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        """
+        Calls per draw method.
+        """
+        return {method: calls for method, (calls, _) in self._counts.items()}
+
+    @property
+    def primitives(self) -> Dict[str, int]:
+        """
+        Primitives drawn per kind ("circle", "rectangle", "triangle").
+        """
+        primitives: Dict[str, int] = defaultdict(int)
+        for method, (_, count) in self._counts.items():
+            primitives[method[5:].rstrip("s")] += count
+        return dict(primitives)
+
+    @property
+    def nanoseconds(self) -> Dict[str, int]:
+        """
+        Time spent in each draw method of the wrapped renderer.
+        """
+        nanoseconds: Dict[str, int] = defaultdict(int)
+        for (_, method), elapsed in self._stacks.items():
+            if method:
+                nanoseconds[method] += elapsed
+        return dict(nanoseconds)
+
+    @property
+    def total_seconds(self) -> float:
+        """
+        Time spent in the wrapped renderer's draw methods.
+        """
+        return sum(self.nanoseconds.values()) / 1e9
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        The profile as collapsed stacks, one "frame;frame;frame nanoseconds" line per stack.
+        """
+        stacks: Dict[str, int] = defaultdict(int)
+        for (stack, method), nanoseconds in self._stacks.items():
+            stacks[f"{stack};{method}" if method else stack] += nanoseconds
+        return [f"{stack} {nanoseconds}" for stack, nanoseconds in sorted(stacks.items())]
+
+    def write_collapsed(self, output: Union[str, TextIO]) -> None:
+        """
+        Write collapsed_stacks() to a file path or an open text stream.
+        """
+        text = "".join(line + "\n" for line in self.collapsed_stacks())
+        if isinstance(output, str):
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            output.write(text)
+
+    def report(self) -> str:
+        """
+        A table of calls, primitives and time per draw method.
+        """
+        calls, nanoseconds, primitives = self.calls, self.nanoseconds, self.primitives
+        lines = [f"[ProfilingRenderer] {self._root}: {sum(primitives.values())} primitive(s) "
+                 f"in {sum(calls.values())} call(s), {sum(nanoseconds.values()) / 1e6:.3f} ms"]
+        for method in sorted(calls):
+            lines.append(f"  {method:<16} {calls[method]:>10} call(s) {nanoseconds[method] / 1e6:>12.3f} ms "
+                         f"{nanoseconds[method] / 1e3 / calls[method]:>10.2f} µs/call")
+        for kind in sorted(primitives):
+            lines.append(f"  {kind + 's':<16} {primitives[kind]:>10} drawn")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """
+        Forget everything measured so far.
+        """
+        self._stacks.clear()
+        self._counts.clear()
+
+    def _record(self, method: str, count: int, elapsed: int) -> None:
+        counts = self._counts[method]
+        counts[0] += 1
+        counts[1] += count
+        frame = self._frame()
+        if frame is None:
+            # Not traced here: the calling thread or task is not inside trace()
+            self._stacks[self._root, method] += elapsed
+        else:
+            self._stacks[frame.path, method] += elapsed
+            frame.inner += elapsed
+            frame.reached = True
+
+    def _frame(self) -> Optional[_Frame]:
+        # This profiler's innermost open frame in the current thread or task
+        frame = _frames.get()
+        while frame is not None and frame.profiler is not self:
+            frame = frame.parent
+        return frame
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 class Renderer(ABC):
     """
@@ -6,6 +7,12 @@ class Renderer(ABC):
     Shapes will hold a reference to a Renderer and call its methods
     to perform drawing. Concrete subclasses know how to draw shapes
     in different ways (e.g., vector vs. raster).
+
+    The draw_*s bulk methods draw many primitives of one kind in one call,
+    taking one sequence per coordinate (struct-of-arrays). By default they
+    just call the single-primitive method for each one; renderers that can
+    do better (one GL begin/end per batch, say) override them. The columns
+    of one call must all have the same length (see column_length()).
     """
 
     @abstractmethod
@@ -19,3 +26,36 @@ class Renderer(ABC):
     @abstractmethod
     def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
         pass
+
+    def draw_circles(self, xs: Sequence[float], ys: Sequence[float], radii: Sequence[float]) -> None:
+        column_length(xs, ys, radii)
+        draw_circle = self.draw_circle
+        for x, y, radius in zip(xs, ys, radii):
+            draw_circle(x, y, radius)
+
+    def draw_rectangles(self, xs: Sequence[float], ys: Sequence[float],
+                        widths: Sequence[float], heights: Sequence[float]) -> None:
+        column_length(xs, ys, widths, heights)
+        draw_rectangle = self.draw_rectangle
+        for x, y, width, height in zip(xs, ys, widths, heights):
+            draw_rectangle(x, y, width, height)
+
+    def draw_triangles(self, x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                       y2s: Sequence[float], x3s: Sequence[float], y3s: Sequence[float]) -> None:
+        column_length(x1s, y1s, x2s, y2s, x3s, y3s)
+        draw_triangle = self.draw_triangle
+        for x1, y1, x2, y2, x3, y3 in zip(x1s, y1s, x2s, y2s, x3s, y3s):
+            draw_triangle(x1, y1, x2, y2, x3, y3)
+
+
+def column_length(*columns: Sequence[float]) -> int:
+    """
+    Return the common length of the columns of a bulk draw call. Raises
+    ValueError if they differ, rather than silently dropping the primitives
+    the shorter columns have no values for.
+    """
+    length = len(columns[0])
+    if any(len(column) != length for column in columns):
+        raise ValueError(f"Bulk draw columns must all have the same length, "
+                         f"got {[len(column) for column in columns]}.")
+    return length
@@ -0,0 +1,198 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+import numpy as np
+from renderers.framebuffer_renderer import Color, FramebufferRenderer
+from renderers.renderer import Renderer, column_length
+
+if TYPE_CHECKING:
+    from shapes.composite_shape import CompositeShape
+
+# A recorded primitive is one row of doubles: its kind, then up to six coordinates
+_CIRCLE, _RECTANGLE, _TRIANGLE = 0.0, 1.0, 2.0
+_RECORD = 7
+
+class TiledRenderer(Renderer):
+    """
+    A Renderer that rasterizes on several cores. Draw calls are only
+    recorded, in order; flush() cuts the image into tiles of tile_size
+    pixels, gives each tile the recorded primitives whose boxes overlap it,
+    and has a pool of worker processes fill the tiles in parallel with a
+    FramebufferRenderer each.
+
+    The framebuffer lives in shared memory (multiprocessing.shared_memory),
+    so workers write their tiles straight into it: only the primitives of
+    each tile are pickled, never pixels. The result is the same image a
+    single FramebufferRenderer would draw, since every tile keeps the
+    primitives in draw order and pixels only belong to one tile.
+
+    The renderer holds a shared memory block and, once used, a process
+    pool: call close(), or use it as a context manager, when done.
+    With workers=1 tiles are drawn in this process.
+    """
+
+    def __init__(self, width: int, height: int, scale: float = 1.0,
+                 background: Color = (255, 255, 255), color: Color = (0, 0, 0),
+                 workers: Optional[int] = None, tile_size: int = 256):
+        self.width = width
+        self.height = height
+        self.workers = workers
+        self.tile_size = tile_size
+        self._memory = shared_memory.SharedMemory(create=True, size=width * height * 3)
+        self.framebuffer = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self._memory.buf)
+        # Does the clearing and saving in this process, and describes the image to the workers
+        self.image = FramebufferRenderer(width, height, scale, background, color, framebuffer=self.framebuffer)
+        self.image.clear()
+        self._records = array("d")
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of recorded primitives not yet drawn.
+        """
+        return len(self._records) // _RECORD
+
+    def clear(self) -> None:
+        self.image.clear()
+
+    def set_color(self, color: Color) -> None:
+        """
+        Set the fill color for the next flush(); all primitives of one flush share a color.
+        """
+        self.image.set_color(color)
+
+    def draw_circle(self, x: float, y: float, radius: float) -> None:
+        self._records.extend((_CIRCLE, x, y, radius, 0.0, 0.0, 0.0))
+
+    def draw_rectangle(self, x: float, y: float, width: float, height: float) -> None:
+        self._records.extend((_RECTANGLE, x, y, width, height, 0.0, 0.0))
+
+    def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
+        self._records.extend((_TRIANGLE, x1, y1, x2, y2, x3, y3))
+
+    def draw_circles(self, xs: Sequence[float], ys: Sequence[float], radii: Sequence[float]) -> None:
+        self._record_many(_CIRCLE, (xs, ys, radii))
+
+    def draw_rectangles(self, xs: Sequence[float], ys: Sequence[float],
+                        widths: Sequence[float], heights: Sequence[float]) -> None:
+        self._record_many(_RECTANGLE, (xs, ys, widths, heights))
+
+    def draw_triangles(self, x1s: Sequence[float], y1s: Sequence[float], x2s: Sequence[float],
+                       y2s: Sequence[float], x3s: Sequence[float], y3s: Sequence[float]) -> None:
+        self._record_many(_TRIANGLE, (x1s, y1s, x2s, y2s, x3s, y3s))
+
+    def render(self, scene: "CompositeShape") -> None:
+        """
+        Clear the framebuffer, record the whole scene and draw it, discarding
+        the scene's dirty regions.
+        """
+        scene.take_dirty_regions()
+        self.clear()
+        scene.draw()
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Draw everything recorded so far into the framebuffer, tile by tile,
+        and return the number of tiles that had something to draw.
+        """
+        records = np.frombuffer(self._records, dtype=np.float64).reshape(-1, _RECORD).copy()
+        del self._records[:]
+        tasks = self._tile_tasks(records)
+        image = self.image
+        settings = (self._memory.name, self.width, self.height, image.scale, image.background, image.color)
+        if self.workers == 1:
+            for tile, tile_records in tasks:
+                _render_tile(*settings, tile, tile_records)
+        elif tasks:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            tiles, tile_records = zip(*tasks)
+            count = len(tasks)
+            list(self._executor.map(_render_tile, *([value] * count for value in settings), tiles, tile_records))
+        return len(tasks)
+
+    def save(self, path: str) -> None:
+        self.image.save(path)
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and free the shared framebuffer. Copy the
+        framebuffer first if the pixels are still needed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._memory is not None:
+            # The arrays viewing the block must go before it can be closed
+            self.image = None
+            self.framebuffer = None
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self) -> "TiledRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _record_many(self, kind: float, columns) -> None:
+        rows = np.zeros((column_length(*columns), _RECORD))
+        rows[:, 0] = kind
+        for i, column in enumerate(columns, start=1):
+            rows[:, i] = column
+        self._records.frombytes(rows.tobytes())
+
+    def _tile_tasks(self, records: np.ndarray) -> List[Tuple[Tuple[int, int, int, int], np.ndarray]]:
+        # For every tile, the records whose pixel boxes overlap it, still in draw order
+        min_x, min_y, max_x, max_y = _pixel_boxes(records, self.image.scale)
+        tasks = []
+        size = self.tile_size
+        for top in range(0, self.height, size):
+            bottom = min(top + size, self.height)
+            in_rows = np.flatnonzero((min_y <= bottom) & (max_y >= top))
+            for left in range(0, self.width, size):
+                right = min(left + size, self.width)
+                hits = in_rows[(min_x[in_rows] <= right) & (max_x[in_rows] >= left)]
+                if hits.size:
+                    tasks.append(((left, top, right, bottom), records[hits]))
+        return tasks
+
+
+def _pixel_boxes(records: np.ndarray, scale: float):
+    # min_x, min_y, max_x, max_y of every record, in pixels, from three x and three y values per record
+    kind, p = records[:, 0], records[:, 1:] * scale
+    xs, ys = p[:, 0::2].copy(), p[:, 1::2].copy()
+    circle = kind == _CIRCLE
+    x, y, r = p[circle, 0], p[circle, 1], p[circle, 2]
+    xs[circle] = np.stack([x - r, x + r, x], axis=1)
+    ys[circle] = np.stack([y - r, y + r, y], axis=1)
+    rectangle = kind == _RECTANGLE
+    x, y, w, h = p[rectangle, 0], p[rectangle, 1], p[rectangle, 2], p[rectangle, 3]
+    xs[rectangle] = np.stack([x, x + w, x], axis=1)
+    ys[rectangle] = np.stack([y, y + h, y], axis=1)
+    return xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)
+
+
+def _render_tile(name: str, width: int, height: int, scale: float, background: Color, color: Color,
+                 tile: Tuple[int, int, int, int], records: np.ndarray) -> None:
+    # Runs in a worker: attach to the shared framebuffer and draw one tile of it
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        left, top, right, bottom = tile
+        image = np.ndarray((height, width, 3), dtype=np.uint8, buffer=memory.buf)
+        renderer = FramebufferRenderer(right - left, bottom - top, scale, background, color,
+                                       framebuffer=image[top:bottom, left:right], origin=(left, top))
+        for kind, a, b, c, d, e, f in records.tolist():
+            if kind == _CIRCLE:
+                renderer.draw_circle(a, b, c)
+            elif kind == _RECTANGLE:
+                renderer.draw_rectangle(a, b, c, d)
+            else:
+                renderer.draw_triangle(a, b, c, d, e, f)
+        del image, renderer
+    finally:
+        memory.close()
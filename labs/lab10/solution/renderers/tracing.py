@@ -0,0 +1,21 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Tuple
+
+# Tracers following the composites drawn in the current thread or task, outermost first.
+# Each has enter(composite) and leave() methods, called around each composite's drawing.
+active_tracers: "ContextVar[Tuple[object, ...]]" = ContextVar("active_tracers", default=())
+
+
+@contextmanager
+def tracing(tracer) -> Iterator[None]:
+    """
+    Make tracer follow the composites drawn in the with block, in the
+    current thread or task only. Tracers can be nested; all active ones are
+    told about every composite.
+    """
+    token = active_tracers.set(active_tracers.get() + (tracer,))
+    try:
+        yield
+    finally:
+        active_tracers.reset(token)
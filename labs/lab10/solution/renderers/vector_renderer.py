@@ -1,19 +1,145 @@
+from typing import Dict, Optional, TextIO, Tuple, Union
 from renderers.renderer import Renderer
 
 class VectorRenderer(Renderer):
     """
     A concrete Renderer that “draws” shapes as vector commands.
-    In a real application, this might generate SVG or some vector-graphics output.
-    Here, we simply print descriptive messages.
+
+    Given an output (a file path or an open text stream) it writes SVG:
+    every draw call is written out as soon as it is made, through a
+    buffered writer, so a scene of any size is never held in memory.
+    Call close(), or use the renderer as a context manager, to finish the
+    document. Without an output it simply prints descriptive messages.
+
+    Numbers are written compactly: rounded to precision decimals (None
+    keeps full precision) with no trailing zeros, leading zero or "+".
+    With dedupe, a shape whose geometry was already seen elsewhere is
+    written as a <use> of a template in <defs>: circles by radius,
+    rectangles by size and triangles by their corners relative to the
+    first one. Templates are made on the second sighting, so shapes that
+    occur once cost nothing extra, and at most max_templates geometries
+    are remembered.
     """
 
+    def __init__(self, output: Optional[Union[str, TextIO]] = None,
+                 width: Optional[float] = None, height: Optional[float] = None,
+                 precision: Optional[int] = 2, dedupe: bool = True,
+                 max_templates: int = 100_000, buffer_size: int = 1 << 16):
+        self.precision = precision
+        self.dedupe = dedupe
+        self.max_templates = max_templates
+        self.elements = 0
+        self._file: Optional[TextIO] = None
+        self._write = None
+        # Geometry key -> template id, or None while it has been seen only once
+        self._templates: Dict[Tuple, Optional[str]] = {}
+        self._template_count = 0
+        if output is None:
+            return
+        if isinstance(output, str):
+            self._file = open(output, "w", encoding="utf-8", buffering=buffer_size)
+            output = self._file
+        self._write = output.write
+        size = ""
+        if width is not None and height is not None:
+            w, h = self._number(width), self._number(height)
+            size = f' width="{w}" height="{h}" viewBox="0 0 {w} {h}"'
+        self._write(f'<svg xmlns="http://www.w3.org/2000/svg"{size}>\n')
+
+    @property
+    def templates(self) -> int:
+        """
+        Number of <defs> templates written so far.
+        """
+        return self._template_count
+
     def draw_circle(self, x: float, y: float, radius: float) -> None:
-        print(f"[VectorRenderer] Drawing CIRCLE (vector) at ({x}, {y}) with radius {radius}")
+        if self._write is None:
+            print(f"[VectorRenderer] Drawing CIRCLE (vector) at ({x}, {y}) with radius {radius}")
+            return
+        n = self._number
+        cx, cy, r = n(x), n(y), n(radius)
+        self._element(("c", r), f'<circle cx="{cx}" cy="{cy}" r="{r}"/>\n', f'<circle id="{{}}" r="{r}"/>', cx, cy)
 
     def draw_rectangle(self, x: float, y: float, width: float, height: float) -> None:
-        print(f"[VectorRenderer] Drawing RECTANGLE (vector) at ({x}, {y}) w={width}, h={height}")
+        if self._write is None:
+            print(f"[VectorRenderer] Drawing RECTANGLE (vector) at ({x}, {y}) w={width}, h={height}")
+            return
+        n = self._number
+        rx, ry, w, h = n(x), n(y), n(width), n(height)
+        self._element(("r", w, h), f'<rect x="{rx}" y="{ry}" width="{w}" height="{h}"/>\n',
+                      f'<rect id="{{}}" width="{w}" height="{h}"/>', rx, ry)
 
     def draw_triangle(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float):
-        print(f"[VectorRenderer] Drawing TRIANGLE (vector) with points "
-            f"({x1},{y1}), ({x2},{y2}), ({x3},{y3})")
-        
\ No newline at end of file
+        if self._write is None:
+            print(f"[VectorRenderer] Drawing TRIANGLE (vector) with points "
+                f"({x1},{y1}), ({x2},{y2}), ({x3},{y3})")
+            return
+        n = self._number
+        ax, ay = n(x1), n(y1)
+        # The other corners relative to the first, so the path can be a template
+        bx, by, cx, cy = n(x2 - x1), n(y2 - y1), n(x3 - x1), n(y3 - y1)
+        d = f"{bx} {by} {cx} {cy}".replace(" -", "-")
+        self._element(("t", bx, by, cx, cy), f'<path d="M{ax} {ay}l{d}z"/>\n'.replace(" -", "-"),
+                      f'<path id="{{}}" d="M0 0l{d}z"/>', ax, ay)
+
+    def close(self) -> None:
+        """
+        Finish the SVG document, and close the file if the renderer opened it.
+        """
+        if self._write is None:
+            return
+        self._write("</svg>\n")
+        self._write = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "VectorRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _element(self, key: Tuple, plain: str, template: str, x: str, y: str) -> None:
+        # Write a shape as plain, or as a <use> of a template (placed at x, y) once its geometry repeats
+        self.elements += 1
+        if not self.dedupe:
+            self._write(plain)
+            return
+        templates = self._templates
+        if key not in templates:
+            if len(templates) < self.max_templates:
+                templates[key] = None
+            self._write(plain)
+            return
+        template_id = templates[key]
+        if template_id is None:
+            template_id = templates[key] = _template_id(self._template_count)
+            self._template_count += 1
+            self._write(f"<defs>{template.format(template_id)}</defs>")
+        self._write(f'<use href="#{template_id}" x="{x}" y="{y}"/>\n')
+
+    def _number(self, value: float) -> str:
+        if self.precision is None:
+            text = repr(float(value))
+        else:
+            text = f"{value:.{self.precision}f}"
+        if "." in text and "e" not in text:
+            text = text.rstrip("0").rstrip(".")
+        if text.startswith("0."):
+            text = text[1:]
+        elif text.startswith("-0."):
+            text = "-" + text[2:]
+        return "0" if text in ("-0", "") else text
+
+
+def _template_id(number: int) -> str:
+    # Short ids: a, b, ..., z, ba, bb, ...
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, digit = divmod(number, 26)
+        text = letters[digit] + text
+        if not number:
+            return text
@@ -0,0 +1,28 @@
+from typing import NamedTuple, Optional
+
+class BoundingBox(NamedTuple):
+    """
+    Axis-aligned box from (min_x, min_y) to (max_x, max_y), edges included.
+    Used for culling shapes against a viewport and for spatial indexing.
+    """
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+
+    def intersects(self, other: "BoundingBox") -> bool:
+        return (self.min_x <= other.max_x and other.min_x <= self.max_x
+                and self.min_y <= other.max_y and other.min_y <= self.max_y)
+
+    def contains(self, other: "BoundingBox") -> bool:
+        return (self.min_x <= other.min_x and other.max_x <= self.max_x
+                and self.min_y <= other.min_y and other.max_y <= self.max_y)
+
+    def contains_point(self, x: float, y: float) -> bool:
+        return self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y
+
+    def union(self, other: Optional["BoundingBox"]) -> "BoundingBox":
+        if other is None:
+            return self
+        return BoundingBox(min(self.min_x, other.min_x), min(self.min_y, other.min_y),
+                           max(self.max_x, other.max_x), max(self.max_y, other.max_y))
@@ -1,3 +1,5 @@
+from typing import Optional
+from shapes.bounds import BoundingBox
 from shapes.shape import Shape
 
 class Circle(Shape):
@@ -6,13 +8,26 @@ class Circle(Shape):
     Delegates the actual drawing to its Renderer.
     """
 
+    __slots__ = ("x", "y", "radius")
+    GEOMETRY = frozenset({"x", "y", "radius"})
+
     def __init__(self, renderer, x: float, y: float, radius: float):
         super().__init__(renderer)
         self.x = x
         self.y = y
         self.radius = radius
 
-    def draw(self) -> None:
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        if self._outside(viewport):
+            return
         print(f"[Circle] Requesting draw_circle at ({self.x}, {self.y}) with radius {self.radius}")
         self.renderer.draw_circle(self.x, self.y, self.radius)
+
+    def bounding_box(self) -> BoundingBox:
+        r = self.radius
+        return BoundingBox(self.x - r, self.y - r, self.x + r, self.y + r)
+
+    def contains(self, x: float, y: float) -> bool:
+        dx, dy = x - self.x, y - self.y
+        return dx * dx + dy * dy <= self.radius * self.radius
         
\ No newline at end of file
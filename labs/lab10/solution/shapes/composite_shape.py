@@ -1,24 +1,241 @@
+from itertools import count
+from typing import Dict, List, Optional
+from renderers.tracing import active_tracers
+from shapes.bounds import BoundingBox
+from shapes.quadtree import QuadTree
 from shapes.shape import Shape
 
 class CompositeShape(Shape):
     """
     CompositeShape (Composite Leaf). Allows grouping multiple Shape instances
     and drawing them as a unit. Implements the same draw() interface.
+
+    Children are kept in a quadtree keyed by their bounding boxes, so
+    draw(viewport) only visits children that overlap the viewport and
+    shapes_at(x, y) only tests children around the point. Children are still
+    drawn in the order they were added.
+
+    Children report their own changes (see Shape), so moving or resizing a
+    child needs no extra call: changed children are re-indexed lazily before
+    the next query, and the bounding boxes of the composites above them are
+    recomputed when next asked for. take_dirty_regions() returns the areas
+    that changed since it was last called (old and new boxes of moved
+    shapes, boxes of added and removed ones) so a renderer can redraw just
+    those. A shape belongs to at most one composite.
+
+    Children can also be ShapeRanges: blocks of shapes kept in a ShapeStore,
+    which are indexed, culled and drawn as one child.
+
+    name labels the composite in profiles. The tracers active in the
+    drawing thread (see renderers.tracing and ProfilingRenderer.trace()) are
+    told when each composite starts and finishes drawing.
     """
 
-    def __init__(self):
+    __slots__ = ("name", "_children", "_sequence", "_index", "_unbounded", "_box", "_box_valid",
+                 "_stale", "_changed", "_regions")
+
+    def __init__(self, name: Optional[str] = None):
         # Note: CompositeShape does not need its own Renderer; each child has its renderer.
         super().__init__(renderer=None)
-        self.children = []
+        self.name = name
+        # Child -> insertion sequence number, which is also the draw order
+        self._children: Dict[Shape, int] = {}
+        self._sequence = count()
+        self._index = QuadTree()
+        # Children without a box (empty composites) are never culled
+        self._unbounded: Dict[Shape, None] = {}
+        self._box: Optional[BoundingBox] = None
+        self._box_valid = True
+        # Children to re-index before the next query
+        self._stale: Dict[Shape, None] = {}
+        # Children with changes not yet reported by take_dirty_regions(); True if newly added
+        self._changed: Dict[Shape, bool] = {}
+        # Areas vacated by removed children, not yet reported
+        self._regions: List[BoundingBox] = []
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._changed or self._regions)
+
+    @property
+    def children(self) -> List[Shape]:
+        return list(self._children)
 
     def add(self, shape: Shape) -> None:
-        self.children.append(shape)
+        if shape in self._children:
+            raise ValueError("Shape is already in this CompositeShape.")
+        if shape.parent is not None:
+            raise ValueError("Shape already belongs to another CompositeShape.")
+        self._children[shape] = next(self._sequence)
+        shape.parent = self
+        self._place(shape)
+        self._changed[shape] = True
+        self._touched()
 
     def remove(self, shape: Shape) -> None:
-        self.children.remove(shape)
+        if shape not in self._children:
+            raise ValueError("Shape is not in this CompositeShape.")
+        del self._children[shape]
+        if shape in self._index:
+            self._index.remove(shape)
+        self._unbounded.pop(shape, None)
+        self._stale.pop(shape, None)
+        self._changed.pop(shape, None)
+        shape.parent = None
+        # Whatever the shape covered, before or after pending changes, needs redrawing
+        shape._take_regions(self._regions)
+        box = shape.bounding_box()
+        if box is not None:
+            self._regions.append(box)
+        self._touched()
+
+    def update(self, shape: Shape) -> None:
+        """
+        Re-read a child's bounding box now. Changes to the geometry of
+        Circle, Rectangle and Triangle are picked up on their own; this is
+        for shapes that do not track their changes.
+        """
+        if shape not in self._children:
+            raise ValueError("Shape is not in this CompositeShape.")
+        self._place(shape)
+
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        tracers = active_tracers.get()
+        if not tracers:
+            self._draw(viewport)
+            return
+        for tracer in tracers:
+            tracer.enter(self)
+        try:
+            self._draw(viewport)
+        finally:
+            for tracer in reversed(tracers):
+                tracer.leave()
+
+    def draw_regions(self, regions: List[BoundingBox]) -> None:
+        """
+        Draw the children that overlap any of the regions, each once and in
+        draw order, passing the regions on to nested composites.
+        """
+        tracers = active_tracers.get()
+        if not tracers:
+            self._draw_regions(regions)
+            return
+        for tracer in tracers:
+            tracer.enter(self)
+        try:
+            self._draw_regions(regions)
+        finally:
+            for tracer in reversed(tracers):
+                tracer.leave()
+
+    def _draw(self, viewport: Optional[BoundingBox]) -> None:
+        if viewport is None:
+            print(f"[CompositeShape] Drawing CompositeShape with {len(self._children)} child(ren).")
+            for child in self._children:
+                child.draw()
+            return
+        self._refresh()
+        visible = self._in_draw_order(self._index.query(viewport))
+        print(f"[CompositeShape] Drawing {len(visible)} of {len(self._children)} child(ren) in the viewport.")
+        for child in visible:
+            child.draw(viewport)
+
+    def _draw_regions(self, regions: List[BoundingBox]) -> None:
+        self._refresh()
+        hits: Dict[Shape, None] = {}
+        for region in regions:
+            hits.update(dict.fromkeys(self._index.query(region)))
+        visible = self._in_draw_order(list(hits))
+        print(f"[CompositeShape] Drawing {len(visible)} of {len(self._children)} child(ren) in {len(regions)} region(s).")
+        for child in visible:
+            if isinstance(child, CompositeShape):
+                box = child.bounding_box()
+                child.draw_regions([region for region in regions if box is not None and box.intersects(region)])
+            else:
+                child.draw_regions(regions)
+
+    def shapes_at(self, x: float, y: float) -> List[Shape]:
+        """
+        Return the leaf shapes that contain the point (x, y), searching nested
+        composites too, in draw order (the topmost shape is last).
+        """
+        self._refresh()
+        found = []
+        for child in self._in_draw_order(self._index.query_point(x, y)):
+            found.extend(child.shapes_at(x, y))
+        return found
+
+    def contains(self, x: float, y: float) -> bool:
+        return bool(self.shapes_at(x, y))
+
+    def bounding_box(self) -> Optional[BoundingBox]:
+        if not self._box_valid:
+            self._refresh()
+            box = None
+            for child in self._children:
+                if child in self._index:
+                    box = self._index.box(child).union(box)
+            self._box = box
+            self._box_valid = True
+        return self._box
+
+    def take_dirty_regions(self) -> List[BoundingBox]:
+        """
+        Return the areas that need redrawing because of changes since the
+        last call, searching nested composites too, and mark everything clean.
+        The boxes may overlap.
+        """
+        regions: List[BoundingBox] = []
+        self._take_regions(regions)
+        return regions
+
+    def _take_regions(self, regions: List[BoundingBox]) -> None:
+        regions.extend(self._regions)
+        self._regions.clear()
+        for shape, added in self._changed.items():
+            if added:
+                # The shape is new here, so its whole box changed; its own pending changes are covered by that
+                shape._take_regions([])
+                box = shape.bounding_box()
+                if box is not None:
+                    regions.append(box)
+            else:
+                shape._take_regions(regions)
+        self._changed.clear()
+
+    def _child_changed(self, shape: Shape) -> None:
+        if shape in self._stale and shape in self._changed:
+            return
+        self._stale[shape] = None
+        self._changed.setdefault(shape, False)
+        self._touched()
+
+    def _touched(self) -> None:
+        # This composite's box may have changed: tell the composite above
+        self._box_valid = False
+        if self.parent is not None:
+            self.parent._child_changed(self)
+
+    def _refresh(self) -> None:
+        if self._stale:
+            for shape in self._stale:
+                self._place(shape)
+            self._stale.clear()
+
+    def _place(self, shape: Shape) -> None:
+        box = shape.bounding_box()
+        if box is None:
+            if shape in self._index:
+                self._index.remove(shape)
+            self._unbounded[shape] = None
+        else:
+            self._unbounded.pop(shape, None)
+            self._index.update(shape, box)
+        self._box_valid = False
 
-    def draw(self) -> None:
-        print(f"[CompositeShape] Drawing CompositeShape with {len(self.children)} child(ren).")
-        for child in self.children:
-            child.draw()
-            
\ No newline at end of file
+    def _in_draw_order(self, shapes: List[Shape]) -> List[Shape]:
+        if self._unbounded:
+            shapes = shapes + list(self._unbounded)
+        order = self._children
+        return sorted(shapes, key=order.__getitem__)
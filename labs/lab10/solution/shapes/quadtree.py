@@ -0,0 +1,169 @@
+from typing import Dict, Hashable, List, Optional
+from shapes.bounds import BoundingBox
+
+class _Node:
+    __slots__ = ("bounds", "loose", "mid_x", "mid_y", "items", "children")
+
+    def __init__(self, bounds: BoundingBox, mid_x: Optional[float] = None, mid_y: Optional[float] = None):
+        self.bounds = bounds
+        # Items may overhang the node's square by up to half its size on each side
+        margin = (bounds.max_x - bounds.min_x) / 2
+        self.loose = BoundingBox(bounds.min_x - margin, bounds.min_y - margin,
+                                 bounds.max_x + margin, bounds.max_y + margin)
+        # Where the quadrants meet
+        self.mid_x = (bounds.min_x + bounds.max_x) / 2 if mid_x is None else mid_x
+        self.mid_y = (bounds.min_y + bounds.max_y) / 2 if mid_y is None else mid_y
+        # Items whose box lies entirely inside this node but in none of its children
+        self.items: Dict[Hashable, BoundingBox] = {}
+        self.children: Optional[List["_Node"]] = None
+
+
+class QuadTree:
+    """
+    Spatial index of items with bounding boxes, for box and point queries.
+
+    Each node covers a square and splits into four quadrants once it holds
+    more than max_items. The tree is "loose": an item goes to the quadrant
+    holding its center as long as it overhangs that quadrant by no more than
+    half the quadrant's size, so small items on a quadrant border still sink
+    to small nodes instead of piling up near the root. The root grows
+    (doubling its square) when an item falls outside it, so no world size
+    has to be known in advance.
+
+    Insert, remove and update touch a single path of nodes; queries only
+    visit nodes whose square overlaps the query.
+    """
+
+    def __init__(self, max_items: int = 16, min_size: float = 1e-6):
+        self.max_items = max_items
+        self.min_size = min_size
+        self._root: Optional[_Node] = None
+        self._nodes: Dict[Hashable, _Node] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._nodes
+
+    def insert(self, item: Hashable, box: BoundingBox) -> None:
+        if item in self._nodes:
+            self.remove(item)
+        root = self._root
+        if root is None or (root.children is None and not root.bounds.contains(box)):
+            # A root without quadrants holds only a few items: just resize it to fit
+            area = box
+            if root is not None:
+                for other in root.items.values():
+                    area = area.union(other)
+            # Twice the needed size, centered, so a few more nearby items fit without resizing again
+            size = 2 * max(area.max_x - area.min_x, area.max_y - area.min_y, 1.0)
+            min_x = (area.min_x + area.max_x - size) / 2
+            min_y = (area.min_y + area.max_y - size) / 2
+            self._root = _Node(BoundingBox(min_x, min_y, min_x + size, min_y + size))
+            if root is not None:
+                self._root.items = root.items
+                for other in root.items:
+                    self._nodes[other] = self._root
+        while not self._root.bounds.contains(box):
+            self._grow(box)
+        self._insert(self._root, item, box)
+
+    def remove(self, item: Hashable) -> None:
+        node = self._nodes.pop(item)
+        del node.items[item]
+
+    def update(self, item: Hashable, box: BoundingBox) -> None:
+        """
+        Move an item to a new box. Cheap when it stays in the same node.
+        """
+        node = self._nodes.get(item)
+        if node is not None and node.loose.contains(box) and (
+                node.children is None or self._child_containing(node, box) is None):
+            node.items[item] = box
+            return
+        self.insert(item, box)
+
+    def box(self, item: Hashable) -> BoundingBox:
+        return self._nodes[item].items[item]
+
+    def query(self, area: BoundingBox) -> List[Hashable]:
+        """
+        Return the items whose boxes intersect area.
+        """
+        found = []
+        if self._root is None:
+            return found
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for item, box in node.items.items():
+                if box.intersects(area):
+                    found.append(item)
+            if node.children is not None:
+                for child in node.children:
+                    if child.loose.intersects(area):
+                        stack.append(child)
+        return found
+
+    def query_point(self, x: float, y: float) -> List[Hashable]:
+        """
+        Return the items whose boxes contain the point (x, y).
+        """
+        return self.query(BoundingBox(x, y, x, y))
+
+    def _insert(self, node: _Node, item: Hashable, box: BoundingBox) -> None:
+        while True:
+            if node.children is None:
+                if len(node.items) < self.max_items or node.bounds.max_x - node.bounds.min_x < self.min_size:
+                    break
+                self._split(node)
+            child = self._child_containing(node, box)
+            if child is None:
+                break
+            node = child
+        node.items[item] = box
+        self._nodes[item] = node
+
+    def _split(self, node: _Node) -> None:
+        b = node.bounds
+        mid_x, mid_y = node.mid_x, node.mid_y
+        node.children = [_Node(BoundingBox(b.min_x, b.min_y, mid_x, mid_y)),
+                         _Node(BoundingBox(mid_x, b.min_y, b.max_x, mid_y)),
+                         _Node(BoundingBox(b.min_x, mid_y, mid_x, b.max_y)),
+                         _Node(BoundingBox(mid_x, mid_y, b.max_x, b.max_y))]
+        items = node.items
+        node.items = {}
+        for item, box in items.items():
+            child = self._child_containing(node, box)
+            target = child if child is not None else node
+            target.items[item] = box
+            self._nodes[item] = target
+
+    @staticmethod
+    def _child_containing(node: _Node, box: BoundingBox) -> Optional[_Node]:
+        # The quadrant holding the box's center, if the box fits in that quadrant's loose bounds
+        column = 0 if box.min_x + box.max_x < 2 * node.mid_x else 1
+        row = 0 if box.min_y + box.max_y < 2 * node.mid_y else 2
+        child = node.children[row + column]
+        return child if child.loose.contains(box) else None
+
+    def _grow(self, box: BoundingBox) -> None:
+        # Double the root's square towards the box; the old root becomes one quadrant
+        old = self._root
+        b = old.bounds
+        size = b.max_x - b.min_x
+        grow_left = box.min_x < b.min_x
+        grow_up = box.min_y < b.min_y
+        min_x = b.min_x - size if grow_left else b.min_x
+        min_y = b.min_y - size if grow_up else b.min_y
+        # The midlines are the old root's edges exactly, so it fits its quadrant without rounding
+        mid_x = b.min_x if grow_left else b.max_x
+        mid_y = b.min_y if grow_up else b.max_y
+        root = _Node(BoundingBox(min_x, min_y, min_x + 2 * size, min_y + 2 * size), mid_x, mid_y)
+        root.children = [_Node(BoundingBox(min_x, min_y, mid_x, mid_y)),
+                         _Node(BoundingBox(mid_x, min_y, root.bounds.max_x, mid_y)),
+                         _Node(BoundingBox(min_x, mid_y, mid_x, root.bounds.max_y)),
+                         _Node(BoundingBox(mid_x, mid_y, root.bounds.max_x, root.bounds.max_y))]
+        root.children[(2 if grow_up else 0) + (1 if grow_left else 0)] = old
+        self._root = root
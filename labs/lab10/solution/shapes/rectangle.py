@@ -1,3 +1,5 @@
+from typing import Optional
+from shapes.bounds import BoundingBox
 from shapes.shape import Shape
 
 class Rectangle(Shape):
@@ -6,6 +8,9 @@ class Rectangle(Shape):
     Delegates actual drawing to its Renderer.
     """
 
+    __slots__ = ("x", "y", "width", "height")
+    GEOMETRY = frozenset({"x", "y", "width", "height"})
+
     def __init__(self, renderer, x: float, y: float, width: float, height: float):
         super().__init__(renderer)
         self.x = x
@@ -13,7 +18,15 @@ class Rectangle(Shape):
         self.width = width
         self.height = height
 
-    def draw(self) -> None:
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        if self._outside(viewport):
+            return
         print(f"[Rectangle] Requesting draw_rectangle at ({self.x}, {self.y}) w={self.width}, h={self.height}")
         self.renderer.draw_rectangle(self.x, self.y, self.width, self.height)
+
+    def bounding_box(self) -> BoundingBox:
+        return BoundingBox(self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def contains(self, x: float, y: float) -> bool:
+        return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
         
\ No newline at end of file
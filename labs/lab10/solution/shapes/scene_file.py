@@ -0,0 +1,360 @@
+import json
+import math
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.shape import Shape
+from shapes.shape_store import ShapeRange, ShapeStore
+from shapes.triangle import Triangle
+
+# File layout (all little-endian):
+#   header       magic, version, group count, offset of the group table
+#   group items  for each group, its children in draw order, as items:
+#                  run:   kind (0 circle, 1 rectangle, 2 triangle), count, renderer tag,
+#                         then count records of doubles
+#                  group: kind 3, index of the child group in the table, 0
+#   group table  for each group: offset of its first item, item count, bounding box (NaNs if none)
+# Group 0 is the root. A renderer tag is an index into the renderer table save_scene() returns.
+MAGIC = b"L10S"
+VERSION = 2
+_HEADER = struct.Struct("<4sHxxQQ")
+_ITEM = struct.Struct("<BIH")
+_GROUP = struct.Struct("<QI4d")
+_GROUP_ITEM = 3
+_KINDS = (("circle", Circle, ("x", "y", "radius")),
+          ("rectangle", Rectangle, ("x", "y", "width", "height")),
+          ("triangle", Triangle, ("x1", "y1", "x2", "y2", "x3", "y3")))
+
+def save_scene(scene: CompositeShape, path: str) -> List[Renderer]:
+    """
+    Write a scene to path in the binary scene format. Groups that were
+    loaded lazily are read in full first.
+
+    Renderers cannot be saved, so each run of shapes records a tag for its
+    renderer instead: the renderer's index in the returned table, which
+    lists the scene's renderers in the order they are first used. Pass the
+    same table (or renderers standing in for them) to load_scene() to draw
+    every shape with the renderer it was saved with.
+
+    The file is written next to path and then moved over it, so a scene can
+    be saved over the file its lazy groups are still being read from: the
+    open SceneFile keeps mapping the old file until it is closed.
+    """
+    temporary = path + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            renderers = _write_scene(scene, f)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return renderers
+
+
+def load_scene(path: str, renderers: Union[Renderer, Sequence[Renderer]],
+               store: Optional[ShapeStore] = None) -> CompositeShape:
+    """
+    Read a whole scene from a binary scene file. renderers is the table
+    save_scene() returned, or one Renderer to draw every shape with. With a
+    store, runs of shapes are loaded into it as ShapeRanges instead of one
+    object per shape (see SceneFile).
+    """
+    with SceneFile(path, renderers, store) as scene_file:
+        return scene_file.load_group(0, lazy=False)
+
+
+class SceneFile:
+    """
+    An open binary scene file, memory-mapped. root is the scene as a
+    LazyGroup, which reads a group only when it is drawn or searched: a
+    scene can be opened and one part of it drawn without reading the
+    rest. The file must stay open while lazy groups may still load.
+
+    renderers is the renderer table save_scene() returned, or one Renderer
+    for all shapes. Runs drawn by the store's renderer are loaded into the
+    store; runs of other renderers go into a ShapeStore per renderer, made
+    when first needed and kept in stores.
+    """
+
+    def __init__(self, path: str, renderers: Union[Renderer, Sequence[Renderer]],
+                 store: Optional[ShapeStore] = None):
+        self.renderers = renderers
+        self.store = store
+        self.stores: Dict[int, ShapeStore] = {}
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            magic = version = None
+        else:
+            magic, version, self.group_count, self._table = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} scene file.")
+        self.root = self.group(0)
+
+    def renderer(self, tag: int) -> Renderer:
+        """
+        The renderer for a renderer tag of the file.
+        """
+        if isinstance(self.renderers, Renderer):
+            return self.renderers
+        if not 0 <= tag < len(self.renderers):
+            raise ValueError(f"Scene file uses renderer {tag}, "
+                             f"but only {len(self.renderers)} renderer(s) were given.")
+        return self.renderers[tag]
+
+    def group(self, index: int) -> "LazyGroup":
+        if not 0 <= index < self.group_count:
+            raise IndexError(f"No group {index} in a scene file with {self.group_count} groups.")
+        box = _GROUP.unpack_from(self._map, self._table + index * _GROUP.size)[2:]
+        return LazyGroup(self, index, None if math.isnan(box[0]) else BoundingBox(*box))
+
+    def load_group(self, index: int, lazy: bool = True) -> CompositeShape:
+        """
+        Read one group. Its subgroups become LazyGroups, or with lazy=False
+        are read in full too.
+        """
+        offset, count = _GROUP.unpack_from(self._map, self._table + index * _GROUP.size)[:2]
+        group = CompositeShape()
+        for _ in range(count):
+            kind, value, tag = _ITEM.unpack_from(self._map, offset)
+            offset += _ITEM.size
+            if kind == _GROUP_ITEM:
+                group.add(self.group(value) if lazy else self.load_group(value, lazy=False))
+                continue
+            name, shape_class, fields = _KINDS[kind]
+            renderer = self.renderer(tag)
+            records = np.frombuffer(self._map, dtype="<f8", count=value * len(fields), offset=offset)
+            offset += records.nbytes
+            records = records.reshape(value, len(fields))
+            if self.store is not None:
+                group.add(getattr(self._store(tag, renderer), f"add_{name}s")(*records.T))
+            else:
+                for row in records.tolist():
+                    group.add(shape_class(renderer, *row))
+            del records
+        return group
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "SceneFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _store(self, tag: int, renderer: Renderer) -> ShapeStore:
+        if renderer is self.store.renderer:
+            return self.store
+        store = self.stores.get(tag)
+        if store is None:
+            store = self.stores[tag] = ShapeStore(renderer)
+        return store
+
+
+class LazyGroup(Shape):
+    """
+    A group of a SceneFile that is read on first use. Its bounding box
+    comes from the file's group table, so viewport culling and hit-tests
+    that miss it never read it.
+    """
+
+    __slots__ = ("file", "index", "_box", "_group")
+
+    def __init__(self, file: SceneFile, index: int, box: Optional[BoundingBox]):
+        # Like a CompositeShape, a group has no renderer of its own
+        super().__init__(None)
+        self.file = file
+        self.index = index
+        self._box = box
+        self._group: Optional[CompositeShape] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._group is not None
+
+    @property
+    def dirty(self) -> bool:
+        return self._group is not None and self._group.dirty
+
+    def load(self) -> CompositeShape:
+        """
+        Return the group's CompositeShape, reading it from the file the first time.
+        """
+        if self._group is None:
+            self._group = self.file.load_group(self.index)
+            # Reading the group is not a change to the scene
+            self._group.take_dirty_regions()
+            self._group.parent = self
+        return self._group
+
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        box = self.bounding_box()
+        if viewport is not None and (box is None or not box.intersects(viewport)):
+            return
+        self.load().draw(viewport)
+
+    def draw_regions(self, regions: List[BoundingBox]) -> None:
+        self.load().draw_regions(regions)
+
+    def bounding_box(self) -> Optional[BoundingBox]:
+        return self._box if self._group is None else self._group.bounding_box()
+
+    def shapes_at(self, x: float, y: float) -> List[Shape]:
+        box = self.bounding_box()
+        if box is None or not box.contains_point(x, y):
+            return []
+        return self.load().shapes_at(x, y)
+
+    def contains(self, x: float, y: float) -> bool:
+        return bool(self.shapes_at(x, y))
+
+    def _child_changed(self, group: CompositeShape) -> None:
+        if self.parent is not None:
+            self.parent._child_changed(self)
+
+    def _take_regions(self, regions: List[BoundingBox]) -> None:
+        if self._group is not None:
+            self._group._take_regions(regions)
+
+
+def scene_to_dict(shape: Shape, renderers: Optional[List[Renderer]] = None) -> dict:
+    """
+    The shape as plain data for JSON: composites as {"type": "composite",
+    "children": [...]}, other shapes as {"type": "circle", "x": ..., ...}.
+    ShapeRanges become one entry per shape. With a renderers list, each
+    shape also gets a "renderer" tag, its renderer's index in the list;
+    renderers not in it yet are appended.
+    """
+    if isinstance(shape, (CompositeShape, LazyGroup)):
+        children = []
+        for child in _composite(shape).children:
+            if isinstance(child, ShapeRange):
+                children.extend(scene_to_dict(child[i], renderers) for i in range(len(child)))
+            else:
+                children.append(scene_to_dict(child, renderers))
+        return {"type": "composite", "children": children}
+    name, _, fields = _KINDS[_kind_of(shape)]
+    data = {"type": name}
+    data.update((field, getattr(shape, field)) for field in fields)
+    if renderers is not None:
+        data["renderer"] = _renderer_tag(renderers, shape.renderer)
+    return data
+
+
+def scene_from_dict(data: dict, renderers: Union[Renderer, Sequence[Renderer]]) -> Shape:
+    """
+    Build a scene from scene_to_dict() data. renderers is the list the tags
+    index into, or one Renderer for every shape.
+    """
+    if data["type"] == "composite":
+        group = CompositeShape()
+        for child in data["children"]:
+            group.add(scene_from_dict(child, renderers))
+        return group
+    for name, shape_class, fields in _KINDS:
+        if data["type"] == name:
+            renderer = renderers if isinstance(renderers, Renderer) else renderers[data.get("renderer", 0)]
+            return shape_class(renderer, *(data[field] for field in fields))
+    raise ValueError(f"Unknown shape type {data['type']!r}.")
+
+
+def save_json(scene: Shape, path: str) -> List[Renderer]:
+    """
+    Write a scene to path as JSON and return its renderer table, as save_scene() does.
+    """
+    renderers: List[Renderer] = []
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(scene_to_dict(scene, renderers), f, separators=(",", ":"))
+    return renderers
+
+
+def load_json(path: str, renderers: Union[Renderer, Sequence[Renderer]]) -> Shape:
+    with open(path, encoding="utf-8") as f:
+        return scene_from_dict(json.load(f), renderers)
+
+
+def _composite(shape: Shape) -> CompositeShape:
+    return shape.load() if isinstance(shape, LazyGroup) else shape
+
+
+def _kind_of(shape) -> int:
+    # Index into _KINDS of a shape, or of a shape kind name
+    for kind, (name, shape_class, _) in enumerate(_KINDS):
+        if shape == name or isinstance(shape, shape_class):
+            return kind
+    raise ValueError(f"Cannot save a {type(shape).__name__} in a scene file.")
+
+
+def _renderer_tag(renderers: List[Renderer], renderer: Renderer) -> int:
+    # Index of renderer in the table, compared by identity; new renderers are appended
+    for tag, known in enumerate(renderers):
+        if known is renderer:
+            return tag
+    renderers.append(renderer)
+    return len(renderers) - 1
+
+
+def _write_scene(scene: CompositeShape, f) -> List[Renderer]:
+    groups: List[CompositeShape] = [_composite(scene)]
+    renderers: List[Renderer] = []
+    table = []
+    f.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+    # Groups are numbered as they are found, so a group's children get
+    # their numbers while it is written and are written after it
+    for group in groups:
+        table.append((f.tell(), group))
+        count = 0
+        # A run is consecutive shapes of one kind drawn by one renderer
+        run_key, run = None, []
+        for child in group.children:
+            if isinstance(child, (CompositeShape, LazyGroup)):
+                count += _write_run(f, run_key, run)
+                run_key, run = None, []
+                f.write(_ITEM.pack(_GROUP_ITEM, len(groups), 0))
+                groups.append(_composite(child))
+                count += 1
+            elif isinstance(child, ShapeRange):
+                count += _write_run(f, run_key, run)
+                run_key, run = None, []
+                key = (_kind_of(child.columns.kind), _renderer_tag(renderers, child.renderer))
+                records = child.columns.columns(child.start, child.stop).T
+                count += _write_run(f, key, [np.ascontiguousarray(records, dtype="<f8").tobytes()], len(child))
+            else:
+                key = (_kind_of(child), _renderer_tag(renderers, child.renderer))
+                if key != run_key:
+                    count += _write_run(f, run_key, run)
+                    run_key, run = key, []
+                run.append(tuple(getattr(child, field) for field in _KINDS[key[0]][2]))
+        count += _write_run(f, run_key, run)
+        table[-1] = (table[-1][0], count, group.bounding_box())
+    table_offset = f.tell()
+    for offset, count, box in table:
+        f.write(_GROUP.pack(offset, count, *(box if box is not None else (math.nan,) * 4)))
+    f.seek(0)
+    f.write(_HEADER.pack(MAGIC, VERSION, len(table), table_offset))
+    return renderers
+
+
+def _write_run(f, key: Optional[tuple], records, count: Optional[int] = None) -> int:
+    # Write a run of records (tuples, or already packed bytes) of one (kind, renderer tag)
+    # and return the number of items written
+    if key is None or not records:
+        return 0
+    if count is None:
+        count = len(records)
+        records = [np.asarray(records, dtype="<f8").tobytes()]
+    kind, tag = key
+    f.write(_ITEM.pack(kind, count, tag))
+    for chunk in records:
+        f.write(chunk)
+    return 1
@@ -1,16 +1,101 @@
 from abc import ABC, abstractmethod
+from typing import FrozenSet, List, Optional
 from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
 
 class Shape(ABC):
     """
     Abstract Shape (Bridge Abstraction). Each concrete Shape holds a reference to a Renderer
     and calls its methods when draw() is invoked. This decouples Shape hierarchies from Renderer hierarchies.
+
+    Shapes also know their bounding box, so draw(viewport) can skip shapes that
+    are off-screen, and whether they contain a point, for hit-testing.
+
+    Shapes track their own changes: assigning one of the GEOMETRY attributes
+    of a shape inside a CompositeShape marks it dirty, remembers the box it
+    covered before the change, and tells its parent, which re-indexes it
+    before its next query and reports the old and new boxes from
+    take_dirty_regions().
+
+    Shapes use __slots__, so they carry no per-instance __dict__; subclasses
+    should declare __slots__ too. For scenes of millions of shapes, see
+    ShapeStore.
     """
 
+    __slots__ = ("parent", "_dirty_box", "renderer")
+
+    # Attributes that position or size the shape
+    GEOMETRY: FrozenSet[str] = frozenset()
+
     def __init__(self, renderer: Renderer):
+        # The CompositeShape this shape belongs to, set by CompositeShape.add()
+        self.parent = None
+        # The box the shape covered before its first change since the last redraw, or None if clean
+        self._dirty_box: Optional[BoundingBox] = None
         self.renderer = renderer
 
+    def __setattr__(self, name: str, value) -> None:
+        if name in self.GEOMETRY and self.parent is not None:
+            self._changing()
+        object.__setattr__(self, name, value)
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the shape changed since its parent last reported dirty regions.
+        """
+        return self._dirty_box is not None
+
+    @abstractmethod
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        """
+        Draw the shape, or nothing if a viewport is given and the shape lies outside it.
+        """
+        pass
+
     @abstractmethod
-    def draw(self) -> None:
+    def bounding_box(self) -> Optional[BoundingBox]:
+        """
+        The smallest axis-aligned box around the shape, or None if it covers nothing.
+        """
         pass
-    
\ No newline at end of file
+
+    @abstractmethod
+    def contains(self, x: float, y: float) -> bool:
+        """
+        Whether the point (x, y) lies inside the shape.
+        """
+        pass
+
+    def draw_regions(self, regions: List[BoundingBox]) -> None:
+        """
+        Draw the parts of the shape that overlap any of the regions. The
+        caller has already checked that the shape overlaps one of them.
+        """
+        self.draw()
+
+    def shapes_at(self, x: float, y: float) -> List["Shape"]:
+        """
+        Return the leaf shapes under the point (x, y), in draw order.
+        """
+        return [self] if self.contains(x, y) else []
+
+    def _outside(self, viewport: Optional[BoundingBox]) -> bool:
+        if viewport is None:
+            return False
+        box = self.bounding_box()
+        # A shape that covers nothing is never visible
+        return box is None or not box.intersects(viewport)
+
+    def _take_regions(self, regions: List[BoundingBox]) -> None:
+        # Append the boxes covered before and after the pending changes, and mark the shape clean
+        if self._dirty_box is not None:
+            regions.append(self._dirty_box)
+            regions.append(self.bounding_box())
+            self._dirty_box = None
+
+    def _changing(self) -> None:
+        # Called before a geometry attribute changes
+        if self._dirty_box is None:
+            self._dirty_box = self.bounding_box()
+        self.parent._child_changed(self)
@@ -0,0 +1,280 @@
+import weakref
+from typing import Dict, List, MutableMapping, Optional, Tuple
+import numpy as np
+from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.rectangle import Rectangle
+from shapes.shape import Shape
+from shapes.triangle import Triangle
+
+class ShapeColumns:
+    """
+    The records of one shape kind in a ShapeStore: one NumPy array per
+    geometry field, grown by doubling as records are added.
+    """
+
+    __slots__ = ("kind", "fields", "_data", "_size")
+
+    def __init__(self, kind: str, fields: Tuple[str, ...], dtype=np.float64, capacity: int = 1_024):
+        self.kind = kind
+        self.fields = fields
+        # One row per field, so each column is contiguous
+        self._data = np.empty((len(fields), max(capacity, 1)), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """
+        Writable view of one field of all records. Writing through it is not
+        tracked as a change; see ShapeRange.
+        """
+        return self._data[self.fields.index(field), :self._size]
+
+    def columns(self, start: int, stop: int) -> np.ndarray:
+        return self._data[:, start:stop]
+
+    def append(self, values) -> int:
+        """
+        Add records, given one sequence per field, and return the index of the first.
+        """
+        values = [np.asarray(column, dtype=self._data.dtype).reshape(-1) for column in values]
+        if len(values) != len(self.fields) or len({len(column) for column in values}) > 1:
+            raise ValueError(f"A {self.kind} needs one value per field of {self.fields}, all the same length.")
+        count = len(values[0])
+        first = self._size
+        if first + count > self._data.shape[1]:
+            capacity = max(self._data.shape[1] * 2, first + count)
+            data = np.empty((len(self.fields), capacity), dtype=self._data.dtype)
+            data[:, :first] = self._data[:, :first]
+            self._data = data
+        for row, column in zip(self._data, values):
+            row[first:first + count] = column
+        self._size = first + count
+        return first
+
+    def boxes(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bounding boxes of records start to stop as min_x, min_y, max_x, max_y arrays.
+        """
+        columns = self._data[:, start:stop]
+        if self.kind == "circle":
+            x, y, r = columns
+            return x - r, y - r, x + r, y + r
+        if self.kind == "rectangle":
+            x, y, w, h = columns
+            return x, y, x + w, y + h
+        xs, ys = columns[0::2], columns[1::2]
+        return xs.min(axis=0), ys.min(axis=0), xs.max(axis=0), ys.max(axis=0)
+
+
+class ShapeStore:
+    """
+    Compact storage for scenes with very many shapes. Circles, rectangles
+    and triangles are kept as typed NumPy columns per kind (for example a
+    circle is three float64s) and all share the store's renderer, instead of
+    each being a Python object with its own renderer reference.
+
+    add_circles() and friends append a block of shapes and return a
+    ShapeRange, which is a Shape: add it to a CompositeShape to index, cull
+    and draw the whole block as one child. Shape objects for single records
+    are only created on demand, as views; see ShapeRange.
+    """
+
+    def __init__(self, renderer: Renderer, dtype=np.float64, capacity: int = 1_024):
+        self.renderer = renderer
+        self.circles = ShapeColumns("circle", ("x", "y", "radius"), dtype, capacity)
+        self.rectangles = ShapeColumns("rectangle", ("x", "y", "width", "height"), dtype, capacity)
+        self.triangles = ShapeColumns("triangle", ("x1", "y1", "x2", "y2", "x3", "y3"), dtype, capacity)
+
+    def __len__(self) -> int:
+        return len(self.circles) + len(self.rectangles) + len(self.triangles)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the geometry columns, including spare capacity.
+        """
+        return self.circles._data.nbytes + self.rectangles._data.nbytes + self.triangles._data.nbytes
+
+    def add_circles(self, xs, ys, radii) -> "ShapeRange":
+        return self._append(self.circles, (xs, ys, radii))
+
+    def add_rectangles(self, xs, ys, widths, heights) -> "ShapeRange":
+        return self._append(self.rectangles, (xs, ys, widths, heights))
+
+    def add_triangles(self, x1s, y1s, x2s, y2s, x3s, y3s) -> "ShapeRange":
+        return self._append(self.triangles, (x1s, y1s, x2s, y2s, x3s, y3s))
+
+    def range(self, kind: str, start: int, stop: int) -> "ShapeRange":
+        """
+        Return a ShapeRange over records start to stop of one kind ("circle",
+        "rectangle" or "triangle"). Ranges that end up in the same scene
+        should not overlap, or changes seen by one will be missed by the other.
+        """
+        columns = {"circle": self.circles, "rectangle": self.rectangles, "triangle": self.triangles}.get(kind)
+        if columns is None:
+            raise ValueError(f"Unknown shape kind {kind!r}.")
+        if not 0 <= start <= stop <= len(columns):
+            raise IndexError(f"Records {start} to {stop} are not all in the store ({len(columns)} {kind}s).")
+        return ShapeRange(self, columns, start, stop)
+
+    def _append(self, columns: ShapeColumns, values) -> "ShapeRange":
+        first = columns.append(values)
+        return ShapeRange(self, columns, first, len(columns))
+
+
+class ShapeRange(Shape):
+    """
+    A block of consecutive records of one kind in a ShapeStore, usable as a
+    Shape: draw() sends the whole block (or the part inside the viewport) to
+    the renderer's bulk draw method in one call, and the bounding box,
+    hit-testing and dirty regions are worked out on the columns.
+
+    range[i] returns a Circle, Rectangle or Triangle view of record i of the
+    block whose attributes read and write the store. A record has one view
+    at a time: range[i] returns the same object for as long as it is
+    referenced (or has unreported changes). Changes made through views are
+    tracked like changes to ordinary shapes; writes straight to the store's
+    columns are not, so call update(range) on the parent CompositeShape
+    after those.
+    """
+
+    __slots__ = ("store", "columns", "start", "stop", "_views", "_live")
+
+    def __init__(self, store: ShapeStore, columns: ShapeColumns, start: int, stop: int):
+        super().__init__(store.renderer)
+        self.store = store
+        self.columns = columns
+        self.start = start
+        self.stop = stop
+        # Views with changes not yet reported, by record index
+        self._views: Dict[int, Shape] = {}
+        # Every view still referenced, so two lookups of a record share its dirty state
+        self._live: MutableMapping[int, Shape] = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, i: int) -> Shape:
+        if not -len(self) <= i < len(self):
+            raise IndexError("ShapeRange index out of range.")
+        index = self.start + i % len(self)
+        view = self._live.get(index)
+        if view is None:
+            view = _VIEWS[self.columns.kind](self.columns, index, self.renderer)
+            view.parent = self
+            self._live[index] = view
+        return view
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._views)
+
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        self._draw(None if viewport is None else [viewport])
+
+    def draw_regions(self, regions: List[BoundingBox]) -> None:
+        self._draw(regions)
+
+    def bounding_box(self) -> Optional[BoundingBox]:
+        if self.start == self.stop:
+            return None
+        min_x, min_y, max_x, max_y = self.columns.boxes(self.start, self.stop)
+        return BoundingBox(float(min_x.min()), float(min_y.min()), float(max_x.max()), float(max_y.max()))
+
+    def shapes_at(self, x: float, y: float) -> List[Shape]:
+        hits = np.flatnonzero(self._overlapping([BoundingBox(x, y, x, y)]))
+        views = (self[int(i)] for i in hits)
+        return [view for view in views if view.contains(x, y)]
+
+    def contains(self, x: float, y: float) -> bool:
+        return bool(self.shapes_at(x, y))
+
+    def _draw(self, regions: Optional[List[BoundingBox]]) -> None:
+        columns = self.columns.columns(self.start, self.stop)
+        if regions is not None:
+            columns = columns[:, self._overlapping(regions)]
+        count = columns.shape[1]
+        if not count:
+            return
+        kind = self.columns.kind
+        print(f"[ShapeRange] Requesting draw_{kind}s for {count} {kind}(s)")
+        getattr(self.renderer, f"draw_{kind}s")(*columns.tolist())
+
+    def _overlapping(self, regions: List[BoundingBox]) -> np.ndarray:
+        # Mask of the records whose boxes intersect any of the regions
+        min_x, min_y, max_x, max_y = self.columns.boxes(self.start, self.stop)
+        mask = np.zeros(len(self), dtype=bool)
+        for region in regions:
+            mask |= ((min_x <= region.max_x) & (region.min_x <= max_x)
+                     & (min_y <= region.max_y) & (region.min_y <= max_y))
+        return mask
+
+    def _child_changed(self, view: Shape) -> None:
+        self._views[view.index] = view
+        if self.parent is not None:
+            self.parent._child_changed(self)
+
+    def _take_regions(self, regions: List[BoundingBox]) -> None:
+        for view in self._views.values():
+            view._take_regions(regions)
+        self._views.clear()
+
+
+def _field(position: int) -> property:
+    # A property reading and writing one field of a view's record
+    def get(self) -> float:
+        return float(self.columns._data[position, self.index])
+
+    def set(self, value: float) -> None:
+        self.columns._data[position, self.index] = value
+
+    return property(get, set)
+
+
+class StoredCircle(Circle):
+    """
+    A Circle whose geometry lives in a ShapeStore.
+    """
+
+    __slots__ = ("columns", "index", "__weakref__")
+    x, y, radius = _field(0), _field(1), _field(2)
+
+    def __init__(self, columns: ShapeColumns, index: int, renderer: Optional[Renderer] = None):
+        Shape.__init__(self, renderer)
+        self.columns = columns
+        self.index = index
+
+
+class StoredRectangle(Rectangle):
+    """
+    A Rectangle whose geometry lives in a ShapeStore.
+    """
+
+    __slots__ = ("columns", "index", "__weakref__")
+    x, y, width, height = _field(0), _field(1), _field(2), _field(3)
+
+    def __init__(self, columns: ShapeColumns, index: int, renderer: Optional[Renderer] = None):
+        Shape.__init__(self, renderer)
+        self.columns = columns
+        self.index = index
+
+
+class StoredTriangle(Triangle):
+    """
+    A Triangle whose geometry lives in a ShapeStore.
+    """
+
+    __slots__ = ("columns", "index", "__weakref__")
+    x1, y1, x2, y2, x3, y3 = _field(0), _field(1), _field(2), _field(3), _field(4), _field(5)
+
+    def __init__(self, columns: ShapeColumns, index: int, renderer: Optional[Renderer] = None):
+        Shape.__init__(self, renderer)
+        self.columns = columns
+        self.index = index
+
+
+_VIEWS = {"circle": StoredCircle, "rectangle": StoredRectangle, "triangle": StoredTriangle}
@@ -1,6 +1,11 @@
+from typing import Optional
+from shapes.bounds import BoundingBox
 from shapes.shape import Shape
 
 class Triangle(Shape):
+    __slots__ = ("x1", "y1", "x2", "y2", "x3", "y3")
+    GEOMETRY = frozenset({"x1", "y1", "x2", "y2", "x3", "y3"})
+
     def __init__(self, renderer, x1: float, y1: float,
                               x2: float, y2: float,
                               x3: float, y3: float):
@@ -9,9 +14,22 @@ class Triangle(Shape):
         self.x2, self.y2 = x2, y2
         self.x3, self.y3 = x3, y3
 
-    def draw(self) -> None:
+    def draw(self, viewport: Optional[BoundingBox] = None) -> None:
+        if self._outside(viewport):
+            return
         print(f"[Triangle] Requesting draw_triangle at points "
               f"({self.x1},{self.y1}), ({self.x2},{self.y2}), ({self.x3},{self.y3})")
         # **Assume** we want a new method on Renderer: draw_triangle(...)
         self.renderer.draw_triangle(self.x1, self.y1, self.x2, self.y2, self.x3, self.y3)
+
+    def bounding_box(self) -> BoundingBox:
+        return BoundingBox(min(self.x1, self.x2, self.x3), min(self.y1, self.y2, self.y3),
+                           max(self.x1, self.x2, self.x3), max(self.y1, self.y2, self.y3))
+
+    def contains(self, x: float, y: float) -> bool:
+        # Inside when the point is on the same side of all three edges
+        d1 = (self.x2 - self.x1) * (y - self.y1) - (self.y2 - self.y1) * (x - self.x1)
+        d2 = (self.x3 - self.x2) * (y - self.y2) - (self.y3 - self.y2) * (x - self.x2)
+        d3 = (self.x1 - self.x3) * (y - self.y3) - (self.y1 - self.y3) * (x - self.x3)
+        return (d1 >= 0 and d2 >= 0 and d3 >= 0) or (d1 <= 0 and d2 <= 0 and d3 <= 0)
         
\ No newline at end of file
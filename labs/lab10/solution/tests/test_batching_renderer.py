@@ -0,0 +1,129 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+from renderers.batching_renderer import BatchingRenderer
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.opengl_renderer import OpenGLRenderer
+from renderers.renderer import Renderer
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.calls = []
+
+    def draw_circle(self, x, y, radius):
+        self.calls.append(("circle", x, y, radius))
+
+    def draw_rectangle(self, x, y, width, height):
+        self.calls.append(("rectangle", x, y, width, height))
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        self.calls.append(("triangle", x1, y1, x2, y2, x3, y3))
+
+
+def make_scene(renderer) -> CompositeShape:
+    scene = CompositeShape()
+    group = CompositeShape()
+    for i in range(5):
+        scene.add(Circle(renderer, i, 2 * i, 1 + i))
+        group.add(Rectangle(renderer, i, i, 3, 4))
+        group.add(Triangle(renderer, i, 0, i + 5, 5, i, 10))
+    scene.add(group)
+    return scene
+
+
+class TestBatchingRenderer(unittest.TestCase):
+    def setUp(self):
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_flush_replays_every_call_grouped_by_kind(self):
+        direct = RecordingRenderer()
+        make_scene(direct).draw()
+        target = RecordingRenderer()
+        with BatchingRenderer(target) as batching:
+            make_scene(batching).draw()
+            self.assertEqual(target.calls, [])
+            self.assertEqual(batching.pending, 15)
+        self.assertEqual(sorted(target.calls), sorted(direct.calls))
+        self.assertEqual([call[0] for call in target.calls], ["circle"] * 5 + ["rectangle"] * 5 + ["triangle"] * 5)
+
+    def test_bulk_calls_are_forwarded_once_per_kind(self):
+        class CountingRenderer(RecordingRenderer):
+            def draw_circles(self, xs, ys, radii):
+                self.calls.append(("circles", list(xs), list(ys), list(radii)))
+
+        target = CountingRenderer()
+        batching = BatchingRenderer(target)
+        for i in range(100):
+            batching.draw_circle(i, i, 1)
+        batching.draw_circles([1.5], [2.5], [3.5])
+        batching.flush()
+        self.assertEqual(len(target.calls), 1)
+        self.assertEqual(target.calls[0][1][-1], 1.5)
+        self.assertEqual(len(target.calls[0][3]), 101)
+        batching.flush()
+        self.assertEqual(len(target.calls), 1)
+
+    def test_batch_size_flushes_automatically(self):
+        target = RecordingRenderer()
+        batching = BatchingRenderer(target, batch_size=4)
+        for i in range(10):
+            batching.draw_rectangle(i, i, 1, 1)
+        self.assertEqual(len(target.calls), 8)
+        self.assertEqual(batching.pending, 2)
+
+    def test_opengl_draws_one_batch_per_primitive_kind(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            with BatchingRenderer(OpenGLRenderer()) as batching:
+                for i in range(1_000):
+                    batching.draw_circle(i, i, 1)
+                    batching.draw_triangle(0, 0, i, 0, 0, i)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("1000 circles", lines[0])
+
+    def test_bulk_columns_must_have_the_same_length(self):
+        target = RecordingRenderer()
+        with self.assertRaises(ValueError):
+            target.draw_circles([1.0, 2.0], [1.0, 2.0], [1.0])
+        self.assertEqual(target.calls, [])
+        batching = BatchingRenderer(target)
+        with self.assertRaises(ValueError):
+            batching.draw_triangles([0.0], [0.0], [1.0], [0.0], [0.0], [])
+        self.assertEqual(batching.pending, 0)
+        batching.draw_rectangles([1.0], [2.0], [3.0], [4.0])
+        batching.flush()
+        self.assertEqual(target.calls, [("rectangle", 1.0, 2.0, 3.0, 4.0)])
+
+    def test_opengl_bulk_columns_must_have_the_same_length(self):
+        opengl = OpenGLRenderer()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for draw, columns in ((opengl.draw_circles, ([1.0, 2.0], [1.0, 2.0], [1.0])),
+                                  (opengl.draw_rectangles, ([1.0], [2.0], [3.0, 4.0], [4.0])),
+                                  (opengl.draw_triangles, ([0.0], [0.0], [1.0], [0.0], [0.0], []))):
+                with self.assertRaises(ValueError):
+                    draw(*columns)
+        self.assertEqual(out.getvalue(), "")
+
+    def test_same_pixels_as_direct_rendering(self):
+        direct = FramebufferRenderer(30, 30)
+        make_scene(direct).draw()
+        batched = FramebufferRenderer(30, 30)
+        with BatchingRenderer(batched) as batching:
+            make_scene(batching).draw()
+        np.testing.assert_array_equal(batched.framebuffer, direct.framebuffer)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import unittest
+from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.shape import Shape
+from shapes.triangle import Triangle
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.calls = []
+
+    def draw_circle(self, x, y, radius):
+        self.calls.append(("circle", x, y))
+
+    def draw_rectangle(self, x, y, width, height):
+        self.calls.append(("rectangle", x, y))
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        self.calls.append(("triangle", x1, y1))
+
+
+class TestCompositeShapeIndex(unittest.TestCase):
+    def setUp(self):
+        self.renderer = RecordingRenderer()
+        self.scene = CompositeShape()
+        self.left = CompositeShape()
+        self.right = CompositeShape()
+        for i in range(10):
+            self.left.add(Circle(self.renderer, 10 * i, 10, 2))
+            self.right.add(Rectangle(self.renderer, 1_000 + 10 * i, 10, 4, 4))
+        self.scene.add(self.left)
+        self.scene.add(self.right)
+        self.triangle = Triangle(self.renderer, 0, 0, 100, 0, 0, 100)
+        self.scene.add(self.triangle)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_bounding_boxes(self):
+        self.assertEqual(Circle(None, 5, 5, 2).bounding_box(), BoundingBox(3, 3, 7, 7))
+        self.assertEqual(self.triangle.bounding_box(), BoundingBox(0, 0, 100, 100))
+        self.assertEqual(self.scene.bounding_box(), BoundingBox(-2, 0, 1_094, 100))
+        self.assertIsNone(CompositeShape().bounding_box())
+
+    def test_draw_without_viewport_draws_everything_in_order(self):
+        self.scene.draw()
+        self.assertEqual(len(self.renderer.calls), 21)
+        self.assertEqual(self.renderer.calls[-1], ("triangle", 0, 0))
+
+    def test_viewport_culls_off_screen_shapes(self):
+        self.scene.draw(BoundingBox(1_000, 0, 1_015, 20))
+        self.assertEqual(self.renderer.calls, [("rectangle", 1_000, 10), ("rectangle", 1_010, 10)])
+
+    def test_viewport_keeps_draw_order(self):
+        self.scene.draw(BoundingBox(0, 0, 25, 25))
+        self.assertEqual(self.renderer.calls, [("circle", 0, 10), ("circle", 10, 10), ("circle", 20, 10),
+                                               ("triangle", 0, 0)])
+
+    def test_shapes_at(self):
+        hits = self.scene.shapes_at(10, 11)
+        self.assertEqual(len(hits), 2)
+        self.assertIsInstance(hits[0], Circle)
+        self.assertIs(hits[1], self.triangle)
+        self.assertEqual(self.scene.shapes_at(95, 95), [])
+        self.assertEqual(len(self.scene.shapes_at(1_002, 12)), 1)
+
+    def test_remove_and_update(self):
+        self.scene.remove(self.triangle)
+        with self.assertRaises(ValueError):
+            self.scene.remove(self.triangle)
+        self.assertEqual(self.scene.shapes_at(50, 50), [])
+
+        moved = self.left.children[0]
+        moved.x, moved.y = 500, 500
+        self.left.update(moved)
+        self.scene.update(self.left)
+        self.assertEqual(self.scene.shapes_at(500, 500), [moved])
+        self.assertEqual(self.scene.bounding_box().max_y, 502)
+
+    def test_empty_composites_are_never_culled(self):
+        self.scene.add(CompositeShape())
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.scene.draw(BoundingBox(5_000, 5_000, 5_001, 5_001))
+        self.assertEqual(out.getvalue().splitlines(),
+                         ["[CompositeShape] Drawing 1 of 4 child(ren) in the viewport.",
+                          "[CompositeShape] Drawing 0 of 0 child(ren) in the viewport."])
+
+    def test_adding_twice_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.scene.add(self.triangle)
+
+    def test_shapes_must_define_bounds_and_hit_testing(self):
+        class Point(Shape):
+            __slots__ = ()
+
+            def draw(self, viewport=None):
+                if not self._outside(viewport):
+                    self.renderer.draw_circle(0, 0, 0)
+
+        with self.assertRaises(TypeError):
+            Point(self.renderer)
+
+        class Nothing(Point):
+            __slots__ = ()
+
+            def bounding_box(self):
+                return None
+
+            def contains(self, x, y):
+                return False
+
+        # A shape that covers nothing is culled by any viewport, and drawn without one
+        nothing = Nothing(self.renderer)
+        nothing.draw(BoundingBox(0, 0, 10, 10))
+        self.assertEqual(self.renderer.calls, [])
+        nothing.draw()
+        self.assertEqual(self.renderer.calls, [("circle", 0, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
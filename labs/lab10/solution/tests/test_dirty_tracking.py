@@ -0,0 +1,77 @@
+import unittest
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+class TestDirtyTracking(unittest.TestCase):
+    def setUp(self):
+        self.circle = Circle(None, 10, 10, 2)
+        self.rectangle = Rectangle(None, 100, 100, 4, 4)
+        self.triangle = Triangle(None, 0, 0, 4, 0, 0, 4)
+        self.inner = CompositeShape()
+        self.inner.add(self.circle)
+        self.inner.add(self.rectangle)
+        self.scene = CompositeShape()
+        self.scene.add(self.inner)
+        self.scene.add(self.triangle)
+        self.scene.take_dirty_regions()
+
+    def test_new_shapes_are_reported_once(self):
+        scene = CompositeShape()
+        scene.add(Circle(None, 0, 0, 1))
+        self.assertTrue(scene.dirty)
+        self.assertEqual(scene.take_dirty_regions(), [BoundingBox(-1, -1, 1, 1)])
+        self.assertFalse(scene.dirty)
+        self.assertEqual(scene.take_dirty_regions(), [])
+
+    def test_unparented_shapes_are_not_tracked(self):
+        circle = Circle(None, 0, 0, 1)
+        circle.x = 5
+        self.assertFalse(circle.dirty)
+
+    def test_moves_report_old_and_new_boxes(self):
+        self.circle.x = 20
+        self.circle.radius = 3
+        self.assertTrue(self.circle.dirty and self.inner.dirty and self.scene.dirty)
+        self.assertFalse(self.rectangle.dirty)
+        self.assertEqual(self.scene.take_dirty_regions(),
+                         [BoundingBox(8, 8, 12, 12), BoundingBox(17, 7, 23, 13)])
+        self.assertFalse(self.circle.dirty or self.inner.dirty or self.scene.dirty)
+
+    def test_other_attributes_do_not_mark_dirty(self):
+        self.circle.renderer = object()
+        self.assertFalse(self.scene.dirty)
+
+    def test_boxes_and_index_follow_moves(self):
+        self.assertEqual(self.scene.bounding_box(), BoundingBox(0, 0, 104, 104))
+        self.rectangle.width = 50
+        self.triangle.y3 = -10
+        self.assertEqual(self.inner.bounding_box(), BoundingBox(8, 8, 150, 104))
+        self.assertEqual(self.scene.bounding_box(), BoundingBox(0, -10, 150, 104))
+        self.circle.x, self.circle.y = 500, 500
+        self.assertEqual(self.scene.shapes_at(500, 500), [self.circle])
+        self.assertEqual(self.scene.shapes_at(10, 10), [])
+
+    def test_removed_shapes_leave_a_region(self):
+        self.circle.x = 30
+        self.inner.remove(self.circle)
+        self.assertIsNone(self.circle.parent)
+        self.assertFalse(self.circle.dirty)
+        regions = self.scene.take_dirty_regions()
+        self.assertIn(BoundingBox(8, 8, 12, 12), regions)
+        self.assertIn(BoundingBox(28, 8, 32, 12), regions)
+        self.circle.x = 40
+        self.assertFalse(self.scene.dirty)
+
+    def test_shape_belongs_to_one_composite(self):
+        with self.assertRaises(ValueError):
+            CompositeShape().add(self.circle)
+        self.inner.remove(self.circle)
+        CompositeShape().add(self.circle)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+import zlib
+import numpy as np
+from renderers.framebuffer_renderer import FramebufferRenderer
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+class TestFramebufferRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = FramebufferRenderer(40, 30, color=(255, 0, 0))
+
+    def filled(self) -> np.ndarray:
+        return (self.renderer.framebuffer != 255).any(axis=2)
+
+    def test_rectangle_fills_exactly_its_pixels(self):
+        self.renderer.draw_rectangle(2, 3, 10, 4)
+        filled = self.filled()
+        self.assertEqual(filled.sum(), 40)
+        self.assertTrue(filled[3:7, 2:12].all())
+        self.assertEqual(tuple(self.renderer.framebuffer[3, 2]), (255, 0, 0))
+
+    def test_circle_area_and_symmetry(self):
+        self.renderer.draw_circle(20, 15, 10)
+        filled = self.filled()
+        self.assertAlmostEqual(filled.sum(), np.pi * 100, delta=10)
+        self.assertTrue(filled[15, 20])
+        self.assertFalse(filled[5, 10])
+        np.testing.assert_array_equal(filled[:, :20], filled[:, 20:40][:, ::-1])
+
+    def test_triangle_either_winding(self):
+        self.renderer.draw_triangle(0, 0, 20, 0, 0, 20)
+        clockwise = self.filled().copy()
+        self.renderer.clear()
+        self.renderer.draw_triangle(0, 0, 0, 20, 20, 0)
+        np.testing.assert_array_equal(self.filled(), clockwise)
+        self.assertAlmostEqual(clockwise.sum(), 200, delta=21)
+
+    def test_shapes_are_clipped_to_the_framebuffer(self):
+        self.renderer.draw_circle(-100, -100, 5)
+        self.renderer.draw_rectangle(35, 25, 100, 100)
+        self.renderer.draw_triangle(-10, -10, 100, 0, 0, 100)
+        self.assertTrue(self.filled()[29, 39])
+
+    def test_scale(self):
+        renderer = FramebufferRenderer(40, 30, scale=2.0)
+        renderer.draw_rectangle(1, 1, 2, 2)
+        self.assertEqual((renderer.framebuffer[:, :, 0] == 0).sum(), 16)
+
+    def test_renders_a_composite_scene(self):
+        scene = CompositeShape()
+        scene.add(Circle(self.renderer, 10, 10, 5))
+        group = CompositeShape()
+        group.add(Rectangle(self.renderer, 25, 5, 10, 10))
+        group.add(Triangle(self.renderer, 5, 25, 15, 20, 25, 29))
+        scene.add(group)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scene.draw()
+        filled = self.filled()
+        self.assertTrue(filled[10, 10] and filled[10, 30] and filled[25, 15])
+
+    def test_drawing_into_part_of_a_larger_image(self):
+        self.renderer.draw_circle(20, 15, 10)
+        self.renderer.draw_triangle(0, 0, 40, 5, 10, 30)
+        image = np.full((30, 40, 3), 255, dtype=np.uint8)
+        for left, top, right, bottom in ((0, 0, 25, 10), (25, 0, 40, 10), (0, 10, 25, 30), (25, 10, 40, 30)):
+            part = FramebufferRenderer(right - left, bottom - top, color=(255, 0, 0),
+                                       framebuffer=image[top:bottom, left:right], origin=(left, top))
+            part.draw_circle(20, 15, 10)
+            part.draw_triangle(0, 0, 40, 5, 10, 30)
+        np.testing.assert_array_equal(image, self.renderer.framebuffer)
+        with self.assertRaises(ValueError):
+            FramebufferRenderer(5, 5, framebuffer=image)
+
+    def test_bulk_methods_fill_the_same_pixels_as_single_draws(self):
+        rng = random.Random(11)
+        count = 300
+        columns = {
+            "circles": [[rng.uniform(-10, 50) for _ in range(count)] for _ in range(2)]
+                       + [[rng.uniform(0, 8) for _ in range(count)]],
+            "rectangles": [[rng.uniform(-10, 50) for _ in range(count)] for _ in range(2)]
+                          + [[rng.uniform(0, 9) for _ in range(count)] for _ in range(2)],
+            "triangles": [[rng.uniform(-10, 50) for _ in range(count)] for _ in range(6)],
+        }
+        for kind, values in columns.items():
+            for bulk_pixels in (1 << 20, 7):
+                with self.subTest(kind=kind, bulk_pixels=bulk_pixels):
+                    single = FramebufferRenderer(40, 30, scale=0.75, origin=(3, 2))
+                    bulk = FramebufferRenderer(40, 30, scale=0.75, origin=(3, 2))
+                    bulk.BULK_PIXELS = bulk_pixels
+                    draw_one = getattr(single, "draw_" + kind[:-1])
+                    for primitive in zip(*values):
+                        draw_one(*primitive)
+                    getattr(bulk, "draw_" + kind)(*(np.array(column) for column in values))
+                    np.testing.assert_array_equal(bulk.framebuffer, single.framebuffer)
+
+        # Two small rectangles far apart are filled pixel by pixel rather than through a coverage mask
+        self.renderer.draw_rectangles([1.0, 36.0], [1.0, 26.0], [2.0, 2.0], [2.0, 2.0])
+        filled = self.filled()
+        self.assertEqual(filled.sum(), 8)
+        self.assertTrue(filled[1:3, 1:3].all() and filled[26:28, 36:38].all())
+
+    def test_bulk_columns_must_have_the_same_length(self):
+        with self.assertRaises(ValueError):
+            self.renderer.draw_circles([1.0, 2.0], [1.0, 2.0], [1.0])
+        with self.assertRaises(ValueError):
+            self.renderer.draw_rectangles([1.0], [1.0], [1.0], [])
+        self.assertFalse(self.filled().any())
+
+    def test_save_ppm_and_png(self):
+        self.renderer.draw_rectangle(0, 0, 5, 5)
+        with tempfile.TemporaryDirectory() as directory:
+            ppm = os.path.join(directory, "frame.ppm")
+            png = os.path.join(directory, "frame.png")
+            self.renderer.save(ppm)
+            self.renderer.save(png)
+            with open(ppm, "rb") as f:
+                self.assertEqual(f.read(), b"P6\n40 30\n255\n" + self.renderer.framebuffer.tobytes())
+            with open(png, "rb") as f:
+                data = f.read()
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        idat = data.index(b"IDAT")
+        length = int.from_bytes(data[idat - 4:idat], "big")
+        rows = np.frombuffer(zlib.decompress(data[idat + 4:idat + 4 + length]), dtype=np.uint8)
+        pixels = rows.reshape(30, 121)[:, 1:].reshape(30, 40, 3)
+        np.testing.assert_array_equal(pixels, self.renderer.framebuffer)
+
+
+class TestIncrementalRedraw(unittest.TestCase):
+    def setUp(self):
+        self.renderer = FramebufferRenderer(200, 150, scale=2.0, color=(0, 0, 255))
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+        rng = random.Random(7)
+        self.scene = CompositeShape()
+        self.shapes = []
+        for _ in range(4):
+            group = CompositeShape()
+            for _ in range(30):
+                x, y = rng.uniform(0, 100), rng.uniform(0, 75)
+                shape = rng.choice([Circle(self.renderer, x, y, rng.uniform(1, 6)),
+                                    Rectangle(self.renderer, x, y, rng.uniform(1, 10), rng.uniform(1, 10)),
+                                    Triangle(self.renderer, x, y, x + 8, y + 2, x + 3, y + 7)])
+                group.add(shape)
+                self.shapes.append(shape)
+            self.scene.add(group)
+        self.renderer.render(self.scene)
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def assert_matches_full_render(self):
+        expected = FramebufferRenderer(200, 150, scale=2.0, color=(0, 0, 255))
+        for shape in self.shapes:
+            shape.renderer = expected
+        expected.render(self.scene)
+        for shape in self.shapes:
+            shape.renderer = self.renderer
+        np.testing.assert_array_equal(self.renderer.framebuffer, expected.framebuffer)
+
+    def test_nothing_to_redraw_after_render(self):
+        self.assertEqual(self.renderer.redraw(self.scene), 0)
+
+    def test_redraw_after_moves_matches_a_full_render(self):
+        rng = random.Random(3)
+        for _ in range(5):
+            for shape in rng.sample(self.shapes, 4):
+                if isinstance(shape, Triangle):
+                    shape.x1 += rng.uniform(-20, 20)
+                else:
+                    shape.x += rng.uniform(-20, 20)
+                    shape.y += rng.uniform(-20, 20)
+            tiles = self.renderer.redraw(self.scene, tile_size=16)
+            self.assertGreater(tiles, 0)
+            self.assertLess(tiles, 10 * 13)
+            self.assert_matches_full_render()
+
+    def test_many_changes_fall_back_to_a_full_redraw(self):
+        for shape in self.shapes[::2]:
+            if isinstance(shape, Triangle):
+                shape.x1 += 5
+            else:
+                shape.x += 5
+        self.assertEqual(self.renderer.redraw(self.scene, tile_size=16), 13 * 10)
+        self.assert_matches_full_render()
+
+    def test_redraw_after_adding_and_removing(self):
+        group = self.scene.children[0]
+        removed = group.children[0]
+        group.remove(removed)
+        self.shapes.remove(removed)
+        added = Rectangle(self.renderer, 60, 40, 5, 5)
+        self.scene.children[1].add(added)
+        self.shapes.append(added)
+        self.renderer.redraw(self.scene)
+        self.assert_matches_full_render()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import contextlib
+import io
+import unittest
+from renderers.legacy_renderer_adapter import LegacyRendererAdapter
+
+
+def printed(function, *args):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        function(*args)
+    return out.getvalue().splitlines()
+
+
+class TestLegacyRendererAdapter(unittest.TestCase):
+    def setUp(self):
+        self.adapter = LegacyRendererAdapter(strip_height=1.0, max_strips=32)
+
+    def test_tessellation_covers_the_triangle(self):
+        xs, ys, widths, heights = self.adapter.tessellate([0], [0], [10], [4], [2], [10])
+        self.assertEqual(len(xs), 10)
+        self.assertEqual(ys[0], 0)
+        self.assertAlmostEqual(ys[-1] + heights[-1], 10)
+        self.assertAlmostEqual(sum(w * h for w, h in zip(widths, heights)), (10 * 10 - 4 * 2) / 2)
+        self.assertTrue(all(0 <= x <= 10 and x + w <= 10 + 1e-9 for x, w in zip(xs, widths)))
+
+    def test_strips_are_capped_and_flat_triangles_get_one(self):
+        xs, _, _, heights = self.adapter.tessellate([0, 0], [0, 5], [1, 10], [1000, 5], [2, 4], [0, 5])
+        self.assertEqual(len(xs), 33)
+        self.assertAlmostEqual(heights[0], 1000 / 32)
+        self.assertEqual(heights[-1], 0)
+
+    def test_draw_triangle_uses_legacy_rectangles(self):
+        lines = printed(self.adapter.draw_triangle, 0, 0, 4, 0, 0, 2)
+        self.assertEqual(lines[0], "[LegacyRendererAdapter] Adapting draw_triangle → 2 legacy rectangle strip(s)")
+        self.assertEqual(lines[1:], ["[LegacyRectangle] Drawing legacy rectangle at (0.0, 0.0) w=3.0, h=1.0",
+                                     "[LegacyRectangle] Drawing legacy rectangle at (0.0, 1.0) w=1.0, h=1.0"])
+
+    def test_batches_make_the_same_legacy_calls(self):
+        single = printed(lambda: [self.adapter.draw_circle(x, 1, 2) for x in range(3)])
+        bulk = printed(self.adapter.draw_circles, [0, 1, 2], [1, 1, 1], [2, 2, 2])
+        self.assertEqual(len(bulk), 4)
+        self.assertEqual(bulk[1:], single[1::2])
+
+        single = printed(lambda: [self.adapter.draw_rectangle(x, 1, 2, 3) for x in range(3)])
+        bulk = printed(self.adapter.draw_rectangles, [0, 1, 2], [1, 1, 1], [2, 2, 2], [3, 3, 3])
+        self.assertEqual(bulk[1:], single[1::2])
+
+        single = printed(lambda: [self.adapter.draw_triangle(x, 0, x + 4, 0, x, 2) for x in range(2)])
+        bulk = printed(self.adapter.draw_triangles, [0, 1], [0, 0], [4, 5], [0, 0], [0, 1], [2, 2])
+        self.assertEqual(bulk[0], "[LegacyRendererAdapter] Adapting 2 draw_triangle calls → 4 legacy rectangle strips")
+        self.assertEqual(bulk[1:], single[1:3] + single[4:6])
+
+    def test_bulk_columns_must_have_the_same_length(self):
+        calls = [(self.adapter.draw_circles, [0, 1], [1, 1], [2]),
+                 (self.adapter.draw_rectangles, [0, 1], [1, 1], [2, 2], [3]),
+                 (self.adapter.draw_triangles, [0, 1], [0, 0], [4, 5], [0, 0], [0, 1], [2])]
+        for draw, *columns in calls:
+            with self.subTest(method=draw.__name__):
+                with self.assertRaises(ValueError):
+                    printed(draw, *columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
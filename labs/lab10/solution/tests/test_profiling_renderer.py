@@ -0,0 +1,190 @@
+import contextlib
+import io
+import threading
+import unittest
+from renderers.profiling_renderer import ProfilingRenderer
+from renderers.renderer import Renderer
+from renderers.tracing import active_tracers
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.calls = []
+
+    def draw_circle(self, x, y, radius):
+        self.calls.append(("circle", x, y, radius))
+
+    def draw_rectangle(self, x, y, width, height):
+        self.calls.append(("rectangle", x, y, width, height))
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        self.calls.append(("triangle", x1, y1, x2, y2, x3, y3))
+
+
+def make_scene(renderer) -> CompositeShape:
+    scene = CompositeShape("scene")
+    trees = CompositeShape("trees")
+    houses = CompositeShape("houses;roofs")
+    for i in range(3):
+        scene.add(Circle(renderer, 10 * i, 0, 1))
+        trees.add(Triangle(renderer, 10 * i, 10, 10 * i + 2, 14, 10 * i + 4, 10))
+        houses.add(Rectangle(renderer, 10 * i, 20, 4, 3))
+    trees.add(houses)
+    scene.add(trees)
+    return scene
+
+
+def stacks(profiler: ProfilingRenderer) -> dict:
+    return {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in profiler.collapsed_stacks()}
+
+
+class TestProfilingRenderer(unittest.TestCase):
+    def setUp(self):
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_calls_are_forwarded_and_counted(self):
+        direct = RecordingRenderer()
+        make_scene(direct).draw()
+        target = RecordingRenderer()
+        profiler = ProfilingRenderer(target)
+        make_scene(profiler).draw()
+        profiler.draw_circles([1, 2], [3, 4], [5, 6])
+        self.assertEqual(target.calls, direct.calls + [("circle", 1, 3, 5), ("circle", 2, 4, 6)])
+        self.assertEqual(profiler.calls, {"draw_circle": 3, "draw_circles": 1, "draw_rectangle": 3, "draw_triangle": 3})
+        self.assertEqual(profiler.primitives, {"circle": 5, "rectangle": 3, "triangle": 3})
+        self.assertIn("draw_triangle", profiler.report())
+
+    def test_bulk_columns_must_have_the_same_length(self):
+        class UncheckedRenderer(RecordingRenderer):
+            # Bulk methods that trust their columns, as a fast renderer might
+            def draw_circles(self, xs, ys, radii):
+                self.calls.append(("circles", len(xs)))
+
+            def draw_rectangles(self, xs, ys, widths, heights):
+                self.calls.append(("rectangles", len(xs)))
+
+            def draw_triangles(self, x1s, y1s, x2s, y2s, x3s, y3s):
+                self.calls.append(("triangles", len(x1s)))
+
+        target = UncheckedRenderer()
+        profiler = ProfilingRenderer(target)
+        with self.assertRaises(ValueError):
+            profiler.draw_circles([1, 2], [3, 4], [5])
+        with self.assertRaises(ValueError):
+            profiler.draw_rectangles([1], [2], [3], [])
+        with self.assertRaises(ValueError):
+            profiler.draw_triangles([0], [0], [1], [0], [0, 1], [1])
+        self.assertEqual((target.calls, profiler.calls), ([], {}))
+
+    def test_time_is_attributed_to_composite_stacks(self):
+        profiler = ProfilingRenderer(RecordingRenderer())
+        scene = make_scene(profiler)
+        with profiler.trace():
+            scene.draw()
+        self.assertEqual(active_tracers.get(), ())
+        profile = stacks(profiler)
+        self.assertEqual(set(profile), {
+            "RecordingRenderer;scene",
+            "RecordingRenderer;scene;draw_circle",
+            "RecordingRenderer;scene;trees",
+            "RecordingRenderer;scene;trees;draw_triangle",
+            "RecordingRenderer;scene;trees;houses_roofs",
+            "RecordingRenderer;scene;trees;houses_roofs;draw_rectangle",
+        })
+        draw_time = sum(time for stack, time in profile.items() if stack.endswith(("_circle", "_triangle", "_rectangle")))
+        self.assertEqual(draw_time, sum(profiler.nanoseconds.values()))
+
+    def test_regions_and_viewport_draws_are_traced(self):
+        profiler = ProfilingRenderer(RecordingRenderer())
+        scene = make_scene(profiler)
+        with profiler.trace():
+            scene.draw(BoundingBox(0, 19, 5, 25))
+            scene.draw_regions([BoundingBox(0, 19, 5, 25)])
+        self.assertEqual(profiler.calls, {"draw_rectangle": 2})
+        self.assertIn("RecordingRenderer;scene;trees;houses_roofs;draw_rectangle", stacks(profiler))
+
+    def test_untraced_and_unnamed_draws(self):
+        profiler = ProfilingRenderer(RecordingRenderer())
+        group = CompositeShape()
+        group.add(Circle(profiler, 0, 0, 1))
+        group.draw()
+        profiler.draw_rectangle(0, 0, 1, 1)
+        self.assertEqual(set(stacks(profiler)), {"RecordingRenderer;draw_circle", "RecordingRenderer;draw_rectangle"})
+        profiler.reset()
+        with profiler.trace():
+            group.draw()
+        self.assertEqual(set(stacks(profiler)), {"RecordingRenderer;CompositeShape",
+                                                 "RecordingRenderer;CompositeShape;draw_circle"})
+
+    def test_only_composites_that_reach_the_profiler_are_charged(self):
+        first = ProfilingRenderer(RecordingRenderer())
+        second = ProfilingRenderer(RecordingRenderer())
+        scene = CompositeShape("scene")
+        for name, profiler in (("first", first), ("second", second)):
+            group = CompositeShape(name)
+            group.add(Circle(profiler, 0, 0, 1))
+            scene.add(group)
+        with first.trace(), second.trace():
+            scene.draw()
+            scene.draw(BoundingBox(50, 50, 60, 60))
+        self.assertEqual(set(stacks(first)), {"RecordingRenderer;scene", "RecordingRenderer;scene;first",
+                                              "RecordingRenderer;scene;first;draw_circle"})
+        self.assertEqual(set(stacks(second)), {"RecordingRenderer;scene", "RecordingRenderer;scene;second",
+                                               "RecordingRenderer;scene;second;draw_circle"})
+
+    def test_tracing_is_limited_to_the_tracing_thread(self):
+        profiler = ProfilingRenderer(RecordingRenderer())
+        scene = make_scene(profiler)
+        with profiler.trace():
+            worker = threading.Thread(target=scene.draw)
+            worker.start()
+            worker.join()
+        self.assertEqual(set(stacks(profiler)), {"RecordingRenderer;draw_circle", "RecordingRenderer;draw_triangle",
+                                                 "RecordingRenderer;draw_rectangle"})
+
+    def test_other_threads_do_not_draw_into_the_tracing_thread_stack(self):
+        inside, release = threading.Event(), threading.Event()
+
+        class BlockingRenderer(RecordingRenderer):
+            def draw_circle(self, x, y, radius):
+                inside.set()
+                release.wait(5)
+
+        profiler = ProfilingRenderer(BlockingRenderer())
+        scene = CompositeShape("scene")
+        scene.add(Circle(profiler, 0, 0, 1))
+
+        def traced():
+            with profiler.trace():
+                scene.draw()
+
+        worker = threading.Thread(target=traced)
+        worker.start()
+        self.assertTrue(inside.wait(5))
+        # The worker is inside "scene" now; this draw is not part of it
+        profiler.draw_rectangle(0, 0, 1, 1)
+        release.set()
+        worker.join()
+        self.assertEqual(set(stacks(profiler)), {"BlockingRenderer;scene", "BlockingRenderer;scene;draw_circle",
+                                                 "BlockingRenderer;draw_rectangle"})
+
+    def test_write_collapsed(self):
+        profiler = ProfilingRenderer(RecordingRenderer())
+        with profiler.trace():
+            make_scene(profiler).draw()
+        out = io.StringIO()
+        profiler.write_collapsed(out)
+        self.assertEqual(out.getvalue().splitlines(), profiler.collapsed_stacks())
+
+
+if __name__ == "__main__":
+    unittest.main()
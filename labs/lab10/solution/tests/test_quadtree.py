@@ -0,0 +1,54 @@
+import random
+import unittest
+from shapes.bounds import BoundingBox
+from shapes.quadtree import QuadTree
+
+
+def random_box(rng: random.Random, world: float = 1_000.0) -> BoundingBox:
+    x, y = rng.uniform(-world, world), rng.uniform(-world, world)
+    return BoundingBox(x, y, x + rng.uniform(0, 50), y + rng.uniform(0, 50))
+
+
+class TestQuadTree(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(8)
+        self.tree = QuadTree(max_items=4)
+        self.boxes = {i: random_box(self.rng) for i in range(2_000)}
+        for item, box in self.boxes.items():
+            self.tree.insert(item, box)
+
+    def brute_force(self, area: BoundingBox) -> set:
+        return {item for item, box in self.boxes.items() if box.intersects(area)}
+
+    def test_query_matches_brute_force(self):
+        for _ in range(200):
+            area = random_box(self.rng)
+            self.assertEqual(set(self.tree.query(area)), self.brute_force(area))
+
+    def test_point_query(self):
+        for _ in range(200):
+            x, y = self.rng.uniform(-1_000, 1_000), self.rng.uniform(-1_000, 1_000)
+            expected = {item for item, box in self.boxes.items() if box.contains_point(x, y)}
+            self.assertEqual(set(self.tree.query_point(x, y)), expected)
+
+    def test_remove_and_update(self):
+        for item in range(0, 2_000, 2):
+            self.tree.remove(item)
+            del self.boxes[item]
+        for item in range(1, 2_000, 4):
+            self.boxes[item] = random_box(self.rng, world=5_000.0)
+            self.tree.update(item, self.boxes[item])
+        self.assertEqual(len(self.tree), 1_000)
+        for _ in range(200):
+            area = random_box(self.rng, world=5_000.0)
+            self.assertEqual(set(self.tree.query(area)), self.brute_force(area))
+
+    def test_identical_boxes_do_not_split_forever(self):
+        tree = QuadTree(max_items=2)
+        for item in range(100):
+            tree.insert(item, BoundingBox(1, 1, 1, 1))
+        self.assertEqual(len(tree.query_point(1, 1)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from renderers.legacy_renderer_adapter import LegacyRendererAdapter
+from renderers.opengl_renderer import OpenGLRenderer
+from renderers.raster_renderer import RasterRenderer
+from renderers.renderer import Renderer
+from renderers.vector_renderer import VectorRenderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.scene_file import (LazyGroup, SceneFile, load_json, load_scene, save_json, save_scene,
+                               scene_from_dict, scene_to_dict)
+from shapes.shape_store import ShapeRange, ShapeStore
+from shapes.triangle import Triangle
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.calls = []
+
+    def draw_circle(self, x, y, radius):
+        self.calls.append(("circle", x, y, radius))
+
+    def draw_rectangle(self, x, y, width, height):
+        self.calls.append(("rectangle", x, y, width, height))
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        self.calls.append(("triangle", x1, y1, x2, y2, x3, y3))
+
+
+def make_scene(renderer):
+    scene = CompositeShape()
+    scene.add(Circle(renderer, 1, 2, 3))
+    scene.add(Circle(renderer, 4, 5, 0.5))
+    left = CompositeShape()
+    left.add(Rectangle(renderer, 0, 0, 10, 20))
+    nested = CompositeShape()
+    nested.add(Triangle(renderer, 0, 0, 1, 0, 0, 1))
+    left.add(nested)
+    left.add(Circle(renderer, 7, 7, 1))
+    scene.add(left)
+    right = CompositeShape()
+    store = ShapeStore(renderer)
+    right.add(store.add_circles([1000, 1010], [1000, 1000], [2, 3]))
+    scene.add(right)
+    scene.add(Rectangle(renderer, -5, -5, 1, 1))
+    scene.add(CompositeShape())
+    return scene
+
+
+def make_demo_scene(vector, raster, opengl, legacy):
+    # The mixed-renderer scene main.py draws at the end of its demo; floats, as the file stores them
+    layer1 = CompositeShape()
+    layer1.add(Circle(vector, 1.0, 1.0, 1.0))
+    layer1.add(Rectangle(raster, 2.0, 2.0, 2.0, 1.0))
+    layer2 = CompositeShape()
+    layer2.add(Circle(legacy, 5.0, 5.0, 3.0))
+    layer2.add(Rectangle(opengl, 6.0, 1.0, 1.0, 2.0))
+    layer2.add(Triangle(opengl, 0.0, 0.0, 5.0, 5.0, 10.0, 0.0))
+    layer2.add(Triangle(vector, 2.0, 1.0, 6.0, 7.0, 9.0, 2.0))
+    scene = CompositeShape()
+    scene.add(layer1)
+    scene.add(layer2)
+    return scene
+
+
+def printed_draw(scene) -> list:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        scene.draw()
+    return out.getvalue().splitlines()
+
+
+class TestSceneFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "scene.bin")
+        self.renderer = RecordingRenderer()
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+        self.scene = make_scene(self.renderer)
+        self.scene.draw()
+        self.expected = self.renderer.calls
+        self.renderer.calls = []
+        save_scene(self.scene, self.path)
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        loaded = load_scene(self.path, self.renderer)
+        self.assertEqual([type(child) for child in loaded.children],
+                         [Circle, Circle, CompositeShape, CompositeShape, Rectangle, CompositeShape])
+        loaded.draw()
+        self.assertEqual(self.renderer.calls, self.expected)
+        self.assertEqual(loaded.bounding_box(), self.scene.bounding_box())
+
+    def test_round_trip_into_a_store(self):
+        store = ShapeStore(self.renderer)
+        loaded = load_scene(self.path, self.renderer, store)
+        self.assertIsInstance(loaded.children[0], ShapeRange)
+        self.assertEqual(len(store), 8)
+        loaded.draw()
+        self.assertEqual(self.renderer.calls, self.expected)
+
+    def test_groups_load_lazily(self):
+        with SceneFile(self.path, self.renderer) as scene_file:
+            self.assertEqual(scene_file.group_count, 5)
+            root = scene_file.root
+            self.assertFalse(root.loaded)
+            self.assertEqual(root.bounding_box(), self.scene.bounding_box())
+            scene = CompositeShape()
+            scene.add(root)
+            scene.draw(BoundingBox(-10, -10, -4, -4))
+            self.assertTrue(root.loaded)
+            left, right = [child for child in root.load().children if isinstance(child, LazyGroup)][:2]
+            self.assertFalse(left.loaded or right.loaded)
+            self.assertEqual(self.renderer.calls, [("rectangle", -5, -5, 1, 1)])
+            self.assertEqual(len(scene.shapes_at(1001, 1000)), 1)
+            self.assertTrue(right.loaded)
+            self.assertFalse(left.loaded)
+
+    def test_changes_inside_lazy_groups_are_tracked(self):
+        with SceneFile(self.path, self.renderer) as scene_file:
+            scene = CompositeShape()
+            scene.add(scene_file.root)
+            scene.take_dirty_regions()
+            circle = scene_file.root.load().children[0]
+            circle.x = 100
+            self.assertTrue(scene.dirty)
+            self.assertEqual(scene.take_dirty_regions(), [BoundingBox(-2, -1, 4, 5), BoundingBox(97, -1, 103, 5)])
+            self.assertEqual(scene.bounding_box().max_x, 1013)
+
+    def test_save_over_the_file_being_read_lazily(self):
+        with SceneFile(self.path, self.renderer) as scene_file:
+            root = scene_file.root
+            save_scene(root, self.path)
+            # The old file stays mapped for the groups that were not read yet
+            root.draw()
+        self.assertEqual(self.renderer.calls, self.expected)
+        self.assertEqual(os.listdir(self.directory.name), [os.path.basename(self.path)])
+        self.renderer.calls = []
+        load_scene(self.path, self.renderer).draw()
+        self.assertEqual(self.renderer.calls, self.expected)
+
+    def test_shapes_keep_their_renderers(self):
+        renderers = (VectorRenderer(), RasterRenderer(), OpenGLRenderer(), LegacyRendererAdapter())
+        scene = make_demo_scene(*renderers)
+        expected = printed_draw(scene)
+        table = save_scene(scene, self.path)
+        self.assertEqual([type(renderer) for renderer in table],
+                         [VectorRenderer, RasterRenderer, LegacyRendererAdapter, OpenGLRenderer])
+        self.assertEqual(printed_draw(load_scene(self.path, table)), expected)
+
+        # Loading into a store: other renderers' runs get a store of their own
+        store = ShapeStore(table[0])
+        with SceneFile(self.path, table, store) as scene_file:
+            loaded = scene_file.load_group(0, lazy=False)
+            self.assertEqual(len(store), 2)
+            self.assertEqual({tag: other.renderer for tag, other in scene_file.stores.items()},
+                             {1: table[1], 2: table[2], 3: table[3]})
+            self.assertEqual([child.renderer for layer in loaded.children for child in layer.children],
+                             [table[0], table[1], table[2], table[3], table[3], table[0]])
+
+        json_path = os.path.join(self.directory.name, "scene.json")
+        self.assertEqual(save_json(scene, json_path), table)
+        self.assertEqual(printed_draw(load_json(json_path, table)), expected)
+
+        with self.assertRaises(ValueError):
+            load_scene(self.path, table[:2])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a scene file at all")
+        with self.assertRaises(ValueError):
+            SceneFile(self.path, self.renderer)
+
+    def test_json_round_trip(self):
+        data = scene_to_dict(self.scene)
+        self.assertEqual(data["children"][0], {"type": "circle", "x": 1, "y": 2, "radius": 3})
+        self.assertEqual(len(data["children"][3]["children"]), 2)
+        json_path = os.path.join(self.directory.name, "scene.json")
+        save_json(self.scene, json_path)
+        load_json(json_path, self.renderer).draw()
+        self.assertEqual(self.renderer.calls, self.expected)
+        with self.assertRaises(ValueError):
+            scene_from_dict({"type": "hexagon"}, self.renderer)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.renderer import Renderer
+from shapes.bounds import BoundingBox
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.shape_store import ShapeStore
+from shapes.triangle import Triangle
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.calls = []
+
+    def draw_circle(self, x, y, radius):
+        self.calls.append(("circle", x, y, radius))
+
+    def draw_rectangle(self, x, y, width, height):
+        self.calls.append(("rectangle", x, y, width, height))
+
+    def draw_triangle(self, x1, y1, x2, y2, x3, y3):
+        self.calls.append(("triangle", x1, y1, x2, y2, x3, y3))
+
+    def draw_circles(self, xs, ys, radii):
+        self.calls.append(("circles", len(xs)))
+        super().draw_circles(xs, ys, radii)
+
+
+class TestShapeStore(unittest.TestCase):
+    def setUp(self):
+        self.renderer = RecordingRenderer()
+        self.store = ShapeStore(self.renderer, capacity=2)
+        self.circles = self.store.add_circles([0, 10, 20], [0, 0, 0], [1, 2, 3])
+        self.rectangles = self.store.add_rectangles([100], [100], [5], [10])
+        self.triangles = self.store.add_triangles([0], [50], [10], [50], [0], [60])
+        self.scene = CompositeShape()
+        for block in (self.circles, self.rectangles, self.triangles):
+            self.scene.add(block)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_columns_grow_and_keep_records(self):
+        more = self.store.add_circles(np.arange(100.0), np.zeros(100), np.ones(100))
+        self.assertEqual((more.start, more.stop), (3, 103))
+        self.assertEqual(len(self.store), 105)
+        np.testing.assert_array_equal(self.store.circles["radius"][:3], [1, 2, 3])
+        self.assertEqual(self.circles[2].radius, 3)
+        with self.assertRaises(ValueError):
+            self.store.add_circles([1, 2], [1], [1])
+
+    def test_views_are_shapes_backed_by_the_store(self):
+        circle = self.circles[1]
+        self.assertIsInstance(circle, Circle)
+        self.assertIsInstance(self.rectangles[0], Rectangle)
+        self.assertIsInstance(self.triangles[-1], Triangle)
+        self.assertEqual(circle.bounding_box(), BoundingBox(8, -2, 12, 2))
+        circle.radius = 5
+        self.assertEqual(self.store.circles["radius"][1], 5)
+        self.assertFalse(hasattr(circle, "__dict__"))
+        with self.assertRaises(IndexError):
+            self.circles[3]
+
+    def test_draw_uses_one_bulk_call(self):
+        self.circles.draw()
+        self.assertEqual(self.renderer.calls[0], ("circles", 3))
+        self.assertEqual(self.renderer.calls[1:], [("circle", 0, 0, 1), ("circle", 10, 0, 2), ("circle", 20, 0, 3)])
+
+    def test_ranges_are_culled_and_hit_tested_in_a_composite(self):
+        self.assertEqual(self.scene.bounding_box(), BoundingBox(-1, -3, 105, 110))
+        self.scene.draw(BoundingBox(9, -1, 11, 1))
+        self.assertEqual(self.renderer.calls, [("circles", 1), ("circle", 10, 0, 2)])
+        hits = self.scene.shapes_at(101, 101)
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0].bounding_box(), BoundingBox(100, 100, 105, 110))
+        self.assertEqual(self.scene.shapes_at(1, 51)[0].x3, 0)
+        self.assertEqual(self.scene.shapes_at(50, 50), [])
+
+    def test_changes_through_views_are_tracked(self):
+        self.scene.take_dirty_regions()
+        circle = self.circles[0]
+        circle.x = 500
+        self.assertIs(self.circles[0], circle)
+        self.assertTrue(self.circles.dirty and self.scene.dirty)
+        self.assertEqual(self.scene.take_dirty_regions(), [BoundingBox(-1, -1, 1, 1), BoundingBox(499, -1, 501, 1)])
+        self.assertFalse(self.scene.dirty)
+        self.assertEqual(len(self.scene.shapes_at(500, 0)), 1)
+        self.assertEqual(self.scene.bounding_box().max_x, 501)
+
+    def test_two_lookups_of_a_record_share_one_view(self):
+        self.scene.take_dirty_regions()
+        first, second = self.circles[0], self.circles[0]
+        self.assertIs(first, second)
+        first.x = 50
+        second.x = 80
+        # The region the circle covered before either change is still reported
+        self.assertEqual(self.scene.take_dirty_regions(), [BoundingBox(-1, -1, 1, 1), BoundingBox(79, -1, 81, 1)])
+
+    def test_store_ranges(self):
+        part = self.store.range("circle", 1, 3)
+        self.assertEqual(len(part), 2)
+        self.assertEqual(part[0].x, 10)
+        with self.assertRaises(IndexError):
+            self.store.range("circle", 2, 4)
+        with self.assertRaises(ValueError):
+            self.store.range("hexagon", 0, 1)
+
+    def test_rasterizes_like_ordinary_shapes(self):
+        stored = FramebufferRenderer(120, 120)
+        self.store.renderer = stored
+        scene = CompositeShape()
+        scene.add(self.store.range("circle", 0, 3))
+        scene.add(self.store.range("rectangle", 0, 1))
+        scene.add(self.store.range("triangle", 0, 1))
+        stored.render(scene)
+
+        plain = FramebufferRenderer(120, 120)
+        for shape in (Circle(plain, 0, 0, 1), Circle(plain, 10, 0, 2), Circle(plain, 20, 0, 3),
+                      Rectangle(plain, 100, 100, 5, 10), Triangle(plain, 0, 50, 10, 50, 0, 60)):
+            shape.draw()
+        np.testing.assert_array_equal(stored.framebuffer, plain.framebuffer)
+
+
+if __name__ == "__main__":
+    unittest.main()
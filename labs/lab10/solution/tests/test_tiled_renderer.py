@@ -0,0 +1,67 @@
+import contextlib
+import io
+import random
+import unittest
+import numpy as np
+from renderers.framebuffer_renderer import FramebufferRenderer
+from renderers.tiled_renderer import TiledRenderer
+from shapes.circle import Circle
+from shapes.composite_shape import CompositeShape
+from shapes.rectangle import Rectangle
+from shapes.triangle import Triangle
+
+
+def make_scene(renderer, count=300, seed=5):
+    rng = random.Random(seed)
+    scene = CompositeShape()
+    for _ in range(count):
+        x, y = rng.uniform(-10, 130), rng.uniform(-10, 100)
+        scene.add(rng.choice([Circle(renderer, x, y, rng.uniform(1, 8)),
+                              Rectangle(renderer, x, y, rng.uniform(1, 15), rng.uniform(1, 15)),
+                              Triangle(renderer, x, y, x + rng.uniform(-10, 10), y + 9, x + 7, y - 3)]))
+    return scene
+
+
+class TestTiledRenderer(unittest.TestCase):
+    def setUp(self):
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+        self.expected = FramebufferRenderer(240, 180, scale=2.0, color=(0, 128, 0))
+        self.expected.render(make_scene(self.expected))
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def render(self, workers):
+        with TiledRenderer(240, 180, scale=2.0, color=(0, 128, 0), workers=workers, tile_size=50) as renderer:
+            renderer.render(make_scene(renderer))
+            return renderer.framebuffer.copy()
+
+    def test_matches_a_single_framebuffer_renderer(self):
+        np.testing.assert_array_equal(self.render(1), self.expected.framebuffer)
+
+    def test_matches_with_worker_processes(self):
+        np.testing.assert_array_equal(self.render(2), self.expected.framebuffer)
+
+    def test_records_until_flushed(self):
+        with TiledRenderer(100, 100, workers=1, tile_size=32) as renderer:
+            renderer.draw_circle(10, 10, 5)
+            renderer.draw_rectangles([50, 90], [50, 90], [10, 20], [10, 20])
+            self.assertEqual(renderer.pending, 3)
+            self.assertTrue((renderer.framebuffer == 255).all())
+            # The circle touches one tile, the rectangles four and one (with a tile shared)
+            self.assertEqual(renderer.flush(), 6)
+            self.assertEqual(renderer.pending, 0)
+            self.assertEqual(tuple(renderer.framebuffer[10, 10]), (0, 0, 0))
+            self.assertEqual(tuple(renderer.framebuffer[95, 95]), (0, 0, 0))
+            self.assertEqual(tuple(renderer.framebuffer[45, 45]), (255, 255, 255))
+
+    def test_close_frees_the_framebuffer(self):
+        renderer = TiledRenderer(10, 10)
+        renderer.close()
+        self.assertIsNone(renderer.framebuffer)
+        renderer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
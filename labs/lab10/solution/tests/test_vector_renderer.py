@@ -0,0 +1,76 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from renderers.vector_renderer import VectorRenderer
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+class TestVectorRenderer(unittest.TestCase):
+    def render(self, **options):
+        out = io.StringIO()
+        with VectorRenderer(out, width=100, height=50, **options) as renderer:
+            renderer.draw_circle(10, 10, 2.5)
+            renderer.draw_rectangle(0.5, -0.25, 10, 20.125)
+            renderer.draw_triangle(1, 1, 4, -1, 1, 6)
+            renderer.draw_circle(30, 40.001, 2.5)
+            renderer.draw_circle(50, 50, 2.5)
+            renderer.draw_triangle(11, 11, 14, 9, 11, 16)
+        return renderer, out.getvalue()
+
+    def test_writes_valid_svg_with_compact_numbers(self):
+        _, text = self.render(dedupe=False)
+        root = ElementTree.fromstring(text)
+        self.assertEqual(root.get("viewBox"), "0 0 100 50")
+        circle, rectangle, triangle = root[:3]
+        self.assertEqual(circle.attrib, {"cx": "10", "cy": "10", "r": "2.5"})
+        self.assertEqual(rectangle.attrib, {"x": ".5", "y": "-.25", "width": "10", "height": "20.12"})
+        self.assertEqual(triangle.get("d"), "M1 1l3-2 0 5z")
+        self.assertEqual(root[3].get("cy"), "40")
+        self.assertEqual(len(root), 6)
+
+    def test_full_precision(self):
+        _, text = self.render(dedupe=False, precision=None)
+        self.assertIn('cy="40.001"', text)
+        self.assertIn('height="20.125"', text)
+
+    def test_repeated_geometry_uses_templates(self):
+        renderer, text = self.render()
+        self.assertEqual(renderer.elements, 6)
+        self.assertEqual(renderer.templates, 2)
+        root = ElementTree.fromstring(text)
+        tags = [element.tag.replace(SVG, "") for element in root]
+        self.assertEqual(tags, ["circle", "rect", "path", "defs", "use", "use", "defs", "use"])
+        self.assertEqual(root[3][0].attrib, {"id": "a", "r": "2.5"})
+        self.assertEqual(root[4].attrib, {"href": "#a", "x": "30", "y": "40"})
+        self.assertEqual(root[5].get("href"), "#a")
+        self.assertEqual(root[6][0].attrib, {"id": "b", "d": "M0 0l3-2 0 5z"})
+        self.assertEqual(root[7].attrib, {"href": "#b", "x": "11", "y": "11"})
+
+    def test_template_table_is_bounded(self):
+        _, text = self.render(max_templates=1)
+        self.assertEqual(text.count("<use"), 2)
+
+    def test_streams_to_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scene.svg")
+            renderer = VectorRenderer(path)
+            renderer.draw_rectangle(0, 0, 1, 1)
+            renderer.close()
+            renderer.close()
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        self.assertEqual(text, '<svg xmlns="http://www.w3.org/2000/svg">\n<rect x="0" y="0" width="1" height="1"/>\n</svg>\n')
+
+    def test_prints_without_an_output(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            VectorRenderer().draw_circle(5, 5, 3)
+        self.assertEqual(out.getvalue(), "[VectorRenderer] Drawing CIRCLE (vector) at (5, 5) with radius 3\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
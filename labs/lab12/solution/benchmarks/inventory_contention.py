@@ -0,0 +1,65 @@
+"""
+Stress test for concurrent InventoryService reservations.
+Measures reservations per second at several thread counts and checks
+that the remaining stock matches the successful reservations exactly.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.inventory_contention
+"""
+import threading
+import time
+
+from services.inventory import InventoryService
+from services.events import configure_logging
+
+ORDERS = [("Margherita Pizza", ["Extra Cheese"]),
+          ("Neapolitan Pizza", ["Olives"]),
+          ("Neapolitan Pizza", ["Pepperoni", "Mushrooms"]),
+          ("Margherita Pizza", ["Extra Cheese", "Extra Cheese"])]
+RESERVATIONS_PER_THREAD = 20_000
+
+
+def run(threads: int) -> tuple:
+    stock = {"tomato_sauce": 10_000_000, "mozzarella": 10_000_000, "basil": 10_000_000,
+             "cheese": 10_000_000, "olives": 10_000_000, "pepperoni": 10_000_000,
+             "mushrooms": 10_000_000}
+    inventory = InventoryService(stock=stock)
+    reserved = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        for n in range(RESERVATIONS_PER_THREAD):
+            pizza_type, toppings = ORDERS[(index + n) % len(ORDERS)]
+            if inventory.check_and_reserve(pizza_type, toppings):
+                reserved[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = threads * RESERVATIONS_PER_THREAD
+    expected_tomato = stock["tomato_sauce"] - sum(reserved)
+    consistent = sum(reserved) == total and inventory.get_stock("tomato_sauce") == expected_tomato
+    return total / elapsed, consistent
+
+
+def main():
+    results = []
+    # Service events are switched off so only the timings are measured
+    configure_logging(level=None)
+    for threads in (1, 4, 16):
+        results.append((threads,) + run(threads))
+
+    for threads, rate, consistent in results:
+        print(f"{threads:>3} thread(s)  {rate:>10,.0f} reservations/s  "
+              f"stock consistent: {'yes' if consistent else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Times 100k inventory reservations, one check_and_reserve() call at a time
+and as a single reserve_many() batch.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.inventory_reservations
+"""
+import time
+
+from services.inventory import InventoryService
+from services.events import configure_logging
+
+ORDERS = [("Margherita Pizza", ["Extra Cheese", "Olives"]),
+          ("Neapolitan Pizza", ["Pepperoni", "Mushrooms", "Extra Cheese"]),
+          ("Margherita Pizza", []),
+          ("Neapolitan Pizza", ["Olives"])]
+CALLS = 100_000
+
+
+def make_inventory() -> InventoryService:
+    return InventoryService(stock=dict.fromkeys(["tomato_sauce", "mozzarella", "basil", "cheese",
+                                                 "olives", "pepperoni", "mushrooms"], CALLS))
+
+
+def bench_single_calls(orders: list) -> float:
+    inventory = make_inventory()
+    start = time.perf_counter()
+    for pizza_type, toppings in orders:
+        inventory.check_and_reserve(pizza_type, toppings)
+    return time.perf_counter() - start
+
+
+def bench_reserve_many(orders: list) -> float:
+    inventory = make_inventory()
+    start = time.perf_counter()
+    inventory.reserve_many(orders)
+    return time.perf_counter() - start
+
+
+def main():
+    orders = [ORDERS[n % len(ORDERS)] for n in range(CALLS)]
+    # Service events are switched off so only the timings are measured
+    configure_logging(level=None)
+    single = bench_single_calls(orders)
+    batch = bench_reserve_many(orders)
+
+    print(f"{CALLS:,} reservations")
+    print(f"check_and_reserve loop  {single:>7.3f}s  {CALLS / single:>12,.0f} reservations/s")
+    print(f"reserve_many batch      {batch:>7.3f}s  {CALLS / batch:>12,.0f} reservations/s")
+
+
+if __name__ == "__main__":
+    main()
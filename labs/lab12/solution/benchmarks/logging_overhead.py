@@ -0,0 +1,67 @@
+"""
+Compares OrderFacade throughput with service events written synchronously,
+through the buffered asynchronous sink, and with logging switched off,
+against the print() calls the services used before. That baseline is the
+time with logging off plus the time print() takes to write the same lines.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.logging_overhead [orders]
+"""
+import io
+import logging
+import os
+import sys
+import time
+
+from benchmarks.order_throughput import STOCK, make_orders
+from services.delivery import DeliveryService
+from services.events import configure_logging, flush_logging
+from services.inventory import InventoryService
+from services.loyalty import LoyaltyService
+from services.order_facade import OrderFacade
+
+
+def bench(orders: list, sink, **logging_options) -> float:
+    configure_logging(stream=sink, **logging_options)
+    loyalty = LoyaltyService()
+    facade = OrderFacade(inventory=InventoryService(stock=STOCK), loyalty=loyalty,
+                         delivery=DeliveryService(delay=0))
+    start = time.perf_counter()
+    for order in orders:
+        facade.place_order(*order, "alice@example.com")
+    flush_logging()
+    elapsed = time.perf_counter() - start
+    loyalty.close()
+    return len(orders) / elapsed
+
+
+def bench_print(orders: list, sink) -> float:
+    # The lines the services emit for these orders, then the time print() needs for them
+    captured = io.StringIO()
+    bench(orders, captured)
+    lines = captured.getvalue().splitlines()
+    quiet = len(orders) / bench(orders, sink, level=None)
+    start = time.perf_counter()
+    for line in lines:
+        print(line, file=sink)
+    return len(orders) / (quiet + time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    orders = make_orders(count)
+    with open(os.devnull, "w") as sink:
+        results = [("print() (before the logger)", bench_print(orders, sink)),
+                   ("synchronous text", bench(orders, sink)),
+                   ("buffered async sink, text", bench(orders, sink, asynchronous=True)),
+                   ("buffered async sink, JSON", bench(orders, sink, structured=True, asynchronous=True)),
+                   ("warnings only", bench(orders, sink, level=logging.WARNING)),
+                   ("logging off", bench(orders, sink, level=None))]
+
+    print(f"{count:,} orders through place_order(), no delivery delay, events to {os.devnull}")
+    for label, rate in results:
+        print(f"{label:<32} {rate:>10,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measures loyalty lookups against a SQLite store holding many customers:
+one apply_discount() call per order versus the apply_discounts() batch,
+plus background points accrual.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.loyalty_store [customers]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from services.loyalty import LoyaltyService
+from services.loyalty_store import LoyaltyStore
+from services.events import configure_logging
+
+ORDERS = 100_000
+
+
+def main():
+    customers = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = LoyaltyStore(os.path.join(folder, "loyalty.db"), cache_size=50_000)
+        start = time.perf_counter()
+        for first in range(0, customers, 100_000):
+            store.add_points({f"customer{n}@example.com": rng.randrange(200)
+                              for n in range(first, min(first + 100_000, customers))})
+        print(f"Loaded {customers:,} customers in {time.perf_counter() - start:.2f}s")
+
+        # Orders favour a hot set of regulars, with a long tail of occasional customers
+        emails = [f"customer{rng.randrange(10_000) if rng.random() < 0.8 else rng.randrange(customers)}"
+                  f"@example.com" for _ in range(ORDERS)]
+        amounts = [rng.uniform(8.00, 30.00) for _ in range(ORDERS)]
+        loyalty = LoyaltyService(store)
+
+        # Service events are switched off so only the timings are measured
+        configure_logging(level=None)
+        start = time.perf_counter()
+        single = [loyalty.apply_discount(email, amount) for email, amount in zip(emails, amounts)]
+        single_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = loyalty.apply_discounts(emails, amounts)
+        batch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for email, amount in zip(emails, amounts):
+            loyalty.accrue_points(email, amount)
+        queue_time = time.perf_counter() - start
+        loyalty.flush()
+        accrual_time = time.perf_counter() - start
+        loyalty.close()
+        store.close()
+
+    assert single == batch
+    print(f"apply_discount loop  {ORDERS / single_time:>12,.0f} orders/s")
+    print(f"apply_discounts      {ORDERS / batch_time:>12,.0f} orders/s")
+    print(f"accrue_points        {ORDERS / queue_time:>12,.0f} orders/s queued, "
+          f"{ORDERS / accrual_time:,.0f} orders/s written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares order throughput of the blocking place_order() loop against the
+concurrent place_orders_async() batch and the pipelined place_orders(),
+and shows the per-stage figures of the pipeline.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.order_throughput
+"""
+import asyncio
+import time
+
+from pizza.pizza import MargheritaPizza
+from pizza.toppings import Cheese, Olives
+from services.delivery import DeliveryService
+from services.inventory import InventoryService
+from services.order_facade import OrderFacade
+from services.events import configure_logging
+
+STOCK = {
+    "tomato_sauce": 1_000_000,
+    "mozzarella": 1_000_000,
+    "basil": 1_000_000,
+    "cheese": 1_000_000,
+    "olives": 1_000_000,
+    "pepperoni": 1_000_000,
+    "mushrooms": 1_000_000
+}
+DELIVERY_DELAY = 0.5
+
+
+def make_facade() -> OrderFacade:
+    return OrderFacade(inventory=InventoryService(stock=STOCK),
+                       delivery=DeliveryService(delay=DELIVERY_DELAY))
+
+
+def make_orders(count: int) -> list:
+    return [(Cheese(Olives(MargheritaPizza())), ["Extra Cheese", "Olives"], f"{n} Main St, Springfield")
+            for n in range(count)]
+
+
+def bench_sequential(count: int) -> float:
+    facade = make_facade()
+    orders = make_orders(count)
+    start = time.perf_counter()
+    for order in orders:
+        facade.place_order(*order)
+    return count / (time.perf_counter() - start)
+
+
+def bench_async(count: int, max_concurrency: int) -> float:
+    facade = make_facade()
+    orders = make_orders(count)
+    start = time.perf_counter()
+    asyncio.run(facade.place_orders_async(orders, max_concurrency=max_concurrency))
+    return count / (time.perf_counter() - start)
+
+
+def bench_pipeline(count: int, max_concurrency: int) -> tuple:
+    facade = make_facade()
+    orders = make_orders(count)
+    start = time.perf_counter()
+    facade.place_orders(orders, max_concurrency=max_concurrency, batch_size=max_concurrency)
+    return count / (time.perf_counter() - start), facade.pipeline_stats
+
+
+def main():
+    results = []
+    # Service events are switched off so only the timings are measured
+    configure_logging(level=None)
+    results.append(("place_order (sequential)", 6, bench_sequential(6)))
+    for concurrency in (10, 50, 200):
+        count = concurrency * 4
+        results.append((f"place_orders_async (max_concurrency={concurrency})", count,
+                        bench_async(count, concurrency)))
+    for concurrency in (10, 50, 200):
+        count = concurrency * 4
+        rate, stats = bench_pipeline(count, concurrency)
+        results.append((f"place_orders (max_concurrency={concurrency})", count, rate))
+
+    print(f"Delivery delay: {DELIVERY_DELAY}s per order")
+    for label, count, rate in results:
+        print(f"{label:<46} {count:>5} orders  {rate:>8.1f} orders/s")
+    print("Pipeline stages (last run):")
+    for stage in stats:
+        print(f"  {stage}")
+
+
+if __name__ == "__main__":
+    main()
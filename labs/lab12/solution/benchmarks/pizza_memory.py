@@ -0,0 +1,65 @@
+"""
+Compares the memory held by a large batch of orders when every order builds
+its own decorator chain against orders that share interned flyweights.
+
+Run from the lab12/solution folder:
+    python -m benchmarks.pizza_memory [orders]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from pizza.factory import PizzaFactory
+from pizza.pizza import MargheritaPizza, NeapolitanPizza
+from pizza.toppings import Cheese, Olives, Pepperoni, Mushrooms, Bacon
+
+# A popular menu: a handful of distinct configurations
+MENU = [(MargheritaPizza, ()),
+        (MargheritaPizza, (Olives, Cheese)),
+        (NeapolitanPizza, (Cheese, Mushrooms, Pepperoni)),
+        (NeapolitanPizza, (Olives, Bacon)),
+        (MargheritaPizza, (Cheese, Bacon))]
+
+
+def build_plain(count: int) -> list:
+    orders = []
+    for n in range(count):
+        base, toppings = MENU[n % len(MENU)]
+        pizza = base()
+        for topping in toppings:
+            pizza = topping(pizza)
+        orders.append(pizza)
+    return orders
+
+
+def build_interned(count: int) -> list:
+    factory = PizzaFactory()
+    return [factory.get_pizza(base, *toppings)
+            for base, toppings in (MENU[n % len(MENU)] for n in range(count))]
+
+
+def measure(build, count: int) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    orders = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total_cost = sum(pizza.get_cost() for pizza in orders)
+    del orders
+    return current, elapsed, total_cost
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{count:,} orders over {len(MENU)} menu configurations")
+    for label, build in (("plain decorators", build_plain), ("interned flyweights", build_interned)):
+        memory, elapsed, total_cost = measure(build, count)
+        print(f"{label:<20} {memory / 2**20:>8.1f} MiB  {memory / count:>6.1f} B/order  "
+              f"built in {elapsed:.2f}s  (total ${total_cost:,.2f})")
+
+
+if __name__ == "__main__":
+    main()
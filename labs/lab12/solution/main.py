@@ -1,11 +1,14 @@
 from pizza.pizza import MargheritaPizza, NeapolitanPizza
 from pizza.toppings import Cheese, Olives, Pepperoni, Mushrooms, Bacon
 from services.order_facade import OrderFacade
+from services.events import configure_logging
 
 def main():
     """
     Demonstrates the Decorator (toppings) and Facade (order process) patterns.
     """
+    # Write service events straight to stdout so they interleave with the demo's own prints
+    configure_logging(asynchronous=False)
     facade = OrderFacade()
 
     # Example 1: Margherita + Cheese + Olives
@@ -32,14 +35,15 @@ def main():
     facade.place_order(pizza_with_toppings_2, toppings_list_2, address_2)
     print()
 
-    # Example 3: Very expensive pizza to demonstrate payment failure
+    # Example 3: Very expensive pizza to demonstrate a failed order
+    # (80 extra cheeses exceed both the cheese in stock and the payment limit)
     pricey = MargheritaPizza()
     for _ in range(80):  # each cheese adds $1.25 => 80 * 1.25 = $100
         pricey = Cheese(pricey)
     toppings_list_3 = ["Extra Cheese"] * 80
     address_3 = "789 Oak Ave, Ogdenville"
 
-    print("---- Placing Order 3 (Expected Payment Failure) ----")
+    print("---- Placing Order 3 (Expected Failure) ----")
     print(f"Description: {pricey.get_description()}")
     print(f"Cost (Before Loyalty Discount): ${pricey.get_cost():.2f}")
     facade.place_order(pricey, toppings_list_3, address_3)
@@ -69,5 +73,8 @@ def main():
     facade.place_order(pizza_with_toppings_5, toppings_list_5, address_5, "alice@example.com")
     print()
 
+    # Write the loyalty points earned above before exiting
+    facade.close()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,42 @@
+from typing import Dict, Tuple, Type
+from pizza.pizza import Pizza, CompiledPizza
+from pizza.toppings import ToppingDecorator
+
+class PizzaFactory:
+    """
+    Flyweight factory for pizzas. Identical configurations (same base pizza and
+    the same toppings in the same order) share one immutable CompiledPizza whose
+    description and cost are computed once.
+    """
+    def __init__(self):
+        # Key: (base name, (topping name, ...)) -> CompiledPizza
+        self._pizzas: Dict[Tuple[str, tuple], CompiledPizza] = {}
+        # Fast lookup for get_pizza(): (base class, (topping class, ...)) -> CompiledPizza
+        self._by_classes: Dict[tuple, CompiledPizza] = {}
+
+    def get_pizza(self, base: Type[Pizza], *toppings: Type[ToppingDecorator]) -> CompiledPizza:
+        """
+        Return the shared pizza for a base pizza class and topping classes,
+        applied in the order given (innermost first), building it if needed.
+        """
+        pizza = self._by_classes.get((base, toppings))
+        if pizza is None:
+            pizza = base()
+            for topping in toppings:
+                pizza = topping(pizza)
+            pizza = self._by_classes.setdefault((base, toppings), self.intern(pizza))
+        return pizza
+
+    def intern(self, pizza: Pizza) -> CompiledPizza:
+        """
+        Return the shared pizza equivalent to an existing decorator chain.
+        """
+        compiled = pizza.compile()
+        # setdefault keeps a single shared instance if two threads race here
+        return self._pizzas.setdefault((compiled.get_base_name(), compiled.get_toppings()), compiled)
+
+    def get_total_pizzas(self) -> int:
+        """
+        Returns the count of unique pizza flyweights created.
+        """
+        return len(self._pizzas)
@@ -4,7 +4,12 @@ class Pizza(ABC):
     """
     The Component interface for pizzas.
     Defines methods to get description and cost.
+    Concrete base pizzas set NAME, which get_base_name() returns.
     """
+    __slots__ = ()
+
+    NAME = ""
+
     @abstractmethod
     def get_description(self) -> str:
         pass
@@ -13,11 +18,33 @@ class Pizza(ABC):
     def get_cost(self) -> float:
         pass
 
+    def get_base_name(self) -> str:
+        """
+        Name of the base pizza without its toppings, e.g. "Margherita Pizza".
+        """
+        return self.NAME
+
+    def get_toppings(self) -> tuple:
+        """
+        Names of the toppings on this pizza, in the order they were added.
+        """
+        return ()
+
+    def compile(self) -> "CompiledPizza":
+        """
+        Return a flat, read-only copy of this pizza whose description and cost
+        are computed once up front.
+        """
+        return CompiledPizza(self.get_base_name(), self.get_toppings(),
+                             self.get_description(), self.get_cost())
+
 
 class MargheritaPizza(Pizza):
     """
     A concrete pizza: Margherita.
     """
+    NAME = "Margherita Pizza"
+
     def get_description(self) -> str:
         return "Margherita Pizza (tomato sauce, mozzarella)"
 
@@ -29,9 +56,49 @@ class NeapolitanPizza(Pizza):
     """
     A concrete pizza: Neapolitan.
     """
+    NAME = "Neapolitan Pizza"
+
     def get_description(self) -> str:
         return "Neapolitan Pizza (tomato sauce, fresh mozzarella, basil)"
 
     def get_cost(self) -> float:
         return 10.00  # base price
-    
\ No newline at end of file
+
+
+class CompiledPizza(Pizza):
+    """
+    A pizza flattened from a chain of topping decorators.
+    Holds the base name, topping names, description and cost as plain values,
+    so reading them costs the same however many toppings were added.
+
+    Instances are immutable: PizzaFactory shares them between orders, so a
+    change through one reference would change every order holding it.
+    """
+    __slots__ = ("_base_name", "_toppings", "_description", "_cost")
+
+    def __init__(self, base_name: str, toppings: tuple, description: str, cost: float) -> None:
+        object.__setattr__(self, "_base_name", base_name)
+        object.__setattr__(self, "_toppings", tuple(toppings))
+        object.__setattr__(self, "_description", description)
+        object.__setattr__(self, "_cost", cost)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+
+    def get_description(self) -> str:
+        return self._description
+
+    def get_cost(self) -> float:
+        return self._cost
+
+    def get_base_name(self) -> str:
+        return self._base_name
+
+    def get_toppings(self) -> tuple:
+        return self._toppings
+
+    def compile(self) -> "CompiledPizza":
+        return self
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
-from pizza.pizza import Pizza
+from pizza.pizza import Pizza, CompiledPizza
 
 class ToppingDecorator(Pizza, ABC):
     """
     The Decorator abstract class—wraps a Pizza instance.
+    Subclasses declare their topping NAME and PRICE.
     """
+    NAME = ""
+    PRICE = 0.0
+
     def __init__(self, pizza: Pizza) -> None:
         self._pizza = pizza
+        self._compiled = None
 
     @abstractmethod
     def get_description(self) -> str:
@@ -16,58 +21,102 @@ class ToppingDecorator(Pizza, ABC):
     def get_cost(self) -> float:
         pass
 
+    def get_base_name(self) -> str:
+        return self.compile().get_base_name()
+
+    def get_toppings(self) -> tuple:
+        return self.compile().get_toppings()
+
+    def compile(self) -> CompiledPizza:
+        """
+        Flatten the decorator chain in a single loop (no recursion) and memoize
+        the result. Decorators never change the pizza they wrap, so it stays valid.
+        """
+        if self._compiled is None:
+            toppings = []
+            pizza = self
+            while isinstance(pizza, ToppingDecorator):
+                toppings.append(pizza)
+                pizza = pizza._pizza
+            base = pizza.compile()
+            toppings.reverse()
+
+            # Add prices innermost first, the same order the recursive get_cost() uses
+            cost = base.get_cost()
+            for topping in toppings:
+                cost += topping.PRICE
+            names = tuple(topping.NAME for topping in toppings)
+            description = ", ".join((base.get_description(),) + names)
+            self._compiled = CompiledPizza(base.get_base_name(), base.get_toppings() + names,
+                                           description, cost)
+        return self._compiled
+
 
 class Cheese(ToppingDecorator):
     """
     Concrete Decorator: Cheese topping.
     """
+    NAME = "Extra Cheese"
+    PRICE = 1.25  # Cheese costs $1.25
+
     def get_description(self) -> str:
-        return f"{self._pizza.get_description()}, Extra Cheese"
+        return f"{self._pizza.get_description()}, {self.NAME}"
 
     def get_cost(self) -> float:
-        return self._pizza.get_cost() + 1.25  # Cheese costs $1.25
+        return self._pizza.get_cost() + self.PRICE
 
 
 class Olives(ToppingDecorator):
     """
     Concrete Decorator: Olives topping.
     """
+    NAME = "Olives"
+    PRICE = 0.75  # Olives cost $0.75
+
     def get_description(self) -> str:
-        return f"{self._pizza.get_description()}, Olives"
+        return f"{self._pizza.get_description()}, {self.NAME}"
 
     def get_cost(self) -> float:
-        return self._pizza.get_cost() + 0.75  # Olives cost $0.75
+        return self._pizza.get_cost() + self.PRICE
 
 
 class Pepperoni(ToppingDecorator):
     """
     Concrete Decorator: Pepperoni topping.
     """
+    NAME = "Pepperoni"
+    PRICE = 1.50  # Pepperoni costs $1.50
+
     def get_description(self) -> str:
-        return f"{self._pizza.get_description()}, Pepperoni"
+        return f"{self._pizza.get_description()}, {self.NAME}"
 
     def get_cost(self) -> float:
-        return self._pizza.get_cost() + 1.50  # Pepperoni costs $1.50
+        return self._pizza.get_cost() + self.PRICE
 
 
 class Mushrooms(ToppingDecorator):
     """
     Concrete Decorator: Mushrooms topping.
     """
+    NAME = "Mushrooms"
+    PRICE = 0.90  # Mushrooms cost $0.90
+
     def get_description(self) -> str:
-        return f"{self._pizza.get_description()}, Mushrooms"
+        return f"{self._pizza.get_description()}, {self.NAME}"
 
     def get_cost(self) -> float:
-        return self._pizza.get_cost() + 0.90  # Mushrooms cost $0.90
+        return self._pizza.get_cost() + self.PRICE
 
 
 class Bacon(ToppingDecorator):
     """
     Concrete Decorator: Bacon topping.
     """
+    NAME = "Bacon"
+    PRICE = 1.75  # Bacon costs $1.75
+
     def get_description(self) -> str:
-        return f"{self._pizza.get_description()}, Bacon"
+        return f"{self._pizza.get_description()}, {self.NAME}"
 
     def get_cost(self) -> float:
-        return self._pizza.get_cost() + 1.75  # Bacon costs $1.75
-    
\ No newline at end of file
+        return self._pizza.get_cost() + self.PRICE
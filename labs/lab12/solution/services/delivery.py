@@ -1,13 +1,18 @@
+import asyncio
 import random
 import time
+from services.events import get_logger
+
+logger = get_logger("DeliveryService")
 
 class DeliveryService:
     """
     Simulates a delivery scheduling subsystem.
     """
-    def __init__(self):
+    def __init__(self, delay: float = 0.5):
         # In a real system, this might connect to a delivery partner API.
-        pass
+        # The delay simulates the round trip to that API.
+        self._delay = delay
 
     def schedule_delivery(self, address: str) -> str:
         """
@@ -15,10 +20,21 @@ class DeliveryService:
         Returns a delivery tracking ID.
         """
         # Simulate some processing delay
-        time.sleep(0.5)
+        time.sleep(self._delay)
+
+        return self._confirm_delivery(address)
+
+    async def schedule_delivery_async(self, address: str) -> str:
+        """
+        Non-blocking variant of schedule_delivery().
+        Awaits the simulated API round trip so other orders can progress meanwhile.
+        """
+        await asyncio.sleep(self._delay)
+
+        return self._confirm_delivery(address)
 
+    def _confirm_delivery(self, address: str) -> str:
         # Generate a fake tracking ID
         tracking_id = f"DEL-{random.randint(1000,9999)}"
-        print(f"[DeliveryService] Delivery scheduled to '{address}'. Tracking ID: {tracking_id}")
+        logger.info("Delivery scheduled to '%s'. Tracking ID: %s", address, tracking_id)
         return tracking_id
-    
\ No newline at end of file
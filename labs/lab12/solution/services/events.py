@@ -0,0 +1,199 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+from typing import Optional, TextIO
+
+# Every service logs to a child of this logger, e.g. "pizza.InventoryService".
+# Nothing is printed until configure_logging() attaches a sink.
+ROOT_LOGGER = "pizza"
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(component: str) -> logging.Logger:
+    """
+    Return the event logger for a service. Pass message arguments separately
+    (logger.info("Reserved %s", item)) so they are only formatted when the
+    level is enabled.
+    """
+    return logging.getLogger(ROOT_LOGGER).getChild(component)
+
+
+class EventFormatter(logging.Formatter):
+    """
+    Formats events the way the services always printed them: "[Component] message".
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        text = f"[{record.name.rsplit('.', 1)[-1]}] {record.getMessage()}"
+        if record.exc_info or record.exc_text:
+            text = f"{text}\n{_exception_text(self, record)}"
+        return text
+
+
+class JsonEventFormatter(logging.Formatter):
+    """
+    Formats events as one JSON object per line, including any `extra=` fields.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "time": record.created,
+            "level": record.levelname,
+            "component": record.name.rsplit(".", 1)[-1],
+            "message": record.getMessage(),
+        }
+        event.update((key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS)
+        if record.exc_info or record.exc_text:
+            event["exception"] = _exception_text(self, record)
+        return json.dumps(event, default=str)
+
+
+def _exception_text(formatter: logging.Formatter, record: logging.LogRecord) -> str:
+    # Records handed to the async sink carry their traceback already formatted
+    return record.exc_text or formatter.formatException(record.exc_info)
+
+
+class EventStreamHandler(logging.StreamHandler):
+    """
+    Synchronous sink: writes each event to the stream as it happens, like
+    print() does, without flushing after every event as StreamHandler does.
+    The stream is flushed by flush_logging(), on reconfiguration and at exit.
+    """
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        # The stream may be closed already by the time the atexit flush runs
+        if not getattr(self.stream, "closed", False):
+            super().flush()
+
+
+class BufferedEventSink:
+    """
+    Asynchronous sink: callers only enqueue records, and a background thread
+    formats whatever has queued up and writes it to the stream in one go,
+    flushing once per batch instead of once per event.
+    """
+    def __init__(self, stream: TextIO, formatter: logging.Formatter, batch_size: int = 1_000):
+        self._stream = stream
+        self._formatter = formatter
+        self._batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="pizza-event-sink", daemon=True)
+        self._thread.start()
+
+    def flush(self) -> None:
+        """
+        Block until every event queued so far has been written.
+        """
+        if self._thread.is_alive():
+            written = threading.Event()
+            self.queue.put(written)
+            written.wait()
+
+    def stop(self) -> None:
+        """
+        Write out everything queued so far and stop the background thread.
+        """
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [self._formatter.format(item) for item in batch if isinstance(item, logging.LogRecord)]
+            if lines:
+                self._stream.write("\n".join(lines) + "\n")
+                self._stream.flush()
+            # Wake up flush() callers and stop on the end marker
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if None in batch:
+                return
+
+
+class _RawQueueHandler(QueueHandler):
+    # The sink formats records itself, but the message is rendered here, on the
+    # calling thread, so arguments are logged as they were at the call and not
+    # as they are by the time the sink gets to them
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_sink: Optional[BufferedEventSink] = None
+
+
+def configure_logging(level: Optional[int] = logging.INFO, stream: TextIO = None,
+                      structured: bool = False, asynchronous: bool = False) -> None:
+    """
+    Route service events to a stream (stdout by default).
+      - level: minimum level to emit; None turns logging off entirely.
+      - structured: write JSON lines instead of "[Component] message" text.
+      - asynchronous: write through a BufferedEventSink on a background thread
+        instead of on the calling thread. Measured by
+        benchmarks/logging_overhead.py it does not beat synchronous writing,
+        so it is off by default.
+    Calling it again replaces the previous configuration.
+    """
+    global _sink
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        handler.flush()
+        logger.removeHandler(handler)
+    if _sink is not None:
+        _sink.stop()
+        _sink = None
+
+    logger.propagate = False
+    if level is None:
+        # Above CRITICAL, so every call returns after a single level check
+        logger.setLevel(logging.CRITICAL + 1)
+        logger.addHandler(logging.NullHandler())
+        return
+
+    logger.setLevel(level)
+    stream = stream or sys.stdout
+    formatter = JsonEventFormatter() if structured else EventFormatter()
+    if asynchronous:
+        _sink = BufferedEventSink(stream, formatter)
+        logger.addHandler(_RawQueueHandler(_sink.queue))
+    else:
+        handler = EventStreamHandler(stream)
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+
+def flush_logging() -> None:
+    """
+    Block until every event so far has been written out.
+    """
+    if _sink is not None:
+        _sink.flush()
+    for handler in logging.getLogger(ROOT_LOGGER).handlers:
+        handler.flush()
+
+
+atexit.register(lambda: _sink.stop() if _sink is not None else flush_logging())
@@ -1,10 +1,38 @@
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from services.events import get_logger
+
+logger = get_logger("InventoryService")
+
 class InventoryService:
     """
     Simulates an inventory system that checks ingredient availability.
+    Safe to share between threads: each ingredient has its own lock
+    (lock striping), so orders that share no ingredients never contend.
     """
-    def __init__(self):
+    # Map pizza types to base ingredients: a list (one unit each, repeats add up)
+    # or a mapping of ingredient -> units
+    PIZZA_INGREDIENTS = {
+        "Margherita Pizza": ["tomato_sauce", "mozzarella"],
+        "Neapolitan Pizza": ["tomato_sauce", "mozzarella", "basil"]
+    }
+
+    # Map topping names to inventory keys
+    TOPPING_INGREDIENTS = {
+        "Extra Cheese": "cheese",
+        "Olives": "olives",
+        "Pepperoni": "pepperoni",
+        "Mushrooms": "mushrooms"
+    }
+
+    # Most (pizza type, toppings) combinations whose requirements are kept
+    REQUIREMENT_CACHE_SIZE = 4096
+
+    def __init__(self, stock: dict = None):
         # Simulate available items in stock
-        self._inventory = {
+        stock = dict(stock) if stock is not None else {
             "tomato_sauce": 10,
             "mozzarella": 10,
             "basil": 5,
@@ -13,51 +41,198 @@ class InventoryService:
             "pepperoni": 8,
             "mushrooms": 7
         }
+        # Every recipe ingredient gets a slot, even when none is in stock
+        recipes = {pizza_type: self._recipe_quantities(pizza_type, ingredients)
+                   for pizza_type, ingredients in self.PIZZA_INGREDIENTS.items()}
+        for quantities in recipes.values():
+            for ingredient in quantities:
+                stock.setdefault(ingredient, 0)
+        for ingredient in self.TOPPING_INGREDIENTS.values():
+            stock.setdefault(ingredient, 0)
+
+        # Stock counts live in a list indexed by ingredient id
+        self._ingredients = list(stock)
+        self._ids = {ingredient: i for i, ingredient in enumerate(self._ingredients)}
+        self._counts = [stock[ingredient] for ingredient in self._ingredients]
+        self._locks = [threading.Lock() for _ in self._ingredients]
+
+        # Recipe index, built once: pizza type -> ingredient id counts, topping -> ingredient id
+        self._pizza_requirements = {
+            pizza_type: Counter({self._ids[ingredient]: quantity for ingredient, quantity in quantities.items()})
+            for pizza_type, quantities in recipes.items()
+        }
+        self._topping_ids = {topping: self._ids[ingredient]
+                             for topping, ingredient in self.TOPPING_INGREDIENTS.items()}
+
+        # Requirement cache: (pizza type, toppings) -> ((ingredient id, quantity), ...),
+        # bounded so arbitrary topping combinations cannot grow it forever
+        self._cached_requirement = lru_cache(maxsize=self.REQUIREMENT_CACHE_SIZE)(self._build_requirement)
 
     def check_and_reserve(self, pizza_type: str, toppings: list) -> bool:
         """
         Check if all ingredients exist for the selected pizza type and toppings.
         If available, reserve (decrement) them and return True. Otherwise return False.
         """
-        # Map pizza types to base ingredients
-        pizza_ingredients = {
-            "Margherita Pizza": ["tomato_sauce", "mozzarella"],
-            "Neapolitan Pizza": ["tomato_sauce", "mozzarella", "basil"]
-        }
+        requirement = self._requirement(pizza_type, toppings)
+        if requirement is None:
+            logger.warning("Unknown pizza type '%s'.", pizza_type)
+            return False
 
-        # Map topping names to inventory keys
-        topping_map = {
-            "Extra Cheese": "cheese",
-            "Olives": "olives",
-            "Pepperoni": "pepperoni",
-            "Mushrooms": "mushrooms"
-        }
+        if not self._reserve(requirement):
+            return False
 
-        required = []
+        logger.info("Reserved ingredients for %s with toppings %s.", pizza_type, toppings)
+        return True
 
-        # Base pizza ingredients
-        if pizza_type in pizza_ingredients:
-            required.extend(pizza_ingredients[pizza_type])
-        else:
-            print(f"[InventoryService] Unknown pizza type '{pizza_type}'.")
-            return False
+    def reserve_many(self, orders: Iterable[Tuple[str, list]]) -> List[bool]:
+        """
+        Reserve ingredients for many (pizza_type, toppings) orders under a single
+        acquisition of the locks involved. Each order is all or nothing, and orders
+        are served in the order given. Returns one result per order.
+        """
+        orders = list(orders)
+        requirements = [self._requirement(pizza_type, toppings) for pizza_type, toppings in orders]
+        ingredient_ids = sorted({ingredient_id for requirement in requirements if requirement
+                                 for ingredient_id, _ in requirement})
+
+        for ingredient_id in ingredient_ids:
+            self._locks[ingredient_id].acquire()
+        try:
+            totals = Counter()
+            for requirement in requirements:
+                if requirement:
+                    totals.update(dict(requirement))
+
+            # Fast path: the whole batch fits, so reserve it in one pass
+            if self._shortage(totals.items()) is None:
+                self._take(totals.items())
+                results = [requirement is not None for requirement in requirements]
+            else:
+                results = []
+                for requirement in requirements:
+                    results.append(requirement is not None and self._shortage(requirement) is None)
+                    if results[-1]:
+                        self._take(requirement)
+        finally:
+            for ingredient_id in reversed(ingredient_ids):
+                self._locks[ingredient_id].release()
+
+        for (pizza_type, _), requirement in zip(orders, requirements):
+            if requirement is None:
+                logger.warning("Unknown pizza type '%s'.", pizza_type)
+        logger.info("Reserved ingredients for %d of %d orders.", sum(results), len(orders))
+        return results
+
+    def release(self, pizza_type: str, toppings: list) -> None:
+        """
+        Return the ingredients reserved by a successful check_and_reserve() call,
+        e.g. when a later step of the order fails.
+        """
+        requirement = self._requirement(pizza_type, toppings)
+        if requirement is None:
+            logger.warning("Unknown pizza type '%s'.", pizza_type)
+            return
 
-        # Add toppings ingredients
+        self._put_back(requirement)
+        logger.info("Released ingredients for %s with toppings %s.", pizza_type, toppings)
+
+    def reserve_ingredients(self, quantities: dict) -> bool:
+        """
+        Reserve the given quantity of every ingredient, all or nothing.
+        Returns True if everything was reserved; otherwise nothing is changed.
+        Quantities must be positive.
+        """
+        self._check_quantities(quantities)
+        for ingredient in quantities:
+            if ingredient not in self._ids:
+                logger.warning("Ingredient '%s' is out of stock.", ingredient)
+                return False
+
+        return self._reserve(tuple(sorted((self._ids[ingredient], quantity)
+                                          for ingredient, quantity in quantities.items())))
+
+    def release_ingredients(self, quantities: dict) -> None:
+        """
+        Put previously reserved ingredients back in stock.
+        """
+        self._check_quantities(quantities)
+        self._put_back([(self._ids[ingredient], quantity) for ingredient, quantity in quantities.items()])
+
+    def get_stock(self, ingredient: str) -> int:
+        """
+        Return the number of units of an ingredient currently in stock.
+        """
+        ingredient_id = self._ids.get(ingredient)
+        return 0 if ingredient_id is None else self._counts[ingredient_id]
+
+    def _requirement(self, pizza_type: str, toppings: list) -> Optional[tuple]:
+        """
+        Look up the ((ingredient id, quantity), ...) requirement for a pizza type and
+        its toppings, sorted by ingredient id. Returns None if the pizza type is unknown.
+        """
+        return self._cached_requirement(pizza_type, tuple(toppings))
+
+    def _build_requirement(self, pizza_type: str, toppings: tuple) -> Optional[tuple]:
+        base = self._pizza_requirements.get(pizza_type)
+        if base is None:
+            return None
+        required = Counter(base)
         for top in toppings:
-            key = topping_map.get(top)
-            if key:
-                required.append(key)
-
-        # Check availability
-        for ingredient in required:
-            if self._inventory.get(ingredient, 0) <= 0:
-                print(f"[InventoryService] Ingredient '{ingredient}' is out of stock.")
+            ingredient_id = self._topping_ids.get(top)
+            if ingredient_id is not None:
+                required[ingredient_id] += 1
+
+        return tuple(sorted(required.items()))
+
+    @staticmethod
+    def _recipe_quantities(pizza_type: str, ingredients) -> dict:
+        # A recipe as ingredient -> units, rejecting quantities that would add stock on reserve
+        quantities = dict(ingredients) if isinstance(ingredients, dict) else Counter(ingredients)
+        for ingredient, quantity in quantities.items():
+            if not isinstance(quantity, int) or quantity <= 0:
+                raise ValueError(f"Recipe for {pizza_type} needs a positive whole quantity of "
+                                 f"{ingredient}. Got: {quantity!r}")
+        return quantities
+
+    @staticmethod
+    def _check_quantities(quantities: dict) -> None:
+        for ingredient, quantity in quantities.items():
+            if quantity <= 0:
+                raise ValueError(f"Quantity of {ingredient} must be positive. Got: {quantity}")
+
+    def _reserve(self, requirement: tuple) -> bool:
+        """
+        Reserve a requirement, all or nothing.
+        Locks are taken in ingredient id order so concurrent reservations cannot deadlock.
+        """
+        for ingredient_id, _ in requirement:
+            self._locks[ingredient_id].acquire()
+        try:
+            shortage = self._shortage(requirement)
+            if shortage is not None:
+                logger.warning("Ingredient '%s' is out of stock.", self._ingredients[shortage])
                 return False
+            self._take(requirement)
+            return True
+        finally:
+            for ingredient_id, _ in reversed(requirement):
+                self._locks[ingredient_id].release()
 
-        # Reserve (decrement) each ingredient
-        for ingredient in required:
-            self._inventory[ingredient] -= 1
+    def _shortage(self, requirement: Iterable[Tuple[int, int]]) -> Optional[int]:
+        # Compare the requirement against the stock counts; the caller holds the locks
+        counts = self._counts
+        for ingredient_id, quantity in requirement:
+            if counts[ingredient_id] < quantity:
+                return ingredient_id
+        return None
 
-        print(f"[InventoryService] Reserved ingredients for {pizza_type} with toppings {toppings}.")
-        return True
-    
\ No newline at end of file
+    def _take(self, requirement: Iterable[Tuple[int, int]]) -> None:
+        # Decrement the stock counts; the caller holds the locks
+        counts = self._counts
+        for ingredient_id, quantity in requirement:
+            counts[ingredient_id] -= quantity
+
+    def _put_back(self, requirement: Iterable[Tuple[int, int]]) -> None:
+        for ingredient_id, quantity in requirement:
+            with self._locks[ingredient_id]:
+                self._counts[ingredient_id] += quantity
@@ -1,19 +1,136 @@
+import atexit
+import queue
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Sequence
+from services.loyalty_store import LoyaltyStore
+from services.events import get_logger
+
+logger = get_logger("LoyaltyService")
+
 class LoyaltyService:
     """
     Simulates a loyalty program that applies a percentage discount.
+    Points earned by completed orders are queued and written to the
+    store in batches by a background worker. While the worker runs, an
+    atexit hook closes the service, so accruals still queued when the
+    interpreter exits are written rather than lost.
     """
-    def __init__(self):
-        # Example: a simple “loyalty points” storage
-        self._points = {"alice@example.com": 120, "bob@example.com": 45}
+    DISCOUNT_THRESHOLD = 100  # points needed for a discount
+    DISCOUNT_RATE = 0.05
+    POINTS_PER_DOLLAR = 1
+
+    def __init__(self, store: LoyaltyStore = None):
+        if store is None:
+            # Example: a simple “loyalty points” storage
+            store = LoyaltyStore()
+            store.add_points({"alice@example.com": 120, "bob@example.com": 45})
+        self._store = store
+        self._accruals = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
 
     def apply_discount(self, email: str, amount: float) -> float:
         """
         Reduce the amount by 5% if points ≥ 100, otherwise no discount.
         """
-        if self._points.get(email, 0) >= 100:
-            discount = amount * 0.05
-            print(f"[LoyaltyService] Applied 5% discount (${discount:.2f}) for {email}.")
+        if email is not None and self._store.get_points(email) >= self.DISCOUNT_THRESHOLD:
+            discount = amount * self.DISCOUNT_RATE
+            logger.info("Applied 5%% discount ($%.2f) for %s.", discount, email)
             return amount - discount
         else:
-            print(f"[LoyaltyService] No discount for {email}.")
+            logger.info("No discount for %s.", email)
             return amount
+
+    def apply_discounts(self, emails: Sequence[str], amounts: Sequence[float]) -> List[float]:
+        """
+        Batch version of apply_discount(): looks up every customer's points in
+        one pass and returns the discounted amounts, in the order given.
+        """
+        if len(emails) != len(amounts):
+            raise ValueError(f"Got {len(emails)} emails but {len(amounts)} amounts.")
+        points = self._store.get_many(email for email in emails if email is not None)
+        threshold, rate = self.DISCOUNT_THRESHOLD, self.DISCOUNT_RATE
+        discounted = [amount - amount * rate if points.get(email, 0) >= threshold else amount
+                      for email, amount in zip(emails, amounts)]
+        applied = sum(1 for email in emails if points.get(email, 0) >= threshold)
+        logger.info("Applied 5%% discount to %d of %d orders.", applied, len(amounts))
+        return discounted
+
+    def accrue_points(self, email: str, amount: float) -> None:
+        """
+        Queue the points earned by a completed order. They are written to the
+        store asynchronously; call flush() to wait for them.
+        """
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run_accruals, daemon=True)
+                    self._worker.start()
+                    atexit.register(self.close)
+        self._accruals.put((email, int(amount * self.POINTS_PER_DOLLAR)))
+
+    def get_points(self, email: str) -> int:
+        return self._store.get_points(email)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until every queued accrual has been written to the store.
+        Raises TimeoutError if that takes longer than timeout seconds, and
+        RuntimeError if the background worker is no longer running.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        accruals = self._accruals
+        with accruals.all_tasks_done:
+            while accruals.unfinished_tasks:
+                worker = self._worker
+                if worker is None or not worker.is_alive():
+                    raise RuntimeError(f"Loyalty worker is not running; {accruals.unfinished_tasks} "
+                                       f"accrual(s) were not written.")
+                wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError(f"{accruals.unfinished_tasks} accrual(s) still queued "
+                                       f"after {timeout}s.")
+                # Wake up now and then to notice a worker that died
+                accruals.all_tasks_done.wait(wait)
+
+    def close(self) -> None:
+        """
+        Write out queued accruals and stop the background worker.
+        """
+        with self._worker_lock:
+            if self._worker is not None:
+                if self._worker.is_alive():
+                    self._accruals.put(None)
+                    self._worker.join()
+                self._worker = None
+                atexit.unregister(self.close)
+
+    def _run_accruals(self) -> None:
+        while True:
+            batch = [self._accruals.get()]
+            # Drain whatever else is waiting so it goes out in one transaction
+            while len(batch) < 10_000:
+                try:
+                    batch.append(self._accruals.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            points = Counter()
+            for item in batch:
+                if item is not None:
+                    points[item[0]] += item[1]
+            try:
+                if points:
+                    self._store.add_points(points)
+            except Exception as error:
+                # Keep the worker alive for later accruals
+                logger.exception("Failed to write points for %d customer(s): %s", len(points), error)
+            finally:
+                for _ in batch:
+                    self._accruals.task_done()
+            if stop:
+                return
@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+class LoyaltyStore:
+    """
+    Persistent loyalty points storage backed by SQLite, sized for millions of
+    customers. A bounded in-memory LRU tier sits in front of the database so
+    returning customers are served without a query.
+    """
+    # Stay under SQLite's default limit on bound parameters per statement
+    _MAX_PARAMS = 900
+
+    def __init__(self, path: str = ":memory:", cache_size: int = 100_000):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS loyalty_points ("
+                           "email TEXT PRIMARY KEY, points INTEGER NOT NULL) WITHOUT ROWID")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def get_points(self, email: str) -> int:
+        """
+        Return the points balance for a customer (0 if unknown).
+        """
+        with self._lock:
+            points = self._cache.get(email)
+            if points is not None:
+                self._cache.move_to_end(email)
+                return points
+            row = self._conn.execute("SELECT points FROM loyalty_points WHERE email = ?",
+                                     (email,)).fetchone()
+            points = row[0] if row else 0
+            self._remember(email, points)
+            return points
+
+    def get_many(self, emails: Iterable[str]) -> Dict[str, int]:
+        """
+        Return the points balance for every given customer (0 if unknown),
+        querying the database once per chunk of cache misses.
+        """
+        result = {}
+        with self._lock:
+            misses = []
+            for email in dict.fromkeys(emails):
+                points = self._cache.get(email)
+                if points is None:
+                    misses.append(email)
+                else:
+                    self._cache.move_to_end(email)
+                    result[email] = points
+
+            for start in range(0, len(misses), self._MAX_PARAMS):
+                chunk = misses[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                found = dict(self._conn.execute(
+                    f"SELECT email, points FROM loyalty_points WHERE email IN ({placeholders})", chunk))
+                for email in chunk:
+                    points = found.get(email, 0)
+                    result[email] = points
+                    self._remember(email, points)
+        return result
+
+    def add_points(self, points: Dict[str, int]) -> None:
+        """
+        Add points to many customers in one transaction, creating unknown customers.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO loyalty_points (email, points) VALUES (?, ?) "
+                    "ON CONFLICT(email) DO UPDATE SET points = points + excluded.points",
+                    points.items())
+            for email, added in points.items():
+                if email in self._cache:
+                    self._cache[email] += added
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, email: str, points: int) -> None:
+        # Caller holds the lock
+        self._cache[email] = points
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
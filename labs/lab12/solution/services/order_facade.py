@@ -1,8 +1,35 @@
+import asyncio
+from typing import Iterable, List, Optional
 from pizza.pizza import Pizza
 from services.inventory import InventoryService
 from services.loyalty import LoyaltyService
 from services.payment import PaymentProcessor
 from services.delivery import DeliveryService
+from services.pipeline import Pipeline, StageStats
+from services.events import get_logger
+
+logger = get_logger("OrderFacade")
+
+class _PipelineOrder:
+    """
+    One order as it moves through the place_orders() pipeline.
+    """
+    __slots__ = ("pizza", "toppings", "address", "email", "total_cost", "reserved", "charged", "ok",
+                 "delivered", "error")
+
+    def __init__(self, pizza: Pizza, toppings: list, address: str, email: str = None):
+        self.pizza = pizza.compile()
+        self.toppings = toppings
+        self.address = address
+        self.email = email
+        self.total_cost = self.pizza.get_cost()
+        self.reserved = False
+        self.charged = False
+        self.ok = True
+        self.delivered = False
+        # Why the order failed, if it did
+        self.error: Optional[str] = None
+
 
 class OrderFacade:
     """
@@ -12,11 +39,30 @@ class OrderFacade:
       3. Payment processing
       4. Delivery scheduling
     """
-    def __init__(self):
-        self._inventory = InventoryService()
-        self._loyalty = LoyaltyService()
-        self._payment = PaymentProcessor()
-        self._delivery = DeliveryService()
+    def __init__(self,
+                 inventory: InventoryService = None,
+                 loyalty: LoyaltyService = None,
+                 payment: PaymentProcessor = None,
+                 delivery: DeliveryService = None):
+        self._inventory = inventory or InventoryService()
+        self._loyalty = loyalty or LoyaltyService()
+        self._payment = payment or PaymentProcessor()
+        self._delivery = delivery or DeliveryService()
+        # Per-stage statistics from the most recent place_orders() call
+        self.pipeline_stats: List[StageStats] = []
+
+    def close(self) -> None:
+        """
+        Write out queued loyalty points and stop the loyalty service's worker.
+        The facade can still be used afterwards.
+        """
+        self._loyalty.close()
+
+    def __enter__(self) -> "OrderFacade":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def place_order(self, pizza: Pizza, toppings: list, address: str, email: str = None) -> bool:
         """
@@ -27,30 +73,185 @@ class OrderFacade:
          - Schedule delivery
         Returns True if order is successful; otherwise False.
         """
-        # 1. Inventory
-        pizza_desc = pizza.get_description().split(" (")[0]  # e.g., "Margherita Pizza"
-        if not self._inventory.check_and_reserve(pizza_desc, toppings):
-            print("[OrderFacade] Order failed: inventory issue.")
+        total_cost = self._checkout(pizza, toppings, email)
+        if total_cost is None:
             return False
 
+        # 4. Delivery
+        tracking_id = self._delivery.schedule_delivery(address)
+        logger.info("Order success! Your pizza is on the way. Tracking ID: %s", tracking_id)
+        self._accrue_points(email, total_cost)
+        return True
+
+    async def place_order_async(self, pizza: Pizza, toppings: list, address: str, email: str = None) -> bool:
+        """
+        Same steps as place_order(), but awaits delivery scheduling instead of
+        blocking on it, so several orders can be in flight on one event loop.
+        Returns True if order is successful; otherwise False.
+        """
+        total_cost = self._checkout(pizza, toppings, email)
+        if total_cost is None:
+            return False
+
+        # 4. Delivery
+        tracking_id = await self._delivery.schedule_delivery_async(address)
+        logger.info("Order success! Your pizza is on the way. Tracking ID: %s", tracking_id)
+        self._accrue_points(email, total_cost)
+        return True
+
+    async def place_orders_async(self, orders: Iterable[tuple], max_concurrency: int = 10) -> List[bool]:
+        """
+        Place many orders concurrently, with at most max_concurrency in flight.
+        Each order is a tuple of place_order() arguments: (pizza, toppings, address[, email]).
+        Returns one result per order, in the order given. An order that raises
+        is logged and reported as False; the others carry on.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1. Got: {max_concurrency}")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(order: tuple) -> bool:
+            async with semaphore:
+                try:
+                    return await self.place_order_async(*order)
+                except Exception as error:
+                    logger.exception("Order failed: %s", error)
+                    return False
+
+        return list(await asyncio.gather(*(run(order) for order in orders)))
+
+    def place_orders(self, orders: Iterable[tuple], max_concurrency: int = 10,
+                     batch_size: int = 50, queue_size: int = 4) -> List[bool]:
+        """
+        Place many orders through a pipeline: the inventory, loyalty, payment and
+        delivery stages each run on their own thread and pass batches of
+        batch_size orders to the next stage over bounded queues, so the stages
+        overlap across batches. Up to max_concurrency deliveries per batch are
+        scheduled at once. Orders that fail after reserving inventory release it.
+        If a stage raises, every order of its batch not yet delivered fails
+        (releasing its inventory) and the batch moves on, so each order still
+        gets a result.
+
+        Each order is a tuple of place_order() arguments: (pizza, toppings, address[, email]).
+        Returns one result per order, in the order given. Per-stage throughput and
+        queue depth are logged and kept in pipeline_stats.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1. Got: {max_concurrency}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1. Got: {batch_size}")
+
+        records = [_PipelineOrder(*order) for order in orders]
+        batches = (records[start:start + batch_size] for start in range(0, len(records), batch_size))
+        pipeline = Pipeline([("inventory", self._reserve_stage),
+                             ("loyalty", self._loyalty_stage),
+                             ("payment", self._payment_stage),
+                             ("delivery", lambda batch: self._delivery_stage(batch, max_concurrency))],
+                            queue_size=queue_size, on_error=self._stage_failed)
+        self.pipeline_stats = pipeline.run(batches)
+
+        for stats in self.pipeline_stats:
+            logger.info("Stage %s", stats)
+        if records:
+            bottleneck = min(self.pipeline_stats, key=lambda stats: stats.throughput)
+            logger.info("Bottleneck stage: %s", bottleneck.name)
+        return [record.delivered for record in records]
+
+    def _reserve_stage(self, batch: List[_PipelineOrder]) -> None:
+        reserved = self._inventory.reserve_many((order.pizza.get_base_name(), order.toppings)
+                                                for order in batch)
+        for order, ok in zip(batch, reserved):
+            order.reserved = order.ok = ok
+            if not ok:
+                order.error = "inventory issue"
+                logger.warning("Order failed: inventory issue.")
+
+    def _loyalty_stage(self, batch: List[_PipelineOrder]) -> None:
+        pending = [order for order in batch if order.ok]
+        amounts = self._loyalty.apply_discounts([order.email for order in pending],
+                                                [order.total_cost for order in pending])
+        for order, amount in zip(pending, amounts):
+            order.total_cost = amount
+            if not amount or amount <= 0:
+                self._fail(order, "invalid total cost after discount")
+
+    def _payment_stage(self, batch: List[_PipelineOrder]) -> None:
+        for order in batch:
+            if order.ok:
+                if self._payment.process_payment(order.total_cost):
+                    order.charged = True
+                else:
+                    self._fail(order, "payment declined")
+
+    def _delivery_stage(self, batch: List[_PipelineOrder], max_concurrency: int) -> None:
+        pending = [order for order in batch if order.ok]
+
+        async def deliver_all() -> None:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def deliver(order: _PipelineOrder) -> None:
+                async with semaphore:
+                    tracking_id = await self._delivery.schedule_delivery_async(order.address)
+                order.delivered = True
+                logger.info("Order success! Your pizza is on the way. Tracking ID: %s", tracking_id)
+                self._accrue_points(order.email, order.total_cost)
+
+            await asyncio.gather(*(deliver(order) for order in pending))
+
+        if pending:
+            asyncio.run(deliver_all())
+
+    def _stage_failed(self, stage: str, batch: List[_PipelineOrder], error: Exception) -> None:
+        for order in batch:
+            if order.ok and not order.delivered:
+                self._fail(order, f"{stage} stage error: {error}")
+
+    def _fail(self, order: _PipelineOrder, reason: str) -> None:
+        order.ok = False
+        order.error = reason
+        logger.warning("Order failed: %s.", reason)
+        if order.reserved:
+            self._inventory.release(order.pizza.get_base_name(), order.toppings)
+            order.reserved = False
+        if order.charged:
+            logger.warning("Order to %s was charged $%.2f and needs a refund.", order.address, order.total_cost)
+
+    def _checkout(self, pizza: Pizza, toppings: list, email: Optional[str]) -> Optional[float]:
+        """
+        Run the inventory, loyalty and payment steps shared by every order path.
+        Returns the amount charged if the order is ready for delivery; otherwise None.
+        Inventory reserved for an order that fails later is released again.
+        """
+        # Flatten the topping decorators once instead of walking them per lookup
+        pizza = pizza.compile()
+
+        # 1. Inventory
+        if not self._inventory.check_and_reserve(pizza.get_base_name(), toppings):
+            logger.warning("Order failed: inventory issue.")
+            return None
+
         # 2. Loyalty
         total_cost = pizza.get_cost()
         total_cost = self._loyalty.apply_discount(email, total_cost)
         if not total_cost:
-            print("[OrderFacade] Order failed: loyalty discount application failed.")
-            return False
+            logger.warning("Order failed: loyalty discount application failed.")
+            self._inventory.release(pizza.get_base_name(), toppings)
+            return None
         if total_cost <= 0:
-            print("[OrderFacade] Order failed: invalid total cost after discount.")
-            return False
+            logger.warning("Order failed: invalid total cost after discount.")
+            self._inventory.release(pizza.get_base_name(), toppings)
+            return None
 
         # 3. Payment
-        print(f"[OrderFacade] Total cost to charge: ${total_cost:.2f}")
+        logger.info("Total cost to charge: $%.2f", total_cost)
         if not self._payment.process_payment(total_cost):
-            print("[OrderFacade] Order failed: payment declined.")
-            return False
+            logger.warning("Order failed: payment declined.")
+            self._inventory.release(pizza.get_base_name(), toppings)
+            return None
 
-        # 4. Delivery
-        tracking_id = self._delivery.schedule_delivery(address)
-        print(f"[OrderFacade] Order success! Your pizza is on the way. Tracking ID: {tracking_id}")
-        return True
-    
\ No newline at end of file
+        return total_cost
+
+    def _accrue_points(self, email: Optional[str], total_cost: float) -> None:
+        # Points are queued and written by the loyalty service in the background
+        if email is not None:
+            self._loyalty.accrue_points(email, total_cost)
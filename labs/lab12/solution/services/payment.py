@@ -1,3 +1,7 @@
+from services.events import get_logger
+
+logger = get_logger("PaymentProcessor")
+
 class PaymentProcessor:
     """
     Simulates a payment processing subsystem.
@@ -13,9 +17,9 @@ class PaymentProcessor:
         """
         # Simulate: any amount under $100 succeeds; $100+ fails
         if amount < 100.00:
-            print(f"[PaymentProcessor] Payment of ${amount:.2f} processed successfully.")
+            logger.info("Payment of $%.2f processed successfully.", amount)
             return True
         else:
-            print(f"[PaymentProcessor] Payment of ${amount:.2f} failed: exceeds limit.")
+            logger.warning("Payment of $%.2f failed: exceeds limit.", amount)
             return False
         
\ No newline at end of file
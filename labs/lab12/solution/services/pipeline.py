@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+from services.events import get_logger
+
+logger = get_logger("Pipeline")
+
+class StageStats:
+    """
+    Throughput and queue depth figures for one pipeline stage.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.orders = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._queue_depth_total = 0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Orders per second while the stage was working (idle time excluded).
+        """
+        return self.orders / self.busy_seconds if self.busy_seconds else float("inf")
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._queue_depth_total / self.batches if self.batches else 0.0
+
+    def record(self, orders: int, seconds: float, queue_depth: int) -> None:
+        self.orders += orders
+        self.batches += 1
+        self.busy_seconds += seconds
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        self._queue_depth_total += queue_depth
+
+    def __str__(self) -> str:
+        return (f"{self.name}: {self.orders} orders in {self.busy_seconds:.3f}s busy "
+                f"({self.throughput:,.0f} orders/s), input queue depth "
+                f"avg {self.mean_queue_depth:.1f} / max {self.max_queue_depth}")
+
+
+class Pipeline:
+    """
+    Runs batches through a sequence of stages. Each stage has its own thread
+    and hands batches to the next one over a bounded queue, so the stages
+    work on different batches at the same time.
+
+    When a stage raises, on_error(stage name, batch, error) is called and the
+    batch is passed on, so on_error can mark its items failed for the later
+    stages to skip. Without on_error the batch is dropped. Either way the
+    remaining batches keep flowing.
+    """
+    def __init__(self, stages: List[Tuple[str, Callable[[list], None]]], queue_size: int = 4,
+                 on_error: Optional[Callable[[str, list, Exception], None]] = None):
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1. Got: {queue_size}")
+        self._stages = stages
+        self._queue_size = queue_size
+        self._on_error = on_error
+
+    def run(self, batches: Iterable[list]) -> List[StageStats]:
+        """
+        Push every batch through all stages and wait for the last one to finish.
+        Returns the statistics of each stage, in stage order.
+        """
+        queues = [queue.Queue(maxsize=self._queue_size) for _ in self._stages]
+        stats = [StageStats(name) for name, _ in self._stages]
+        threads = []
+        for index, (name, work) in enumerate(self._stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            thread = threading.Thread(target=self._run_stage, name=f"pipeline-{name}",
+                                      args=(work, queues[index], outbox, stats[index]), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        for batch in batches:
+            queues[0].put(batch)
+        queues[0].put(None)
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def _run_stage(self, work: Callable[[list], None], inbox: queue.Queue, outbox: queue.Queue,
+                   stats: StageStats) -> None:
+        while True:
+            queue_depth = inbox.qsize()
+            batch = inbox.get()
+            if batch is None:
+                # Pass the end-of-input marker on so the next stage stops too
+                if outbox is not None:
+                    outbox.put(None)
+                return
+
+            start = time.perf_counter()
+            try:
+                work(batch)
+            except Exception as error:
+                logger.exception("Stage '%s' failed on a batch of %d: %s", stats.name, len(batch), error)
+                if self._on_error is None:
+                    # Drop the batch rather than stall every stage behind it
+                    continue
+                self._on_error(stats.name, batch, error)
+            finally:
+                stats.record(len(batch), time.perf_counter() - start, queue_depth)
+            if outbox is not None:
+                outbox.put(batch)
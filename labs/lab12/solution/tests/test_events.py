@@ -0,0 +1,38 @@
+import io
+import logging
+import unittest
+from services.events import configure_logging, flush_logging, get_logger
+
+
+class TestEvents(unittest.TestCase):
+    def tearDown(self):
+        configure_logging(level=None)
+
+    def test_synchronous_by_default(self):
+        stream = io.StringIO()
+        configure_logging(stream=stream)
+        get_logger("InventoryService").info("Reserved %d item(s).", 2)
+        self.assertEqual(stream.getvalue(), "[InventoryService] Reserved 2 item(s).\n")
+
+    def test_asynchronous_sink_logs_arguments_as_they_were(self):
+        stream = io.StringIO()
+        configure_logging(stream=stream, asynchronous=True)
+        toppings = ["Olives"]
+        get_logger("InventoryService").info("Reserved toppings %s.", toppings)
+        toppings.append("Extra Cheese")
+        flush_logging()
+        self.assertEqual(stream.getvalue(), "[InventoryService] Reserved toppings ['Olives'].\n")
+
+    def test_asynchronous_sink_keeps_tracebacks(self):
+        stream = io.StringIO()
+        configure_logging(stream=stream, structured=True, asynchronous=True, level=logging.WARNING)
+        try:
+            raise ConnectionError("gateway down")
+        except ConnectionError:
+            get_logger("PaymentProcessor").exception("Payment failed.")
+        flush_logging()
+        self.assertIn("ConnectionError: gateway down", stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
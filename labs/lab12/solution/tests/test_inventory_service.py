@@ -0,0 +1,114 @@
+import threading
+import unittest
+from services.inventory import InventoryService
+
+
+class TestInventoryService(unittest.TestCase):
+    def setUp(self):
+        self.inventory = InventoryService(stock={"tomato_sauce": 3, "mozzarella": 3, "basil": 1,
+                                                 "cheese": 2, "olives": 0})
+
+    def test_check_and_reserve(self):
+        self.assertTrue(self.inventory.check_and_reserve("Margherita Pizza", ["Extra Cheese"]))
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 2)
+        self.assertEqual(self.inventory.get_stock("cheese"), 1)
+
+    def test_reserve_is_all_or_nothing(self):
+        self.assertFalse(self.inventory.check_and_reserve("Margherita Pizza", ["Extra Cheese", "Olives"]))
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 3)
+        self.assertEqual(self.inventory.get_stock("cheese"), 2)
+
+    def test_repeated_topping_cannot_oversell(self):
+        self.assertFalse(self.inventory.check_and_reserve("Margherita Pizza", ["Extra Cheese"] * 3))
+        self.assertEqual(self.inventory.get_stock("cheese"), 2)
+
+    def test_unknown_ingredient_is_out_of_stock(self):
+        self.assertFalse(self.inventory.reserve_ingredients({"tomato_sauce": 1, "anchovies": 1}))
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 3)
+
+    def test_release(self):
+        self.inventory.check_and_reserve("Neapolitan Pizza", ["Extra Cheese"])
+        self.inventory.release("Neapolitan Pizza", ["Extra Cheese"])
+        self.assertEqual(self.inventory.get_stock("basil"), 1)
+        self.assertEqual(self.inventory.get_stock("cheese"), 2)
+
+    def test_requirement_cache_is_bounded(self):
+        class SmallCacheInventory(InventoryService):
+            REQUIREMENT_CACHE_SIZE = 4
+
+        inventory = SmallCacheInventory(stock={"tomato_sauce": 100, "mozzarella": 100, "cheese": 100})
+        for count in range(20):
+            inventory.check_and_reserve("Margherita Pizza", ["Extra Cheese"] * (count % 3) + ["Olives"] * count)
+        self.assertEqual(inventory._cached_requirement.cache_info().currsize, 4)
+
+    def test_recipe_quantities_must_be_positive(self):
+        class BrokenRecipes(InventoryService):
+            PIZZA_INGREDIENTS = {"Free Pizza": {"tomato_sauce": -1}}
+
+        class WeightedRecipes(InventoryService):
+            PIZZA_INGREDIENTS = {"Double Margherita": {"tomato_sauce": 2, "mozzarella": 2}}
+
+        with self.assertRaises(ValueError):
+            BrokenRecipes()
+        inventory = WeightedRecipes(stock={"tomato_sauce": 3, "mozzarella": 3})
+        self.assertTrue(inventory.check_and_reserve("Double Margherita", []))
+        self.assertFalse(inventory.check_and_reserve("Double Margherita", []))
+        self.assertEqual(inventory.get_stock("tomato_sauce"), 1)
+        with self.assertRaises(ValueError):
+            inventory.reserve_ingredients({"tomato_sauce": 0})
+
+    def test_reserve_many(self):
+        results = self.inventory.reserve_many([("Margherita Pizza", ["Extra Cheese"]),
+                                               ("Hawaiian Pizza", []),
+                                               ("Neapolitan Pizza", ["Extra Cheese"])])
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 1)
+        self.assertEqual(self.inventory.get_stock("cheese"), 0)
+
+    def test_reserve_many_serves_orders_in_turn_when_stock_runs_out(self):
+        results = self.inventory.reserve_many([("Neapolitan Pizza", []),
+                                               ("Neapolitan Pizza", []),
+                                               ("Margherita Pizza", ["Extra Cheese", "Extra Cheese"])])
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 1)
+        self.assertEqual(self.inventory.get_stock("basil"), 0)
+        self.assertEqual(self.inventory.get_stock("cheese"), 0)
+
+    def test_concurrent_reservations_never_oversell(self):
+        stock = {"tomato_sauce": 500, "mozzarella": 800, "basil": 300, "cheese": 400, "olives": 200}
+        inventory = InventoryService(stock=stock)
+        orders = [("Margherita Pizza", ["Extra Cheese"]),
+                  ("Neapolitan Pizza", ["Olives"]),
+                  ("Neapolitan Pizza", ["Extra Cheese", "Olives"])]
+        ingredients = {"Margherita Pizza": ["tomato_sauce", "mozzarella"],
+                       "Neapolitan Pizza": ["tomato_sauce", "mozzarella", "basil"],
+                       "Extra Cheese": ["cheese"],
+                       "Olives": ["olives"]}
+        successes = []
+        start = threading.Barrier(16)
+
+        def worker(offset: int) -> None:
+            start.wait()
+            for n in range(200):
+                pizza_type, toppings = orders[(offset + n) % len(orders)]
+                if inventory.check_and_reserve(pizza_type, toppings):
+                    successes.append((pizza_type, toppings))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        used = dict.fromkeys(stock, 0)
+        for pizza_type, toppings in successes:
+            for item in [pizza_type] + toppings:
+                for ingredient in ingredients[item]:
+                    used[ingredient] += 1
+        for ingredient, quantity in stock.items():
+            self.assertGreaterEqual(inventory.get_stock(ingredient), 0)
+            self.assertEqual(inventory.get_stock(ingredient), quantity - used[ingredient])
+
+
+if __name__ == "__main__":
+    unittest.main()
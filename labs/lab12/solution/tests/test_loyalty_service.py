@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import unittest
+from pizza.pizza import MargheritaPizza
+from services.delivery import DeliveryService
+from services.loyalty import LoyaltyService
+from services.order_facade import OrderFacade
+from services.loyalty_store import LoyaltyStore
+
+
+class TestLoyaltyService(unittest.TestCase):
+    def setUp(self):
+        self.store = LoyaltyStore(cache_size=2)
+        self.store.add_points({"alice@example.com": 120, "bob@example.com": 45, "carol@example.com": 300})
+        self.loyalty = LoyaltyService(self.store)
+
+    def tearDown(self):
+        self.loyalty.close()
+        self.store.close()
+
+    def test_apply_discount(self):
+        self.assertAlmostEqual(self.loyalty.apply_discount("alice@example.com", 20.00), 19.00)
+        self.assertEqual(self.loyalty.apply_discount("bob@example.com", 20.00), 20.00)
+        self.assertEqual(self.loyalty.apply_discount(None, 20.00), 20.00)
+
+    def test_apply_discounts_matches_apply_discount(self):
+        emails = ["alice@example.com", "bob@example.com", None, "dave@example.com", "carol@example.com"]
+        amounts = [20.00, 20.00, 20.00, 20.00, 12.50]
+        expected = [self.loyalty.apply_discount(email, amount) for email, amount in zip(emails, amounts)]
+        self.assertEqual(self.loyalty.apply_discounts(emails, amounts), expected)
+
+    def test_accrued_points_are_written_asynchronously(self):
+        self.loyalty.accrue_points("bob@example.com", 30.00)
+        self.loyalty.accrue_points("bob@example.com", 25.99)
+        self.loyalty.accrue_points("dave@example.com", 12.00)
+        self.loyalty.flush()
+        self.assertEqual(self.loyalty.get_points("bob@example.com"), 100)
+        self.assertEqual(self.loyalty.get_points("dave@example.com"), 12)
+
+    def test_flush_raises_when_the_worker_is_gone(self):
+        class DyingStore(LoyaltyStore):
+            def add_points(self, points):
+                raise SystemExit
+
+        loyalty = LoyaltyService(DyingStore())
+        loyalty.accrue_points("bob@example.com", 30.00)
+        loyalty._worker.join(5)
+        # Queued behind the dead worker, as if it died while this was waiting
+        loyalty._accruals.put(("bob@example.com", 1))
+        with self.assertRaises(RuntimeError):
+            loyalty.flush(timeout=5)
+
+    def test_flush_times_out(self):
+        release = threading.Event()
+
+        class SlowStore(LoyaltyStore):
+            def add_points(self, points):
+                release.wait(5)
+                super().add_points(points)
+
+        store = SlowStore()
+        loyalty = LoyaltyService(store)
+        loyalty.accrue_points("bob@example.com", 30.00)
+        with self.assertRaises(TimeoutError):
+            loyalty.flush(timeout=0.05)
+        release.set()
+        loyalty.close()
+        self.assertEqual(store.get_points("bob@example.com"), 30)
+        store.close()
+
+    def test_failed_write_keeps_the_worker_running(self):
+        class FlakyStore(LoyaltyStore):
+            calls = 0
+
+            def add_points(self, points):
+                FlakyStore.calls += 1
+                if FlakyStore.calls == 1:
+                    raise OSError("disk full")
+                super().add_points(points)
+
+        store = FlakyStore()
+        loyalty = LoyaltyService(store)
+        loyalty.accrue_points("bob@example.com", 30.00)
+        loyalty.flush(timeout=5)
+        loyalty.accrue_points("bob@example.com", 12.00)
+        loyalty.flush(timeout=5)
+        self.assertEqual(store.get_points("bob@example.com"), 12)
+        loyalty.close()
+        store.close()
+
+    def test_facade_close_writes_queued_points(self):
+        facade = OrderFacade(loyalty=self.loyalty, delivery=DeliveryService(delay=0))
+        with facade:
+            self.assertTrue(facade.place_order(MargheritaPizza(), [], "1 Main St", "bob@example.com"))
+        self.assertIsNone(self.loyalty._worker)
+        self.assertEqual(self.loyalty.get_points("bob@example.com"), 45 + 8)
+
+    def test_cache_stays_consistent_through_eviction(self):
+        self.store.get_many(["alice@example.com", "bob@example.com", "carol@example.com"])
+        self.store.add_points({"alice@example.com": 1, "carol@example.com": 1})
+        self.assertEqual(self.store.get_many(["alice@example.com", "carol@example.com"]),
+                         {"alice@example.com": 121, "carol@example.com": 301})
+
+    def test_points_persist(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "loyalty.db")
+            store = LoyaltyStore(path)
+            store.add_points({"erin@example.com": 150})
+            store.close()
+            store = LoyaltyStore(path)
+            self.assertEqual(store.get_points("erin@example.com"), 150)
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
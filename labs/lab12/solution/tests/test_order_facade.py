@@ -0,0 +1,124 @@
+import asyncio
+import unittest
+from pizza.pizza import MargheritaPizza, NeapolitanPizza
+from pizza.toppings import Cheese, Olives
+from services.delivery import DeliveryService
+from services.inventory import InventoryService
+from services.order_facade import OrderFacade
+from services.payment import PaymentProcessor
+
+
+class TestOrderFacade(unittest.TestCase):
+    def setUp(self):
+        self.inventory = InventoryService(stock={"tomato_sauce": 4, "mozzarella": 4, "basil": 1,
+                                                 "cheese": 100, "olives": 4})
+        self.facade = OrderFacade(inventory=self.inventory, delivery=DeliveryService(delay=0))
+
+    def expensive_pizza(self):
+        pizza = MargheritaPizza()
+        for _ in range(80):
+            pizza = Cheese(pizza)
+        return pizza
+
+    def test_place_order_releases_inventory_when_payment_fails(self):
+        self.assertFalse(self.facade.place_order(self.expensive_pizza(), ["Extra Cheese"] * 80, "1 Main St"))
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 4)
+        self.assertEqual(self.inventory.get_stock("cheese"), 100)
+
+    def test_place_orders_async(self):
+        orders = [(Olives(MargheritaPizza()), ["Olives"], f"{n} Main St") for n in range(5)]
+        results = asyncio.run(self.facade.place_orders_async(orders, max_concurrency=2))
+        self.assertEqual(results, [True, True, True, True, False])
+
+    def test_place_orders_async_limits_concurrency(self):
+        class TrackingDelivery(DeliveryService):
+            def __init__(self):
+                super().__init__(delay=0.01)
+                self.in_flight = self.most_in_flight = 0
+
+            async def schedule_delivery_async(self, address):
+                self.in_flight += 1
+                self.most_in_flight = max(self.most_in_flight, self.in_flight)
+                try:
+                    return await super().schedule_delivery_async(address)
+                finally:
+                    self.in_flight -= 1
+
+        delivery = TrackingDelivery()
+        facade = OrderFacade(inventory=InventoryService(stock={"tomato_sauce": 10, "mozzarella": 10}),
+                             delivery=delivery)
+        orders = [(MargheritaPizza(), [], f"{n} Main St") for n in range(8)]
+        results = asyncio.run(facade.place_orders_async(orders, max_concurrency=3))
+        self.assertEqual(results, [True] * 8)
+        self.assertEqual(delivery.most_in_flight, 3)
+        with self.assertRaises(ValueError):
+            asyncio.run(facade.place_orders_async(orders, max_concurrency=0))
+
+    def test_place_orders_async_isolates_failed_orders(self):
+        class FlakyDelivery(DeliveryService):
+            async def schedule_delivery_async(self, address):
+                if address == "nowhere":
+                    raise ConnectionError("delivery partner unreachable")
+                return await super().schedule_delivery_async(address)
+
+        facade = OrderFacade(inventory=self.inventory, delivery=FlakyDelivery(delay=0))
+        orders = [(MargheritaPizza(), [], "1 Main St"),
+                  (MargheritaPizza(), [], "nowhere"),
+                  (self.expensive_pizza(), ["Extra Cheese"] * 80, "2 Main St"),
+                  (MargheritaPizza(), [], "3 Main St")]
+        results = asyncio.run(facade.place_orders_async(orders))
+        self.assertEqual(results, [True, False, False, True])
+
+    def test_place_orders_async_releases_inventory_when_checkout_fails(self):
+        orders = [(self.expensive_pizza(), ["Extra Cheese"] * 80, "1 Main St"),
+                  (Olives(MargheritaPizza()), ["Olives"], "2 Main St")]
+        results = asyncio.run(self.facade.place_orders_async(orders))
+        self.assertEqual(results, [False, True])
+        # Only the successful order kept its ingredients
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 3)
+        self.assertEqual(self.inventory.get_stock("mozzarella"), 3)
+        self.assertEqual(self.inventory.get_stock("cheese"), 100)
+        self.assertEqual(self.inventory.get_stock("olives"), 3)
+
+    def test_place_orders_pipeline(self):
+        orders = [(Olives(MargheritaPizza()), ["Olives"], "1 Main St", "alice@example.com"),
+                  (self.expensive_pizza(), ["Extra Cheese"] * 80, "2 Main St"),
+                  (NeapolitanPizza(), [], "3 Main St"),
+                  (NeapolitanPizza(), [], "4 Main St"),
+                  (Olives(MargheritaPizza()), ["Olives"], "5 Main St")]
+        results = self.facade.place_orders(orders, batch_size=2)
+        self.assertEqual(results, [True, False, True, False, True])
+        # The declined order's ingredients went back into stock
+        self.assertEqual(self.inventory.get_stock("tomato_sauce"), 1)
+        self.assertEqual(self.inventory.get_stock("cheese"), 100)
+        self.assertEqual([stats.name for stats in self.facade.pipeline_stats],
+                         ["inventory", "loyalty", "payment", "delivery"])
+        self.assertEqual(self.facade.pipeline_stats[0].orders, 5)
+
+    def test_place_orders_pipeline_fails_a_batch_whose_stage_raises(self):
+        class FlakyPayment(PaymentProcessor):
+            def process_payment(self, amount):
+                if amount == 10.00:
+                    raise ConnectionError("payment gateway down")
+                return super().process_payment(amount)
+
+        inventory = InventoryService(stock={"tomato_sauce": 10, "mozzarella": 10, "basil": 2, "olives": 4})
+        facade = OrderFacade(inventory=inventory, payment=FlakyPayment(), delivery=DeliveryService(delay=0))
+        orders = [(MargheritaPizza(), [], "1 Main St"),
+                  (Olives(MargheritaPizza()), ["Olives"], "2 Main St"),
+                  # This batch's payment stage raises part-way through
+                  (MargheritaPizza(), [], "3 Main St"),
+                  (NeapolitanPizza(), [], "4 Main St"),
+                  (Olives(MargheritaPizza()), ["Olives"], "5 Main St")]
+        results = facade.place_orders(orders, batch_size=2)
+        self.assertEqual(results, [True, True, False, False, True])
+        # Only the delivered orders kept their ingredients
+        self.assertEqual(inventory.get_stock("tomato_sauce"), 7)
+        self.assertEqual(inventory.get_stock("mozzarella"), 7)
+        self.assertEqual(inventory.get_stock("basil"), 2)
+        self.assertEqual(inventory.get_stock("olives"), 2)
+        self.assertEqual(facade.pipeline_stats[-1].orders, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
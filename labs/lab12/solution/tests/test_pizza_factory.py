@@ -0,0 +1,51 @@
+import unittest
+from pizza.factory import PizzaFactory
+from pizza.pizza import MargheritaPizza, NeapolitanPizza, Pizza
+from pizza.toppings import Cheese, Olives
+
+
+class TestPizzaFactory(unittest.TestCase):
+    def setUp(self):
+        self.factory = PizzaFactory()
+
+    def test_identical_configurations_are_shared(self):
+        first = self.factory.get_pizza(MargheritaPizza, Olives, Cheese)
+        second = self.factory.get_pizza(MargheritaPizza, Olives, Cheese)
+        self.assertIs(first, second)
+        self.assertEqual(first.get_cost(), Cheese(Olives(MargheritaPizza())).get_cost())
+        self.assertEqual(self.factory.get_total_pizzas(), 1)
+
+    def test_topping_order_and_base_are_part_of_the_key(self):
+        self.factory.get_pizza(MargheritaPizza, Olives, Cheese)
+        self.factory.get_pizza(MargheritaPizza, Cheese, Olives)
+        self.factory.get_pizza(NeapolitanPizza, Olives, Cheese)
+        self.assertEqual(self.factory.get_total_pizzas(), 3)
+
+    def test_intern_existing_chain(self):
+        shared = self.factory.get_pizza(NeapolitanPizza, Cheese, Cheese)
+        self.assertIs(self.factory.intern(Cheese(Cheese(NeapolitanPizza()))), shared)
+
+    def test_shared_pizzas_are_read_only(self):
+        shared = self.factory.get_pizza(MargheritaPizza, Olives)
+        with self.assertRaises(AttributeError):
+            shared._cost = 0.0
+        with self.assertRaises(AttributeError):
+            shared.discount = 0.5
+        with self.assertRaises(AttributeError):
+            del shared._toppings
+        self.assertEqual(self.factory.get_pizza(MargheritaPizza, Olives).get_cost(), shared.get_cost())
+
+    def test_pizza_without_a_name(self):
+        class PlainPizza(Pizza):
+            def get_description(self):
+                return "Plain Pizza"
+
+            def get_cost(self):
+                return 5.0
+
+        self.assertEqual(PlainPizza().get_base_name(), "")
+        self.assertEqual(self.factory.intern(Cheese(PlainPizza())).get_cost(), 6.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
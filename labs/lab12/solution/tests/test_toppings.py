@@ -0,0 +1,37 @@
+import unittest
+from pizza.pizza import MargheritaPizza, NeapolitanPizza
+from pizza.toppings import Cheese, Olives, Pepperoni, Mushrooms, Bacon
+
+
+class TestToppings(unittest.TestCase):
+    def setUp(self):
+        self.pizza = Bacon(Pepperoni(Mushrooms(Cheese(Olives(NeapolitanPizza())))))
+
+    def test_compile_matches_decorator_chain(self):
+        compiled = self.pizza.compile()
+        self.assertEqual(compiled.get_description(), self.pizza.get_description())
+        self.assertEqual(compiled.get_cost(), self.pizza.get_cost())
+
+    def test_structured_name_and_toppings(self):
+        self.assertEqual(self.pizza.get_base_name(), "Neapolitan Pizza")
+        self.assertEqual(self.pizza.get_toppings(),
+                         ("Olives", "Extra Cheese", "Mushrooms", "Pepperoni", "Bacon"))
+
+    def test_compile_is_memoized(self):
+        self.assertIs(self.pizza.compile(), self.pizza.compile())
+
+    def test_decorating_a_compiled_pizza(self):
+        pizza = Cheese(Olives(MargheritaPizza()).compile())
+        self.assertEqual(pizza.get_toppings(), ("Olives", "Extra Cheese"))
+        self.assertEqual(pizza.compile().get_description(), pizza.get_description())
+
+    def test_deep_chain(self):
+        pizza = MargheritaPizza()
+        for _ in range(5_000):
+            pizza = Cheese(pizza)
+        self.assertEqual(pizza.compile().get_cost(), 8.00 + 5_000 * 1.25)
+        self.assertEqual(len(pizza.get_toppings()), 5_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,20 @@
+import itertools
+import threading
+
 class Account:
     """
     A simple bank account with deposit, withdraw, and transfer functionality.
+    Each account has its own lock, so accounts can be used from several threads.
     """
+    _next_id = itertools.count()
+
     def __init__(self, owner: str, balance: float = 0.0):
         self.owner = owner
         self.balance = balance
+        # Unique and increasing: gives every pair of accounts a fixed locking order
+        self.account_id = next(Account._next_id)
+        # Reentrant, so a MacroCommand can hold it across the commands it runs
+        self.lock = threading.RLock()
 
     def deposit(self, amount: float) -> None:
         """
@@ -12,7 +22,8 @@ class Account:
         """
         if amount <= 0:
             raise ValueError(f"Deposit amount must be positive. Tried to deposit: {amount}")
-        self.balance += amount
+        with self.lock:
+            self.balance += amount
         print(f"[{self.owner}] Deposit: ${amount:.2f} (New balance: ${self.balance:.2f})")
 
     def withdraw(self, amount: float) -> None:
@@ -21,23 +32,30 @@ class Account:
         """
         if amount <= 0:
             raise ValueError(f"Withdrawal amount must be positive. Tried to withdraw: {amount}")
-        if amount > self.balance:
-            raise ValueError(f"Insufficient funds for withdrawal. "
-                             f"Requested: ${amount:.2f}, Available: ${self.balance:.2f}")
-        self.balance -= amount
+        with self.lock:
+            if amount > self.balance:
+                raise ValueError(f"Insufficient funds for withdrawal. "
+                                 f"Requested: ${amount:.2f}, Available: ${self.balance:.2f}")
+            self.balance -= amount
         print(f"[{self.owner}] Withdraw: ${amount:.2f} (New balance: ${self.balance:.2f})")
 
     def transfer(self, target_account: "Account", amount: float) -> None:
         """
         Transfer funds from this account to another account.
+        Both accounts are locked in account_id order, so two opposite transfers
+        running at the same time cannot deadlock.
         """
         if amount <= 0:
             raise ValueError(f"Transfer amount must be positive. Tried to transfer: {amount}")
-        if amount > self.balance:
-            raise ValueError(f"Insufficient funds for transfer. "
-                             f"Requested: ${amount:.2f}, Available: ${self.balance:.2f}")
-        self.balance -= amount
-        target_account.balance += amount
+        if target_account is self:
+            raise ValueError("Cannot transfer to the same account.")
+        first, second = sorted((self, target_account), key=lambda account: account.account_id)
+        with first.lock, second.lock:
+            if amount > self.balance:
+                raise ValueError(f"Insufficient funds for transfer. "
+                                 f"Requested: ${amount:.2f}, Available: ${self.balance:.2f}")
+            self.balance -= amount
+            target_account.balance += amount
         print(f"[{self.owner}] Transfer: ${amount:.2f} to [{target_account.owner}] "
               f"(Your new balance: ${self.balance:.2f}; {target_account.owner} new balance: "
               f"${target_account.balance:.2f})")
@@ -0,0 +1,85 @@
+"""
+Runs the same batch of deposits, withdrawals and transfers through the
+approval router one command at a time, and through CommandBatchExecutor
+with a growing number of worker threads, and reports commands per second.
+The executor rows also show how many waves the batch was scheduled in and
+how many commands each wave ran side by side on average.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.batch_executor [commands] [accounts]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand
+from executor import CommandBatchExecutor
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+def make_commands(count: int, accounts: list) -> list:
+    rng = random.Random(11)
+    commands = []
+    for _ in range(count):
+        kind = rng.random()
+        amount = float(rng.randint(1, 3_000))
+        source = rng.choice(accounts)
+        if kind < 0.3:
+            commands.append(DepositCommand(source, amount))
+        elif kind < 0.6:
+            commands.append(WithdrawCommand(source, amount))
+        else:
+            target = rng.choice(accounts)
+            while target is source:
+                target = rng.choice(accounts)
+            commands.append(TransferCommand(source, target, amount))
+    return commands
+
+
+def make_accounts(count: int) -> list:
+    return [Account(f"Customer {i}", balance=1_000_000.0) for i in range(count)]
+
+
+def bench_sequential(router: ApprovalRouter, commands: list) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        try:
+            router.handle(command)
+        except ValueError:
+            pass
+    return len(commands) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    account_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    router = ApprovalRouter(build_approval_chain())
+
+    results = []
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        accounts = make_accounts(account_count)
+        results.append(("sequential", bench_sequential(router, make_commands(count, accounts)), ""))
+        for workers in (1, 2, 4, 8):
+            accounts = make_accounts(account_count)
+            total = sum(account.balance for account in accounts)
+            commands = make_commands(count, accounts)
+            deposits = sum(c.amount for c in commands if isinstance(c, DepositCommand))
+            result = CommandBatchExecutor(handler=router, max_workers=workers).execute(commands)
+            failed = {id(command) for command, _ in result.failed}
+            withdrawn = sum(c.amount for c in commands
+                            if isinstance(c, WithdrawCommand) and id(c) not in failed)
+            assert sum(account.balance for account in accounts) == total + deposits - withdrawn
+            results.append((f"executor, {workers} workers", result.commands_per_second,
+                            f"{result.waves:,} waves, {result.commands_per_wave:,.0f} commands/wave"))
+
+    print(f"{count:,} commands over {account_count:,} accounts")
+    for label, rate, schedule in results:
+        print(f"{label:<22} {rate:>12,.0f} commands/s  {schedule}".rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the memory of a queue of commands with and without __slots__, and
+how fast queued commands execute, undo, and run as a MacroCommand that
+rolls back on its last command.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.command_queue [commands]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand, MacroCommand
+
+
+# Subclasses without __slots__ get an attribute dict per instance, as the commands had before
+class DictDepositCommand(DepositCommand):
+    pass
+
+
+class DictWithdrawCommand(WithdrawCommand):
+    pass
+
+
+class DictTransferCommand(TransferCommand):
+    pass
+
+
+def make_queue(count: int, source: Account, target: Account, deposit, withdraw, transfer) -> list:
+    queue = []
+    for i in range(count):
+        kind = i % 3
+        amount = float(i % 100 + 1)
+        if kind == 0:
+            queue.append(deposit(source, amount))
+        elif kind == 1:
+            queue.append(withdraw(source, amount))
+        else:
+            queue.append(transfer(source, target, amount))
+    return queue
+
+
+def measure_queue(count: int, source: Account, target: Account, *classes) -> float:
+    tracemalloc.start()
+    queue = make_queue(count, source, target, *classes)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del queue
+    return size
+
+
+def rate(count: int, run) -> float:
+    start = time.perf_counter()
+    run()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = Account("Alice", 1e12)
+    target = Account("Bob")
+
+    dict_size = measure_queue(count, source, target,
+                              DictDepositCommand, DictWithdrawCommand, DictTransferCommand)
+    slots_size = measure_queue(count, source, target, DepositCommand, WithdrawCommand, TransferCommand)
+
+    queue = make_queue(count, source, target, DepositCommand, WithdrawCommand, TransferCommand)
+    failing = MacroCommand(queue + [WithdrawCommand(target, 1e15)])
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        execute_rate = rate(count, lambda: [command.execute() for command in queue])
+        undo_rate = rate(count, lambda: [command.undo() for command in reversed(queue)])
+
+        def run_failing():
+            try:
+                failing.execute()
+            except ValueError:
+                pass
+        rollback_rate = rate(count, run_failing)
+    assert (source.balance, target.balance) == (1e12, 0.0)
+
+    print(f"{count:,} queued commands")
+    print(f"memory without __slots__  {dict_size / 1e6:>10,.1f} MB ({dict_size / count:,.0f} bytes/command)")
+    print(f"memory with __slots__     {slots_size / 1e6:>10,.1f} MB ({slots_size / count:,.0f} bytes/command)")
+    print(f"execute                   {execute_rate:>10,.0f} commands/s")
+    print(f"undo                      {undo_rate:>10,.0f} commands/s")
+    print(f"MacroCommand + rollback   {rollback_rate:>10,.0f} commands/s (execute and undo each)")
+
+
+if __name__ == "__main__":
+    main()
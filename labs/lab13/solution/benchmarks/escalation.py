@@ -0,0 +1,78 @@
+"""
+Feeds a mix of teller-level and escalated commands, where every escalated
+approval waits on a slow review, through the synchronous ApprovalRouter and
+through AsyncApprovalRouter. Reports when the last teller-level command
+finished (head-of-line blocking shows up here) and when the whole stream did.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.escalation [commands] [review_ms]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from account import Account
+from commands import DepositCommand, WithdrawCommand
+from escalation import AsyncApprovalRouter
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+def make_commands(count: int, account: Account) -> list:
+    rng = random.Random(4)
+    commands = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            commands.append(DepositCommand(account, float(rng.randint(1, 500))))
+        else:
+            commands.append(WithdrawCommand(account, float(rng.randint(501, 50_000))))
+    return commands
+
+
+def bench_sync(router: ApprovalRouter, commands: list, review) -> tuple:
+    start = time.perf_counter()
+    for command in commands:
+        if router.route(command).approval_limit > 500:
+            review(command)
+        router.handle(command)
+        if isinstance(command, DepositCommand):
+            tellers_done = time.perf_counter()
+    return tellers_done - start, time.perf_counter() - start
+
+
+def bench_async(router: ApprovalRouter, commands: list, review, workers: int) -> tuple:
+    start = time.perf_counter()
+    with AsyncApprovalRouter(router, workers_per_tier=workers, review=review) as desk:
+        for command in commands:
+            future = desk.submit(command)
+            if isinstance(command, DepositCommand):
+                future.result()
+                tellers_done = time.perf_counter()
+    return tellers_done - start, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    review_seconds = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1e3
+    router = ApprovalRouter(build_approval_chain())
+
+    def review(command):
+        time.sleep(review_seconds)
+
+    results = []
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        results.append(("ApprovalRouter (inline)",
+                        bench_sync(router, make_commands(count, Account("Alice", 1e12)), review)))
+        for workers in (1, 4, 16):
+            results.append((f"AsyncApprovalRouter, {workers} workers/tier",
+                            bench_async(router, make_commands(count, Account("Alice", 1e12)), review, workers)))
+
+    print(f"{count:,} commands, 20% escalated, {review_seconds * 1e3:.1f} ms review per escalation")
+    for label, (tellers_done, elapsed) in results:
+        print(f"{label:<36} teller commands done {tellers_done:>7.3f} s   all done {elapsed:>7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Writes a command journal, then measures how long recovery takes from the
+latest snapshot plus the journal tail and from a full replay of the journal.
+Also compares journal write throughput with and without group commit.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.journal_recovery [commands] [snapshot_every]
+"""
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+from commands import DepositCommand, WithdrawCommand, TransferCommand
+from journal import CommandJournal
+
+
+def write_journal(path: str, count: int, accounts: int = 1_000, **options) -> float:
+    rng = random.Random(5)
+    with CommandJournal(path, **options) as journal:
+        customers = [journal.open_account(f"Customer {i}", 1e12) for i in range(accounts)]
+        start = time.perf_counter()
+        for _ in range(count):
+            kind = rng.random()
+            source = rng.choice(customers)
+            amount = float(rng.randint(1, 1_000))
+            if kind < 0.3:
+                journal.execute(DepositCommand(source, amount))
+            elif kind < 0.6:
+                journal.execute(WithdrawCommand(source, amount))
+            else:
+                target = rng.choice(customers)
+                if target is not source:
+                    journal.execute(TransferCommand(source, target, amount))
+        journal.flush()
+        return count / (time.perf_counter() - start)
+
+
+def time_recovery(path: str) -> float:
+    start = time.perf_counter()
+    CommandJournal(path).close()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    snapshot_every = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    with tempfile.TemporaryDirectory() as directory, \
+            open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        small = min(count, 20_000)
+        group_rates = [(size, write_journal(os.path.join(directory, f"group{size}.ndjson"), small,
+                                            group_size=size))
+                       for size in (1, 100, 1_000)]
+
+        path = os.path.join(directory, "commands.ndjson")
+        write_rate = write_journal(path, count, snapshot_every=snapshot_every)
+        journal_size = os.path.getsize(path)
+        from_snapshot = time_recovery(path)
+        os.remove(path + ".snapshot")
+        full_replay = time_recovery(path)
+
+    print(f"journal write, {small:,} commands, fsync per group")
+    for size, rate in group_rates:
+        print(f"  group_size={size:<6,} {rate:>12,.0f} commands/s")
+    print(f"{count:,} commands, {journal_size / 1e6:,.1f} MB journal, written at {write_rate:,.0f} commands/s")
+    print(f"recovery from snapshot (every {snapshot_every:,}) + tail  {from_snapshot:>8.3f} s")
+    print(f"recovery by full replay                          {full_replay:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
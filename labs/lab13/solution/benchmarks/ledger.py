@@ -0,0 +1,75 @@
+"""
+Compares one Account object per account, driven command by command, with
+the columnar Ledger and its vectorized apply_commands(): memory for the
+accounts and deposits/withdrawals applied per second.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.ledger [accounts] [commands]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from account import Account
+from commands import DepositCommand, WithdrawCommand
+from ledger import Ledger
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def open_ledger(count: int) -> Ledger:
+    ledger = Ledger(capacity=count)
+    ledger.open_accounts(count, balance=100.0)
+    return ledger
+
+
+def bench_accounts(accounts: list, account_ids: np.ndarray, amounts: np.ndarray) -> float:
+    commands = [DepositCommand(accounts[i], a) if a > 0 else WithdrawCommand(accounts[i], -a)
+                for i, a in zip(account_ids.tolist(), amounts.tolist())]
+    start = time.perf_counter()
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        for command in commands:
+            try:
+                command.execute()
+            except ValueError:
+                pass
+    return len(commands) / (time.perf_counter() - start)
+
+
+def bench_ledger(ledger: Ledger, account_ids: np.ndarray, amounts: np.ndarray) -> float:
+    start = time.perf_counter()
+    ledger.apply_commands(account_ids, amounts)
+    return len(amounts) / (time.perf_counter() - start)
+
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    command_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rng = np.random.default_rng(9)
+    account_ids = rng.integers(0, account_count, command_count)
+    amounts = rng.integers(1, 200, command_count).astype(np.float64)
+    amounts[rng.random(command_count) < 0.5] *= -1
+
+    accounts, objects_size = measure_memory(
+        lambda: [Account(f"Account {i}", 100.0) for i in range(account_count)])
+    ledger, ledger_size = measure_memory(lambda: open_ledger(account_count))
+    object_rate = bench_accounts(accounts, account_ids, amounts)
+    ledger_rate = bench_ledger(ledger, account_ids, amounts)
+
+    print(f"{account_count:,} accounts, {command_count:,} deposits/withdrawals")
+    print(f"Account objects   {objects_size / 1e6:>8,.1f} MB  {object_rate:>14,.0f} commands/s")
+    print(f"Ledger            {ledger_size / 1e6:>8,.1f} MB  {ledger_rate:>14,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Routes the same stream of commands through the handler chain and through
+the compiled ApprovalRouter, and reports commands per second for each.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.routing [commands]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+def make_commands(count: int, source: Account, target: Account) -> list:
+    rng = random.Random(7)
+    commands = []
+    for _ in range(count):
+        kind = rng.random()
+        amount = round(rng.choice((rng.uniform(1, 500), rng.uniform(500, 2_500),
+                                   rng.uniform(2_500, 10_000), rng.uniform(10_000, 50_000))), 2)
+        if kind < 0.1:
+            commands.append(BalanceInquiryCommand(source))
+        elif kind < 0.3:
+            commands.append(DepositCommand(source, amount))
+        elif kind < 0.7:
+            commands.append(WithdrawCommand(source, amount))
+        else:
+            commands.append(TransferCommand(source, target, amount))
+    return commands
+
+
+def bench(handler, commands: list) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        handler.handle(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def bench_route_only(router: ApprovalRouter, commands: list) -> float:
+    start = time.perf_counter()
+    route = router.route
+    for command in commands:
+        route(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = Account("Alice", balance=1e15)
+    target = Account("Bob")
+    commands = make_commands(count, source, target)
+    chain = build_approval_chain()
+    router = ApprovalRouter(chain)
+
+    # Handler and account output goes to the null device; it is part of both paths
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        chain_rate = bench(chain, commands)
+        router_rate = bench(router, commands)
+    route_rate = bench_route_only(router, commands)
+
+    print(f"{count:,} commands")
+    print(f"handler chain           {chain_rate:>12,.0f} commands/s")
+    print(f"ApprovalRouter          {router_rate:>12,.0f} commands/s")
+    print(f"ApprovalRouter.route()  {route_rate:>12,.0f} commands/s (lookup only, no execution)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Shows that routing costs the same after approval limits are reloaded: routes
+the same commands on a freshly built router, after many reloads, and while a
+ThresholdWatcher keeps reloading limits from a file that changes constantly.
+
+Run from the lab13/solution folder:
+    python -m benchmarks.threshold_reload [commands] [reloads]
+"""
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from account import Account
+from benchmarks.routing import make_commands
+from main import build_approval_chain
+from router import ApprovalRouter
+from thresholds import ThresholdWatcher
+
+
+class CountingWatcher(ThresholdWatcher):
+    reloads = 0
+
+    def check(self) -> bool:
+        reloaded = super().check()
+        self.reloads += reloaded
+        return reloaded
+
+
+def route_rate(router: ApprovalRouter, commands: list) -> float:
+    route = router.route
+    start = time.perf_counter()
+    for command in commands:
+        route(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def limits_for(step: int) -> dict:
+    return {"Teller": 500.0 + step % 100, "Assistant Manager": 2_500.0, "Manager": 10_000.0}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    reloads = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    commands = make_commands(count, Account("Alice", balance=1e15), Account("Bob"))
+    router = ApprovalRouter(build_approval_chain())
+
+    fresh = route_rate(router, commands)
+    start = time.perf_counter()
+    for step in range(reloads):
+        router.reload(limits_for(step))
+    reload_cost = (time.perf_counter() - start) / reloads
+    after_reloads = route_rate(router, commands)
+
+    with tempfile.TemporaryDirectory() as directory, \
+            open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        path = os.path.join(directory, "approval_limits.json")
+        done = threading.Event()
+
+        def rewrite():
+            step = 0
+            while not done.is_set():
+                step += 1
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(limits_for(step), f)
+                os.utime(path, ns=(step, step))
+                time.sleep(0.001)
+
+        writer = threading.Thread(target=rewrite)
+        writer.start()
+        with CountingWatcher(path, router, interval=0.001) as watcher:
+            during_reloads = route_rate(router, commands)
+        done.set()
+        writer.join()
+
+    print(f"{count:,} commands through ApprovalRouter.route()")
+    print(f"fresh router               {fresh:>12,.0f} commands/s")
+    print(f"after reloads              {after_reloads:>12,.0f} commands/s"
+          f"  ({reloads:,} reloads, {reload_cost * 1e6:.1f} us each)")
+    print(f"while the watcher reloads  {during_reloads:>12,.0f} commands/s"
+          f"  ({watcher.reloads:,} reloads during the run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import ExitStack
+from typing import List
 from account import Account
 
 class Command(ABC):
     """
-    The 'Command' interface. Any banking operation will implement execute().
+    The 'Command' interface. Any banking operation will implement execute(),
+    and undo() if it can be reversed.
+
+    Commands declare __slots__, so a queue of millions of them stores only
+    their fields rather than an attribute dict per command.
     """
+    __slots__ = ()
+
     @abstractmethod
     def execute(self) -> None:
         pass
 
+    def undo(self) -> None:
+        """
+        Reverse a previous execute().
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be undone.")
+
     @abstractmethod
     def __str__(self) -> str:
         """
@@ -22,6 +35,8 @@ class DepositCommand(Command):
     """
     Concrete Command to perform a deposit.
     """
+    __slots__ = ("account", "amount")
+
     def __init__(self, account: Account, amount: float):
         self.account = account
         self.amount = amount
@@ -29,6 +44,9 @@ class DepositCommand(Command):
     def execute(self) -> None:
         self.account.deposit(self.amount)
 
+    def undo(self) -> None:
+        self.account.withdraw(self.amount)
+
     def __str__(self) -> str:
         return f"DepositCommand(account={self.account.owner}, amount=${self.amount:.2f})"
 
@@ -37,6 +55,8 @@ class WithdrawCommand(Command):
     """
     Concrete Command to perform a withdrawal.
     """
+    __slots__ = ("account", "amount")
+
     def __init__(self, account: Account, amount: float):
         self.account = account
         self.amount = amount
@@ -44,6 +64,9 @@ class WithdrawCommand(Command):
     def execute(self) -> None:
         self.account.withdraw(self.amount)
 
+    def undo(self) -> None:
+        self.account.deposit(self.amount)
+
     def __str__(self) -> str:
         return f"WithdrawCommand(account={self.account.owner}, amount=${self.amount:.2f})"
 
@@ -52,6 +75,8 @@ class TransferCommand(Command):
     """
     Concrete Command to perform a transfer between two accounts.
     """
+    __slots__ = ("source_account", "target_account", "amount")
+
     def __init__(self, source_account: Account, target_account: Account, amount: float):
         self.source_account = source_account
         self.target_account = target_account
@@ -60,6 +85,9 @@ class TransferCommand(Command):
     def execute(self) -> None:
         self.source_account.transfer(self.target_account, self.amount)
 
+    def undo(self) -> None:
+        self.target_account.transfer(self.source_account, self.amount)
+
     def __str__(self) -> str:
         return (f"TransferCommand(from={self.source_account.owner}, "
                 f"to={self.target_account.owner}, amount=${self.amount:.2f})")
@@ -70,11 +98,96 @@ class BalanceInquiryCommand(Command):
     Concrete Command to request and display the current account balance.
     Always handled at the Teller level (no approval thresholds).
     """
+    __slots__ = ("account",)
+
     def __init__(self, account: Account):
         self.account = account
 
     def execute(self) -> None:
         print(f"[{self.account.owner}] Current balance: ${self.account.balance:.2f}")
 
+    def undo(self) -> None:
+        # An inquiry changes nothing, so there is nothing to reverse
+        pass
+
     def __str__(self) -> str:
         return f"BalanceInquiryCommand(account={self.account.owner})"
+
+
+class MacroCommand(Command):
+    """
+    Composite Command that applies a batch of commands as one unit: if any
+    command fails, the ones already executed are undone in reverse order and
+    the error is raised again, so either all of the batch applies or none of it.
+
+    Every account the batch touches is locked, in account_id order as
+    Account.transfer() does, for the whole batch, so other threads never see
+    it half applied or rolled back.
+
+    For approval, a batch counts as the total it moves out of accounts (see
+    amount), so it needs the same sign-off as a single withdrawal of that size.
+    """
+    __slots__ = ("commands",)
+
+    def __init__(self, commands: List[Command]):
+        self.commands = list(commands)
+
+    @property
+    def amount(self) -> float:
+        """
+        Total withdrawn and transferred by the batch, including nested batches.
+        """
+        return sum(command.amount for command in self.commands
+                   if isinstance(command, (WithdrawCommand, TransferCommand, MacroCommand)))
+
+    def execute(self) -> None:
+        with self._locked():
+            executed = 0
+            try:
+                for command in self.commands:
+                    command.execute()
+                    executed += 1
+            except Exception:
+                # An undo failure is raised in place of the original error, which stays its __context__
+                _undo_all(self.commands[:executed])
+                raise
+
+    def undo(self) -> None:
+        with self._locked():
+            _undo_all(self.commands)
+
+    def _locked(self) -> ExitStack:
+        stack = ExitStack()
+        # Account locks are reentrant, so the steps can take them again
+        for account in sorted({id(account): account for account in accounts_of(self)}.values(),
+                              key=lambda account: account.account_id):
+            stack.enter_context(account.lock)
+        return stack
+
+    def __str__(self) -> str:
+        return f"MacroCommand({len(self.commands)} commands)"
+
+
+def accounts_of(command: Command) -> List[Account]:
+    """
+    Every account a command acts on, including those of the commands inside a MacroCommand.
+    """
+    if isinstance(command, MacroCommand):
+        return [account for inner in command.commands for account in accounts_of(inner)]
+    return [account for account in (getattr(command, "account", None),
+                                    getattr(command, "source_account", None),
+                                    getattr(command, "target_account", None))
+            if account is not None]
+
+
+def _undo_all(commands: List[Command]) -> None:
+    # Undo in reverse order; a failing undo does not stop the rest, and the first failure is raised at the end
+    error = None
+    for command in reversed(commands):
+        try:
+            command.undo()
+        except Exception as undo_error:
+            if error is None:
+                error = undo_error
+    if error is not None:
+        raise error
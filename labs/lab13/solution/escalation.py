@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from commands import Command
+from handlers import Handler
+from router import ApprovalRouter
+
+class ApprovalExpired(Exception):
+    """
+    Raised through a command's future when its approval deadline passes first.
+    """
+
+
+class CommandRejected(Exception):
+    """
+    Raised through a command's future when no handler in the chain approves it.
+    """
+
+
+_QUEUED, _RUNNING, _FINISHED = range(3)
+
+
+class _PendingApproval:
+    """
+    An escalated command on its way through a tier queue.
+    """
+    __slots__ = ("handler", "command", "expires_at", "future", "state")
+
+    def __init__(self, handler: Handler, command: Command, expires_at: Optional[float]):
+        self.handler = handler
+        self.command = command
+        self.expires_at = expires_at
+        self.future: Future = Future()
+        self.state = _QUEUED
+
+
+class AsyncApprovalRouter:
+    """
+    Asynchronous front end to an ApprovalRouter.
+
+    Commands the Teller (the head of the chain) approves run straight away on
+    the caller's thread. Commands that escalate above the Teller's limit go
+    onto an approval queue for the tier that approves them (Assistant Manager,
+    Manager, Director), each served by its own pool of workers, so a backlog
+    at one tier never holds up tellers or the other tiers.
+
+    submit() always returns a Future. It resolves once the command has been
+    executed, or fails with the command's error, the review's error,
+    CommandRejected if no handler approves it, or ApprovalExpired if the
+    deadline passed before approval finished; in those cases the command is
+    not executed. A deadline is enforced while the
+    command waits in its tier's queue too: a watcher thread fails the future
+    when it passes, and a worker that reaches the command later skips it.
+
+    review, if given, is called on a worker for every escalated command before
+    it executes. It stands in for a human sign-off or a slow risk check and
+    denies the command by raising.
+    """
+    def __init__(self, router: ApprovalRouter, workers_per_tier: int = 2,
+                 deadline: Optional[float] = None,
+                 review: Optional[Callable[[Command], None]] = None):
+        self._router = router
+        self._workers_per_tier = workers_per_tier
+        self._deadline = deadline
+        self._review = review
+        self._tiers: Dict[Handler, ThreadPoolExecutor] = {}
+        self._tiers_lock = threading.Lock()
+        # Guards every _PendingApproval.state, and the deadline heap the watcher waits on
+        self._lock = threading.Lock()
+        self._deadlines_changed = threading.Condition(self._lock)
+        self._deadlines: List[Tuple[float, int, _PendingApproval]] = []
+        self._sequence = itertools.count()
+        self._watcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, command: Command, deadline: Optional[float] = None) -> Future:
+        """
+        Route the command and return a Future for its outcome. deadline is in
+        seconds from now and overrides the router-wide default.
+        """
+        handler = self._router.route(command)
+        if handler is None or handler is self._router.chain:
+            return self._run_inline(command, handler)
+
+        seconds = deadline if deadline is not None else self._deadline
+        expires_at = time.monotonic() + seconds if seconds is not None else None
+        pending = _PendingApproval(handler, command, expires_at)
+        if expires_at is not None:
+            self._watch(pending)
+        print(f"[AsyncApprovalRouter] Queued {command} for {handler.NAME} approval")
+        self._tier(handler).submit(self._approve, pending)
+        return pending.future
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the tier workers. With wait=True, queued commands are processed first.
+        """
+        with self._tiers_lock:
+            pools = list(self._tiers.values())
+        for pool in pools:
+            pool.shutdown(wait=wait)
+        with self._deadlines_changed:
+            self._closed = True
+            watcher = self._watcher
+            self._deadlines_changed.notify()
+        if watcher is not None and wait:
+            watcher.join()
+
+    def __enter__(self) -> "AsyncApprovalRouter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run_inline(self, command: Command, handler: Optional[Handler]) -> Future:
+        future: Future = Future()
+        try:
+            if handler is not None:
+                handler.approve(command)
+            elif not self._router.handle(command):
+                raise CommandRejected(f"No handler approved {command}.")
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+        return future
+
+    def _approve(self, pending: _PendingApproval) -> None:
+        # Skip commands that expired (or were cancelled) while they waited in the queue
+        if not self._check(pending, claim=False):
+            return
+        try:
+            if self._review is not None:
+                self._review(pending.command)
+            # From here on the command runs to completion and can no longer expire
+            if not self._check(pending, claim=True):
+                return
+            pending.handler.approve(pending.command)
+        except Exception as error:
+            with self._lock:
+                if pending.state == _QUEUED:
+                    # Denied by the review
+                    pending.state = _FINISHED
+                    if not pending.future.set_running_or_notify_cancel():
+                        return
+                elif pending.state != _RUNNING:
+                    return
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(None)
+
+    def _check(self, pending: _PendingApproval, claim: bool) -> bool:
+        """
+        Return whether the command may go on. Fails its future if the deadline has
+        passed; with claim=True, marks it running so the deadline no longer applies.
+        """
+        with self._lock:
+            if pending.state != _QUEUED:
+                return False
+            expired = pending.expires_at is not None and time.monotonic() >= pending.expires_at
+            if not expired and not claim:
+                return True
+            pending.state = _RUNNING if not expired else _FINISHED
+            if not pending.future.set_running_or_notify_cancel():
+                pending.state = _FINISHED
+                return False
+        if not expired:
+            return True
+        handler, command = pending.handler, pending.command
+        print(f"[AsyncApprovalRouter] {command} expired before {handler.NAME} approval.")
+        pending.future.set_exception(
+            ApprovalExpired(f"{command} was not approved by {handler.NAME} before its deadline."))
+        return False
+
+    def _watch(self, pending: _PendingApproval) -> None:
+        with self._deadlines_changed:
+            heapq.heappush(self._deadlines, (pending.expires_at, next(self._sequence), pending))
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._expire_overdue, name="ApprovalDeadlines",
+                                                 daemon=True)
+                self._watcher.start()
+            self._deadlines_changed.notify()
+
+    def _expire_overdue(self) -> None:
+        # One thread for all deadlines: sleeps until the earliest one, then fails it if still queued
+        while True:
+            with self._deadlines_changed:
+                while True:
+                    if self._closed:
+                        return
+                    delay = None
+                    if self._deadlines:
+                        delay = self._deadlines[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                    self._deadlines_changed.wait(delay)
+                _, _, pending = heapq.heappop(self._deadlines)
+            self._check(pending, claim=False)
+
+    def _tier(self, handler: Handler) -> ThreadPoolExecutor:
+        pool = self._tiers.get(handler)
+        if pool is None:
+            with self._tiers_lock:
+                pool = self._tiers.get(handler)
+                if pool is None:
+                    pool = self._tiers[handler] = ThreadPoolExecutor(
+                        max_workers=self._workers_per_tier, thread_name_prefix=handler.NAME.replace(" ", ""))
+        return pool
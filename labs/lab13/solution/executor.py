@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from commands import Command, accounts_of
+from handlers import Handler
+
+class BatchResult:
+    """
+    Outcome of one CommandBatchExecutor.execute() call.
+    """
+    def __init__(self, executed: int, failed: List[Tuple[Command, Exception]], elapsed: float,
+                 rejected: Optional[List[Command]] = None, waves: int = 0):
+        self.executed = executed
+        self.failed = failed
+        self.elapsed = elapsed
+        # Commands the approval chain or router turned down; they were not executed
+        self.rejected = rejected if rejected is not None else []
+        # Number of parallel steps the batch was scheduled in (see CommandBatchExecutor)
+        self.waves = waves
+
+    @property
+    def commands_per_wave(self) -> float:
+        """
+        Average number of commands that could run at the same time.
+        """
+        total = self.executed + len(self.failed) + len(self.rejected)
+        return total / self.waves if self.waves else 0.0
+
+    @property
+    def commands_per_second(self) -> float:
+        total = self.executed + len(self.failed) + len(self.rejected)
+        return total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.executed} executed, {len(self.failed)} failed, {len(self.rejected)} rejected "
+                f"in {self.waves} waves, {self.elapsed:.3f}s ({self.commands_per_second:,.0f} commands/s)")
+
+
+class CommandBatchExecutor:
+    """
+    Runs a batch of commands on a thread pool.
+
+    Commands are scheduled in waves by the accounts they act on: a command
+    goes in the wave after the last one that holds a command on any of its
+    accounts (a transfer's source and target, every account of a
+    MacroCommand). Commands in one wave share no account, so they are split
+    across the workers and run in parallel; the next wave starts once the
+    whole wave is done. Every account therefore sees its commands in the
+    order they were submitted, with the balances and overdraft failures of
+    sequential execution, while unrelated accounts never wait on each other.
+
+    Commands go through the given handler (the approval chain or an
+    ApprovalRouter), or are executed directly when no handler is given.
+    A command that raises ValueError (e.g. insufficient funds) is recorded
+    as failed, and one the handler rejects as rejected; the rest of its
+    wave carries on.
+    """
+    def __init__(self, handler: Optional[Handler] = None, max_workers: int = 4):
+        self._handler = handler
+        self._max_workers = max_workers
+
+    def execute(self, commands: Iterable[Command]) -> BatchResult:
+        waves = self._split_into_waves(commands)
+        start = time.perf_counter()
+        outcomes = []
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for wave in waves:
+                chunks = [wave[i::self._max_workers] for i in range(min(self._max_workers, len(wave)))]
+                if len(chunks) == 1:
+                    # Not worth a round trip through the pool
+                    outcomes.append(self._run(chunks[0]))
+                else:
+                    outcomes.extend(pool.map(self._run, chunks))
+        elapsed = time.perf_counter() - start
+
+        executed = sum(count for count, _, _ in outcomes)
+        failed = [failure for _, failures, _ in outcomes for failure in failures]
+        rejected = [command for _, _, rejections in outcomes for command in rejections]
+        result = BatchResult(executed, failed, elapsed, rejected, len(waves))
+        print(f"[CommandBatchExecutor] {result}")
+        return result
+
+    def _run(self, commands: List[Command]) -> Tuple[int, List[Tuple[Command, Exception]], List[Command]]:
+        run = self._handler.handle if self._handler is not None else _execute
+        executed = 0
+        failed = []
+        rejected = []
+        for command in commands:
+            try:
+                # Handlers that predate the bool result return None; count those as approved
+                if run(command) is False:
+                    rejected.append(command)
+                else:
+                    executed += 1
+            except ValueError as error:
+                failed.append((command, error))
+        return executed, failed, rejected
+
+    @staticmethod
+    def _split_into_waves(commands: Iterable[Command]) -> List[List[Command]]:
+        # Wave index of the last command seen on each account id. Commands without
+        # an account (unknown command types) all use the None key, so they run in order.
+        last_wave: Dict[Optional[int], int] = {}
+        waves: List[List[Command]] = []
+        for command in commands:
+            keys = [account.account_id for account in accounts_of(command)] or [None]
+            wave = 1 + max(last_wave.get(key, -1) for key in keys)
+            for key in keys:
+                last_wave[key] = wave
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(command)
+        return waves
+
+
+def _execute(command: Command) -> bool:
+    command.execute()
+    return True
+
@@ -1,107 +1,196 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-from commands import Command, DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple, Type
+from commands import (Command, DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand,
+                      MacroCommand)
+
+_KINDS = {WithdrawCommand: "withdrawal", TransferCommand: "transfer", MacroCommand: "batch"}
+
+
+def _kind(command: Command) -> str:
+    # What the handlers' messages call a limited command
+    for command_type in type(command).__mro__:
+        if command_type in _KINDS:
+            return _KINDS[command_type]
+    return type(command).__name__
+
+
+class _ChainLimits:
+    """
+    The limits mapping shared by all handlers of one chain.
+    """
+    __slots__ = ("limits",)
+
+    def __init__(self):
+        self.limits: Mapping[str, float] = MappingProxyType({})
+
 
 class Handler(ABC):
     """
     Base class for Chain of Responsibility. Each handler can either handle
     a Command or pass it on to the next handler in the chain.
+
+    The class attributes describe what a handler approves, so the chain can
+    also be compiled into a lookup table (see router.ApprovalRouter):
+      - LIMITED_COMMANDS are approved up to APPROVAL_LIMIT
+      - UNLIMITED_COMMANDS are approved whatever their amount
+    A MacroCommand is limited by the total it withdraws and transfers.
+
+    APPROVAL_LIMIT is only the default. Each handler approves amounts above
+    lower_limit (the limit of the handler before it) up to approval_limit.
+    The handlers of one chain share a single limits mapping; apply_limits()
+    replaces it in one assignment, e.g. with limits loaded from
+    approval_limits.json, and ApprovalRouter applies the limits it compiles.
+    handle() reads the mapping once and passes it down the chain, so a
+    command never sees some handlers with old limits and others with new ones.
     """
+    NAME = "Handler"
+    APPROVAL_LIMIT = 0.0
+    LIMITED_COMMANDS: Tuple[Type[Command], ...] = (WithdrawCommand, TransferCommand, MacroCommand)
+    UNLIMITED_COMMANDS: Tuple[Type[Command], ...] = ()
+
     def __init__(self):
         self._next_handler: Optional["Handler"] = None
+        self._previous_handler: Optional["Handler"] = None
+        self._chain_limits = _ChainLimits()
 
     def set_next(self, handler: "Handler") -> "Handler":
         """
         Link this handler to the next one and return the next handler. This allows building a fluent chain.
         """
         self._next_handler = handler
-        return handler
+        handler._previous_handler = self
+        # The handler and the ones after it join this chain's limits
+        while handler is not None:
+            handler._chain_limits = self._chain_limits
+            handler = handler.get_next()
+        return self._next_handler
+
+    @property
+    def limits(self) -> Mapping[str, float]:
+        """
+        Handler NAME -> approval limit currently applied to this handler's chain.
+        """
+        return self._chain_limits.limits
+
+    @property
+    def approval_limit(self) -> float:
+        return self.bounds(self.limits)[1]
+
+    @property
+    def lower_limit(self) -> float:
+        return self.bounds(self.limits)[0]
+
+    def bounds(self, limits: Mapping[str, float]) -> Tuple[float, float]:
+        """
+        Return (lower_limit, approval_limit) of this handler under the given chain limits.
+        """
+        previous = self._previous_handler
+        lower_limit = 0.0 if previous is None else limits.get(previous.NAME, previous.APPROVAL_LIMIT)
+        return lower_limit, limits.get(self.NAME, self.APPROVAL_LIMIT)
+
+    def apply_limits(self, limits: Mapping[str, float]) -> None:
+        """
+        Set the approval limits of every handler in this chain from a mapping
+        of handler NAMEs to limits; handlers left out go back to their
+        APPROVAL_LIMIT constant. The whole chain switches at once.
+        """
+        self._chain_limits.limits = MappingProxyType(dict(limits))
+
+    def get_next(self) -> Optional["Handler"]:
+        return self._next_handler
+
+    def approve(self, command: Command) -> None:
+        """
+        Approve and execute a command this handler is responsible for.
+        """
+        print(f"[{self.NAME}] Approving and processing {command}")
+        command.execute()
 
     @abstractmethod
-    def handle(self, command: Command) -> None:
+    def handle(self, command: Command, limits: Optional[Mapping[str, float]] = None) -> bool:
         """
         Attempt to handle the given command. If this handler cannot process it,
-        forward it to the next handler in the chain.
+        forward it to the next handler in the chain. Returns True if a handler
+        approved and executed the command, False if the chain rejected it.
+
+        limits is the chain's limits as read by the first handler; leave it out
+        when calling handle() and pass it on when forwarding.
         """
         pass
 
 
+
 class TellerHandler(Handler):
     """
     The Teller can process:
       - Deposits of any size
       - Withdrawals up to $500
       - Transfers up to $500
+      - Batches that withdraw and transfer up to $500 in total
     Anything above $500 must be escalated to AssistantManagerHandler.
     """
+    NAME = "Teller"
     APPROVAL_LIMIT = 500.0
+    UNLIMITED_COMMANDS = (BalanceInquiryCommand, DepositCommand)
+
+    def approve(self, command: Command) -> None:
+        print(f"[Teller] Processing {command}")
+        command.execute()
 
-    def handle(self, command: Command) -> None:
+    def handle(self, command: Command, limits: Optional[Mapping[str, float]] = None) -> bool:
+        limits = self.limits if limits is None else limits
         # Check type of command
         if isinstance(command, BalanceInquiryCommand):
-            print(f"[Teller] Processing {command}")
-            command.execute()
+            self.approve(command)
+            return True
         elif isinstance(command, DepositCommand):
-            print(f"[Teller] Processing {command}")
-            command.execute()
-        elif isinstance(command, WithdrawCommand):
-            if command.amount <= self.APPROVAL_LIMIT:
-                print(f"[Teller] Processing {command}")
-                command.execute()
-            else:
-                print(f"[Teller] Cannot handle withdrawal of ${command.amount:.2f} — requires manager approval.")
-                if self._next_handler:
-                    self._next_handler.handle(command)
-                else:
-                    print("[Teller] No next handler available. Command rejected.")
-        elif isinstance(command, TransferCommand):
-            if command.amount <= self.APPROVAL_LIMIT:
-                print(f"[Teller] Processing {command}")
-                command.execute()
+            self.approve(command)
+            return True
+        elif isinstance(command, self.LIMITED_COMMANDS):
+            if command.amount <= self.bounds(limits)[1]:
+                self.approve(command)
+                return True
             else:
-                print(f"[Teller] Cannot handle transfer of ${command.amount:.2f} — requires manager approval.")
+                print(f"[Teller] Cannot handle {_kind(command)} of ${command.amount:.2f} — requires manager approval.")
                 if self._next_handler:
-                    self._next_handler.handle(command)
+                    return self._next_handler.handle(command, limits)
                 else:
                     print("[Teller] No next handler available. Command rejected.")
+                    return False
         else:
             # Unrecognized command for this handler
             if self._next_handler:
-                self._next_handler.handle(command)
+                return self._next_handler.handle(command, limits)
             else:
                 print(f"[Teller] Cannot handle command {command}. No next handler.")
+                return False
 
 
 class AssistantManagerHandler(Handler):
+    NAME = "Assistant Manager"
     APPROVAL_LIMIT = 2_500.0
 
-    def handle(self, command: Command) -> None:
-        if isinstance(command, WithdrawCommand):
-            if TellerHandler.APPROVAL_LIMIT < command.amount <= self.APPROVAL_LIMIT:
-                print(f"[Assistant Manager] Approving and processing {command}")
-                command.execute()
-            else:
-                if self._next_handler:
-                    print(f"[Assistant Manager] Cannot handle withdrawal of ${command.amount:.2f}—forwarding.")
-                    self._next_handler.handle(command)
-                else:
-                    print("[Assistant Manager] No next handler. Command rejected.")
-
-        elif isinstance(command, TransferCommand):
-            if TellerHandler.APPROVAL_LIMIT < command.amount <= self.APPROVAL_LIMIT:
-                print(f"[Assistant Manager] Approving and processing {command}")
-                command.execute()
+    def handle(self, command: Command, limits: Optional[Mapping[str, float]] = None) -> bool:
+        limits = self.limits if limits is None else limits
+        lower_limit, approval_limit = self.bounds(limits)
+        if isinstance(command, self.LIMITED_COMMANDS):
+            if lower_limit < command.amount <= approval_limit:
+                self.approve(command)
+                return True
             else:
                 if self._next_handler:
-                    print(f"[Assistant Manager] Cannot handle transfer of ${command.amount:.2f}—forwarding.")
-                    self._next_handler.handle(command)
+                    print(f"[Assistant Manager] Cannot handle {_kind(command)} of ${command.amount:.2f}—forwarding.")
+                    return self._next_handler.handle(command, limits)
                 else:
                     print("[Assistant Manager] No next handler. Command rejected.")
+                    return False
         else:
             if self._next_handler:
-                self._next_handler.handle(command)
+                return self._next_handler.handle(command, limits)
             else:
                 print(f"[Assistant Manager] Cannot handle command {command}. No next handler.")
+                return False
 
 
 class ManagerHandler(Handler):
@@ -112,47 +201,47 @@ class ManagerHandler(Handler):
     Otherwise, escalate to DirectorHandler.
     Deposits are always handled by Teller, so Manager does not explicitly handle deposits here.
     """
+    NAME = "Manager"
     APPROVAL_LIMIT = 10_000.0
 
-    def handle(self, command: Command) -> None:
-        if isinstance(command, WithdrawCommand):
-            if self.APPROVAL_LIMIT >= command.amount > TellerHandler.APPROVAL_LIMIT:
-                print(f"[Manager] Approving and processing {command}")
-                command.execute()
+    def handle(self, command: Command, limits: Optional[Mapping[str, float]] = None) -> bool:
+        limits = self.limits if limits is None else limits
+        lower_limit, approval_limit = self.bounds(limits)
+        if isinstance(command, self.LIMITED_COMMANDS):
+            if approval_limit >= command.amount > lower_limit:
+                self.approve(command)
+                return True
             else:
                 # Not in Manager’s range
                 if self._next_handler:
-                    print(f"[Manager] Cannot handle withdrawal of ${command.amount:.2f} — forwarding to next.")
-                    self._next_handler.handle(command)
-                else:
-                    print("[Manager] No next handler. Command rejected.")
-        elif isinstance(command, TransferCommand):
-            if self.APPROVAL_LIMIT >= command.amount > TellerHandler.APPROVAL_LIMIT:
-                print(f"[Manager] Approving and processing {command}")
-                command.execute()
-            else:
-                if self._next_handler:
-                    print(f"[Manager] Cannot handle transfer of ${command.amount:.2f} — forwarding to next.")
-                    self._next_handler.handle(command)
+                    print(f"[Manager] Cannot handle {_kind(command)} of ${command.amount:.2f} — forwarding to next.")
+                    return self._next_handler.handle(command, limits)
                 else:
                     print("[Manager] No next handler. Command rejected.")
+                    return False
         else:
             # Either a deposit or out‐of‐range: forward
             if self._next_handler:
-                self._next_handler.handle(command)
+                return self._next_handler.handle(command, limits)
             else:
                 print(f"[Manager] Cannot handle command {command}. No next handler.")
+                return False
 
 
 class DirectorHandler(Handler):
     """
-    The Director can process any Withdrawal or Transfer above $10,000.
+    The Director can process any Withdrawal, Transfer or batch above $10,000.
     Deposits and smaller amounts have already been handled upstream.
     """
-    def handle(self, command: Command) -> None:
-        if isinstance(command, WithdrawCommand) or isinstance(command, TransferCommand):
-            print(f"[Director] Approving and processing {command}")
-            command.execute()
+    NAME = "Director"
+    APPROVAL_LIMIT = float("inf")
+
+    def handle(self, command: Command, limits: Optional[Mapping[str, float]] = None) -> bool:
+        limits = self.limits if limits is None else limits
+        if isinstance(command, self.LIMITED_COMMANDS) and command.amount <= self.bounds(limits)[1]:
+            self.approve(command)
+            return True
         else:
             print(f"[Director] Cannot handle command {command}. No next handler.")
+            return False
             
\ No newline at end of file
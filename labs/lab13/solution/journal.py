@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+from account import Account
+from commands import (Command, DepositCommand, WithdrawCommand, TransferCommand,
+                      BalanceInquiryCommand, MacroCommand)
+from handlers import Handler
+
+class CommandJournal:
+    """
+    Append-only journal of executed commands, so accounts survive a restart.
+
+    Commands go through the given handler (the approval chain or an
+    ApprovalRouter), or are executed directly when no handler is given.
+    Only commands that were approved and executed are journaled.
+
+    Every executed deposit, withdrawal and transfer is appended to the journal
+    file as one NDJSON line, e.g. ["transfer", "Alice", "Bob", 25.0]. The first
+    time an account is seen, an "open" line records its starting balance.
+    A MacroCommand is one line holding the entries of its steps, e.g.
+    ["macro", [["withdraw", "Alice", 5.0], ...]], so recovery replays all of
+    it or, if that line was cut short by a crash, none of it.
+
+    Lines are buffered and written in groups of group_size (group commit): one
+    write and one fsync per group instead of one per command. Call flush() or
+    close() to commit a partial group.
+
+    Every snapshot_every commands the journal writes a snapshot of all
+    balances together with the journal offset it covers. Opening an existing
+    journal loads the latest snapshot and replays only the lines after it,
+    so recovery time depends on the snapshot interval, not the journal size.
+
+    execute() is serialized by a lock, so one journal can be shared by threads.
+    """
+    def __init__(self, path: str, group_size: int = 1_000, snapshot_every: int = 100_000,
+                 durable: bool = True, handler: Optional[Handler] = None):
+        self.path = path
+        self.handler = handler
+        self.snapshot_path = path + ".snapshot"
+        self.group_size = group_size
+        self.snapshot_every = snapshot_every
+        self.durable = durable
+        self.accounts: Dict[str, Account] = {}
+        self._pending: List[str] = []
+        self._since_snapshot = 0
+        self._lock = threading.Lock()
+        self._recover()
+        self._file = open(path, "ab")
+
+    def open_account(self, owner: str, balance: float = 0.0) -> Account:
+        """
+        Create and journal a new account, or return the recovered one with that owner.
+        """
+        with self._lock:
+            account = self.accounts.get(owner)
+            if account is None:
+                account = Account(owner, balance)
+                self._register(account)
+            return account
+
+    def execute(self, command: Command) -> bool:
+        """
+        Execute the command and journal it. Returns False if the handler rejected
+        it. Commands that raise or are rejected are not journaled; balance
+        inquiries are executed only. Raises TypeError, before executing, for a
+        command type the journal cannot record.
+        """
+        with self._lock:
+            entry = self._encode(command)
+            if self.handler is None:
+                command.execute()
+            elif self.handler.handle(command) is False:
+                return False
+            if entry is None:
+                return True
+            self._pending.append(json.dumps(entry, separators=(",", ":")))
+            self._since_snapshot += 1
+            if len(self._pending) >= self.group_size:
+                self._commit()
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot()
+            return True
+
+    def flush(self) -> None:
+        """
+        Commit any buffered journal lines.
+        """
+        with self._lock:
+            self._commit()
+
+    def snapshot(self) -> None:
+        """
+        Commit buffered lines and write a balance snapshot now.
+        """
+        with self._lock:
+            self._snapshot()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "CommandJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _encode(self, command: Command) -> Optional[list]:
+        if isinstance(command, BalanceInquiryCommand):
+            return None
+        # Check every step before registering any account, so a rejected macro leaves no "open" lines
+        self._check_encodable(command)
+        return self._entry(command)
+
+    def _check_encodable(self, command: Command) -> None:
+        if isinstance(command, MacroCommand):
+            for inner in command.commands:
+                self._check_encodable(inner)
+        elif not isinstance(command, (DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand)):
+            raise TypeError(f"CommandJournal cannot record {type(command).__name__}.")
+
+    def _entry(self, command: Command) -> Optional[list]:
+        if isinstance(command, DepositCommand):
+            self._register(command.account)
+            return ["deposit", command.account.owner, command.amount]
+        if isinstance(command, WithdrawCommand):
+            self._register(command.account)
+            return ["withdraw", command.account.owner, command.amount]
+        if isinstance(command, TransferCommand):
+            self._register(command.source_account)
+            self._register(command.target_account)
+            return ["transfer", command.source_account.owner, command.target_account.owner, command.amount]
+        if isinstance(command, MacroCommand):
+            entries = [self._entry(inner) for inner in command.commands]
+            return ["macro", [entry for entry in entries if entry is not None]]
+        return None
+
+    def _register(self, account: Account) -> None:
+        known = self.accounts.get(account.owner)
+        if known is account:
+            return
+        if known is not None:
+            raise ValueError(f"Journal already has a different account for owner {account.owner!r}.")
+        self.accounts[account.owner] = account
+        # Opening balance goes in before any command that touches the account
+        self._pending.append(json.dumps(["open", account.owner, account.balance], separators=(",", ":")))
+
+    def _commit(self) -> None:
+        if not self._pending:
+            return
+        self._pending.append("")
+        self._file.write("\n".join(self._pending).encode("utf-8"))
+        self._file.flush()
+        if self.durable:
+            os.fsync(self._file.fileno())
+        self._pending = []
+
+    def _snapshot(self) -> None:
+        self._commit()
+        snapshot = {"offset": self._file.tell(),
+                    "balances": {owner: account.balance for owner, account in self.accounts.items()}}
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        # The old snapshot stays valid until the new one has fully replaced it
+        os.replace(temporary, self.snapshot_path)
+        self._since_snapshot = 0
+
+    def _recover(self) -> None:
+        balances: Dict[str, float] = {}
+        offset = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            balances = snapshot["balances"]
+            offset = snapshot["offset"]
+
+        if os.path.exists(self.path):
+            offset = self._replay(balances, offset)
+            # Drop a half-written last line left by a crash mid-write
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+        self.accounts = {owner: Account(owner, balance) for owner, balance in balances.items()}
+
+    def _replay(self, balances: Dict[str, float], offset: int) -> int:
+        loads = json.loads
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                _apply(balances, loads(line))
+                offset += len(line)
+        return offset
+
+
+def _apply(balances: Dict[str, float], entry: list) -> None:
+    op = entry[0]
+    if op == "deposit":
+        balances[entry[1]] += entry[2]
+    elif op == "withdraw":
+        balances[entry[1]] -= entry[2]
+    elif op == "transfer":
+        balances[entry[1]] -= entry[3]
+        balances[entry[2]] += entry[3]
+    elif op == "open":
+        balances[entry[1]] = entry[2]
+    elif op == "macro":
+        for inner in entry[1]:
+            _apply(balances, inner)
@@ -0,0 +1,159 @@
+import threading
+from typing import Dict, Optional
+import numpy as np
+from account import Account
+
+class Ledger:
+    """
+    Column-oriented store for many accounts: balances live in one NumPy
+    float64 array indexed by ledger id instead of one Account object each.
+
+    Bulk deposits and withdrawals go through apply_commands(), which works on
+    whole arrays at once. account(id) returns an Account view onto one row, so
+    the existing command classes and handlers work on ledger accounts too.
+    """
+    def __init__(self, capacity: int = 1_024):
+        self._balances = np.zeros(max(capacity, 1), dtype=np.float64)
+        self._size = 0
+        # Only accounts opened with an explicit owner keep a name string
+        self._owners: Dict[int, str] = {}
+        self._views: Dict[int, "LedgerAccount"] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def balances(self) -> np.ndarray:
+        """
+        Writable view of the balances of all open accounts.
+        """
+        return self._balances[:self._size]
+
+    def open_account(self, owner: Optional[str] = None, balance: float = 0.0) -> int:
+        """
+        Open one account and return its ledger id.
+        """
+        with self._lock:
+            account_id = self._grow(1)
+            self._balances[account_id] = balance
+            if owner is not None:
+                self._owners[account_id] = owner
+            return account_id
+
+    def open_accounts(self, count: int, balance: float = 0.0) -> range:
+        """
+        Open count unnamed accounts with the same starting balance and return their ids.
+        """
+        with self._lock:
+            first = self._grow(count)
+            self._balances[first:first + count] = balance
+            return range(first, first + count)
+
+    def owner(self, account_id: int) -> str:
+        return self._owners.get(account_id, f"Account {account_id}")
+
+    def account(self, account_id: int) -> "LedgerAccount":
+        """
+        Return the Account view of a ledger row. The same view is returned every
+        time, so all commands on that account share one lock.
+        """
+        if not 0 <= account_id < self._size:
+            raise IndexError(f"No account with ledger id {account_id}.")
+        with self._lock:
+            view = self._views.get(account_id)
+            if view is None:
+                view = self._views[account_id] = LedgerAccount(self, account_id)
+            return view
+
+    def apply_commands(self, account_ids, amounts) -> np.ndarray:
+        """
+        Apply a batch of deposits (positive amounts) and withdrawals (negative
+        amounts) and return a boolean mask of the ones that were applied.
+
+        All deposits in the batch are applied first. Withdrawals are then taken
+        per account in batch order; one that would overdraw its account is
+        rejected and the ones after it still get their chance, as if they had
+        been executed one by one. Zero amounts are rejected.
+
+        The overdraft check compares running totals, so with fractional amounts
+        it can differ from one-by-one execution in the last bit of rounding.
+        Do not run apply_commands() while commands execute on Account views of
+        the same ledger; the two paths use different locks.
+        """
+        account_ids = np.asarray(account_ids, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if account_ids.shape != amounts.shape or account_ids.ndim != 1:
+            raise ValueError("account_ids and amounts must be one-dimensional and the same length.")
+        if account_ids.size and (account_ids.min() < 0 or account_ids.max() >= self._size):
+            raise IndexError("apply_commands() got a ledger id that is not open.")
+
+        applied = amounts > 0
+        with self._lock:
+            balances = self.balances
+            np.add.at(balances, account_ids[applied], amounts[applied])
+            withdrawals = np.flatnonzero(amounts < 0)
+            # Stable sort keeps batch order within each account
+            pending = withdrawals[np.argsort(account_ids[withdrawals], kind="stable")]
+            while pending.size:
+                accepted, pending = self._split_withdrawals(account_ids[pending], -amounts[pending], pending)
+                np.subtract.at(balances, account_ids[accepted], -amounts[accepted])
+                applied[accepted] = True
+                # Balances only go down from here, so anything already too large can never apply
+                pending = pending[-amounts[pending] <= balances[account_ids[pending]]]
+        return applied
+
+    def _split_withdrawals(self, ids: np.ndarray, amounts: np.ndarray, positions: np.ndarray):
+        # ids are grouped by account. Within each group, withdrawals before the
+        # first one that overdraws are accepted, that one is rejected, and the
+        # ones after it are returned to be retried against the reduced balance.
+        starts = np.ones(ids.size, dtype=bool)
+        starts[1:] = ids[1:] != ids[:-1]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(ids.size), 0))
+
+        totals = np.cumsum(amounts)
+        running = totals - (totals[group_start] - amounts[group_start])
+        overdrawn = running > self._balances[ids]
+
+        failures = np.cumsum(overdrawn)
+        failures_in_group = failures - (failures[group_start] - overdrawn[group_start])
+        accepted = positions[failures_in_group == 0]
+        pending = positions[failures_in_group - overdrawn > 0]
+        return accepted, pending
+
+    def _grow(self, count: int) -> int:
+        first = self._size
+        needed = first + count
+        if needed > self._balances.size:
+            capacity = max(needed, 2 * self._balances.size)
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[:first] = self._balances[:first]
+            self._balances = grown
+        self._size = needed
+        return first
+
+
+class LedgerAccount(Account):
+    """
+    Adapter that lets one Ledger row be used wherever an Account is expected.
+    owner and balance read and write the ledger; deposit, withdraw and transfer
+    are Account's own, so they validate, lock and print exactly as before.
+    """
+    def __init__(self, ledger: Ledger, ledger_id: int):
+        # Account.__init__ is not called: the balance already lives in the ledger
+        self.ledger = ledger
+        self.ledger_id = ledger_id
+        self.account_id = next(Account._next_id)
+        self.lock = threading.RLock()
+
+    @property
+    def owner(self) -> str:
+        return self.ledger.owner(self.ledger_id)
+
+    @property
+    def balance(self) -> float:
+        return float(self.ledger._balances[self.ledger_id])
+
+    @balance.setter
+    def balance(self, value: float) -> None:
+        self.ledger._balances[self.ledger_id] = value
@@ -0,0 +1,161 @@
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Type
+from commands import Command
+from handlers import Handler
+
+class RoutingTable:
+    """
+    Immutable lookup table compiled from an approval chain: for each command
+    type, the handler that approves it at any amount, or the handlers'
+    approval limits in ascending order so the approving handler is found with
+    a single bisect. A table never changes once built; new limits mean a new
+    table.
+    """
+    __slots__ = ("_unlimited", "_limited", "_limits")
+
+    def __init__(self, unlimited: Dict[Type[Command], Handler],
+                 limited: Dict[Type[Command], Tuple[Tuple[float, ...], Tuple[Handler, ...]]],
+                 limits: Dict[str, float]):
+        # Plain dicts for lookup speed; nothing writes to them after this
+        self._unlimited = unlimited
+        self._limited = limited
+        self._limits = limits
+
+    @property
+    def limits(self) -> Mapping[str, float]:
+        """
+        Handler name -> the approval limit this table was compiled with.
+        """
+        return MappingProxyType(self._limits)
+
+    @classmethod
+    def compile(cls, chain: Handler, limits: Optional[Mapping[str, float]] = None) -> "RoutingTable":
+        """
+        Walk the chain once and build its table. limits maps handler NAMEs to
+        approval limits that replace the handlers' APPROVAL_LIMIT constants.
+        Limits must be positive and increase along the chain.
+        """
+        limits = dict(limits or {})
+        names = set()
+        unlimited: Dict[Type[Command], Handler] = {}
+        limited: Dict[Type[Command], Tuple[List[float], List[Handler]]] = {}
+        previous: Optional[Handler] = None
+        handler = chain
+        while handler is not None:
+            names.add(handler.NAME)
+            limit = limits.setdefault(handler.NAME, handler.APPROVAL_LIMIT)
+            # Written so that NaN fails too
+            if not limit > 0:
+                raise ValueError(f"Approval limit for {handler.NAME} must be positive, got {limit}.")
+            if previous is not None and not limit > limits[previous.NAME]:
+                raise ValueError(f"Approval limit for {handler.NAME} ({limit}) must be above the limit "
+                                 f"for {previous.NAME} ({limits[previous.NAME]}).")
+            for command_type in handler.UNLIMITED_COMMANDS:
+                # The first handler in the chain that accepts a command wins
+                if command_type not in unlimited and command_type not in limited:
+                    unlimited[command_type] = handler
+            for command_type in handler.LIMITED_COMMANDS:
+                if command_type in unlimited:
+                    continue
+                type_limits, handlers = limited.setdefault(command_type, ([], []))
+                # A handler only gets the amounts left over by the handlers before it
+                type_limits.append(limit)
+                handlers.append(handler)
+            previous = handler
+            handler = handler.get_next()
+
+        unknown = set(limits) - names
+        if unknown:
+            raise ValueError(f"Approval limits given for handlers not in the chain: {sorted(unknown)}.")
+        return cls(unlimited,
+                   {command_type: (tuple(type_limits), tuple(handlers))
+                    for command_type, (type_limits, handlers) in limited.items()},
+                   limits)
+
+    def route(self, command: Command) -> Optional[Handler]:
+        command_type = type(command)
+        handler = self._unlimited.get(command_type)
+        if handler is not None:
+            return handler
+        entry = self._limited.get(command_type)
+        if entry is None:
+            command_type = self.resolve(command_type)
+            if command_type is None:
+                return None
+            if command_type in self._unlimited:
+                return self._unlimited[command_type]
+            entry = self._limited[command_type]
+        type_limits, handlers = entry
+        index = bisect_left(type_limits, command.amount)
+        return handlers[index] if index < len(handlers) else None
+
+    def resolve(self, command_type: Type[Command]) -> Optional[Type[Command]]:
+        """
+        Return the command type the table routes command_type as: itself, or
+        for subclasses of known commands, their closest known base class.
+        """
+        for candidate in command_type.__mro__:
+            if candidate in self._unlimited or candidate in self._limited:
+                return candidate
+        return None
+
+
+class ApprovalRouter:
+    """
+    Compiled form of an approval chain. Walks the chain once and builds a
+    RoutingTable, so finding the approving handler takes a single bisect
+    instead of a hop per handler.
+
+    The chain is still how approvals are configured: build it with set_next()
+    and pass its head here. Commands the table does not know are handed to the
+    chain itself, so they behave exactly as before.
+
+    Approval limits default to the handlers' APPROVAL_LIMIT constants and can
+    be replaced while commands are being routed (see reload() and
+    thresholds.ThresholdWatcher). A reload compiles a new table and swaps it
+    in with one assignment: commands already being routed finish on the old
+    table and nothing waits on a lock. The new limits are then applied to the
+    chain too, again in one step (see Handler.apply_limits()), so commands the
+    chain handles itself are approved by the same limits.
+    """
+    def __init__(self, chain: Handler, limits: Optional[Mapping[str, float]] = None):
+        self.chain = chain
+        self._table = RoutingTable.compile(chain, limits)
+        chain.apply_limits(self._table.limits)
+
+    @property
+    def table(self) -> RoutingTable:
+        return self._table
+
+    def reload(self, limits: Mapping[str, float]) -> RoutingTable:
+        """
+        Compile a table with new approval limits and make it current. Raises
+        ValueError, leaving the current table in place, if the limits are invalid.
+        """
+        table = RoutingTable.compile(self.chain, limits)
+        self._table = table
+        self.chain.apply_limits(table.limits)
+        return table
+
+    def handle(self, command: Command) -> bool:
+        """
+        Execute the command through the handler the chain would have picked.
+        Returns True if it was approved and executed, False if it was rejected.
+        """
+        table = self._table
+        handler = table.route(command)
+        if handler is not None:
+            handler.approve(command)
+            return True
+        if table.resolve(type(command)) is not None:
+            print(f"[ApprovalRouter] No handler can approve {command}. Command rejected.")
+            return False
+        return self.chain.handle(command)
+
+    def route(self, command: Command) -> Optional[Handler]:
+        """
+        Return the handler that approves the command, or None if no handler does
+        (or the command type is not in the table).
+        """
+        return self._table.route(command)
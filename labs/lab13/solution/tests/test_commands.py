@@ -0,0 +1,142 @@
+import contextlib
+import io
+import threading
+import unittest
+from account import Account
+from commands import (Command, DepositCommand, WithdrawCommand, TransferCommand,
+                      BalanceInquiryCommand, MacroCommand)
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+class TestCommandUndo(unittest.TestCase):
+    def setUp(self):
+        self.alice = Account("Alice", 1_000.0)
+        self.bob = Account("Bob", 200.0)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def balances(self) -> tuple:
+        return self.alice.balance, self.bob.balance
+
+    def test_undo_reverses_execute(self):
+        for command in (DepositCommand(self.alice, 250.0), WithdrawCommand(self.alice, 250.0),
+                        TransferCommand(self.alice, self.bob, 250.0), BalanceInquiryCommand(self.alice)):
+            with self.subTest(command=str(command)):
+                command.execute()
+                command.undo()
+                self.assertEqual(self.balances(), (1_000.0, 200.0))
+
+    def test_commands_have_no_instance_dict(self):
+        for command in (DepositCommand(self.alice, 1.0), WithdrawCommand(self.alice, 1.0),
+                        TransferCommand(self.alice, self.bob, 1.0), BalanceInquiryCommand(self.alice)):
+            with self.subTest(command=type(command).__name__):
+                self.assertFalse(hasattr(command, "__dict__"))
+
+    def test_undo_is_not_supported_by_default(self):
+        class AuditCommand(Command):
+            def execute(self) -> None:
+                pass
+
+            def __str__(self) -> str:
+                return "AuditCommand()"
+
+        with self.assertRaises(NotImplementedError):
+            AuditCommand().undo()
+
+
+class TestMacroCommand(unittest.TestCase):
+    def setUp(self):
+        self.alice = Account("Alice", 1_000.0)
+        self.bob = Account("Bob", 200.0)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_applies_every_command(self):
+        MacroCommand([DepositCommand(self.alice, 100.0), TransferCommand(self.alice, self.bob, 600.0),
+                      WithdrawCommand(self.bob, 50.0)]).execute()
+        self.assertEqual((self.alice.balance, self.bob.balance), (500.0, 750.0))
+
+    def test_rolls_back_on_first_failure(self):
+        macro = MacroCommand([DepositCommand(self.alice, 100.0), TransferCommand(self.alice, self.bob, 600.0),
+                              WithdrawCommand(self.bob, 5_000.0), WithdrawCommand(self.alice, 5.0)])
+        with self.assertRaises(ValueError):
+            macro.execute()
+        self.assertEqual((self.alice.balance, self.bob.balance), (1_000.0, 200.0))
+
+    def test_undo_and_nesting(self):
+        inner = MacroCommand([TransferCommand(self.alice, self.bob, 300.0)])
+        outer = MacroCommand([DepositCommand(self.bob, 10.0), inner])
+        outer.execute()
+        self.assertEqual((self.alice.balance, self.bob.balance), (700.0, 510.0))
+        outer.undo()
+        self.assertEqual((self.alice.balance, self.bob.balance), (1_000.0, 200.0))
+        self.assertEqual(str(outer), "MacroCommand(2 commands)")
+
+    def test_rollback_continues_past_a_failing_undo(self):
+        class IrreversibleCommand(Command):
+            def execute(self) -> None:
+                pass
+
+            def __str__(self) -> str:
+                return "IrreversibleCommand()"
+
+        macro = MacroCommand([DepositCommand(self.alice, 100.0), IrreversibleCommand(),
+                              WithdrawCommand(self.bob, 5_000.0)])
+        with self.assertRaises(NotImplementedError) as raised:
+            macro.execute()
+        self.assertIsInstance(raised.exception.__context__, ValueError)
+        self.assertEqual((self.alice.balance, self.bob.balance), (1_000.0, 200.0))
+
+    def test_holds_every_account_lock_while_running(self):
+        held = []
+
+        class ProbeCommand(Command):
+            def __init__(self, accounts):
+                self.accounts = accounts
+
+            def execute(self) -> None:
+                def probe():
+                    for account in self.accounts:
+                        locked = account.lock.acquire(blocking=False)
+                        if locked:
+                            account.lock.release()
+                        held.append(not locked)
+                thread = threading.Thread(target=probe)
+                thread.start()
+                thread.join()
+
+            def __str__(self) -> str:
+                return "ProbeCommand()"
+
+        MacroCommand([DepositCommand(self.alice, 1.0), WithdrawCommand(self.bob, 1.0),
+                      ProbeCommand([self.alice, self.bob])]).execute()
+        self.assertEqual(held, [True, True])
+        # Released afterwards
+        self.assertTrue(self.alice.lock.acquire(blocking=False))
+        self.alice.lock.release()
+
+    def test_approval_uses_the_batch_total(self):
+        chain = build_approval_chain()
+        router = ApprovalRouter(chain)
+        batch = MacroCommand([WithdrawCommand(self.alice, 300.0), TransferCommand(self.alice, self.bob, 400.0),
+                              DepositCommand(self.bob, 5_000.0)])
+        self.assertEqual(batch.amount, 700.0)
+        self.assertEqual(router.route(batch).NAME, "Assistant Manager")
+        self.assertEqual(router.route(MacroCommand([DepositCommand(self.bob, 5_000.0)])).NAME, "Teller")
+
+        self.assertTrue(chain.handle(batch))
+        self.assertEqual((self.alice.balance, self.bob.balance), (300.0, 5_600.0))
+        self.assertTrue(router.handle(MacroCommand([WithdrawCommand(self.bob, 5_000.0),
+                                                    WithdrawCommand(self.bob, 600.0)])))
+        self.assertEqual(self.bob.balance, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import threading
+import time
+import unittest
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand
+from escalation import ApprovalExpired, AsyncApprovalRouter, CommandRejected
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+class TestAsyncApprovalRouter(unittest.TestCase):
+    def setUp(self):
+        self.alice = Account("Alice", 100_000.0)
+        self.bob = Account("Bob")
+        self.router = ApprovalRouter(build_approval_chain())
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+
+    def test_teller_commands_complete_while_escalations_wait(self):
+        release = threading.Event()
+        with AsyncApprovalRouter(self.router, review=lambda command: release.wait(5)) as desk:
+            escalated = desk.submit(WithdrawCommand(self.alice, 5_000.0))
+            teller = [desk.submit(DepositCommand(self.alice, 10_000.0)),
+                      desk.submit(TransferCommand(self.alice, self.bob, 400.0))]
+            self.assertTrue(all(future.done() for future in teller))
+            self.assertFalse(escalated.done())
+            self.assertEqual(self.bob.balance, 400.0)
+            release.set()
+            escalated.result(timeout=5)
+        self.assertEqual(self.alice.balance, 100_000.0 + 10_000.0 - 400.0 - 5_000.0)
+
+    def test_tiers_do_not_block_each_other(self):
+        release = threading.Event()
+
+        def review(command):
+            # Only Manager-tier commands are held up
+            if 2_500 < command.amount <= 10_000:
+                release.wait(5)
+
+        with AsyncApprovalRouter(self.router, workers_per_tier=1, review=review) as desk:
+            manager = [desk.submit(WithdrawCommand(self.alice, 5_000.0)) for _ in range(3)]
+            director = desk.submit(TransferCommand(self.alice, self.bob, 20_000.0))
+            director.result(timeout=5)
+            self.assertEqual(self.bob.balance, 20_000.0)
+            self.assertFalse(any(future.done() for future in manager))
+            release.set()
+            for future in manager:
+                future.result(timeout=5)
+
+    def test_expired_commands_are_not_executed(self):
+        with AsyncApprovalRouter(self.router, workers_per_tier=1, deadline=0.05,
+                                 review=lambda command: time.sleep(0.1)) as desk:
+            future = desk.submit(WithdrawCommand(self.alice, 1_000.0))
+            with self.assertRaises(ApprovalExpired):
+                future.result(timeout=5)
+        self.assertEqual(self.alice.balance, 100_000.0)
+
+    def test_commands_expire_while_the_tier_is_blocked(self):
+        release = threading.Event()
+        with AsyncApprovalRouter(self.router, workers_per_tier=1,
+                                 review=lambda command: release.wait(5)) as desk:
+            blocking = desk.submit(WithdrawCommand(self.alice, 1_000.0))
+            queued = desk.submit(WithdrawCommand(self.alice, 2_000.0), deadline=0.05)
+            # Fails on time even though no worker has picked it up yet
+            with self.assertRaises(ApprovalExpired):
+                queued.result(timeout=2)
+            self.assertFalse(blocking.done())
+            release.set()
+            blocking.result(timeout=5)
+        self.assertEqual(self.alice.balance, 100_000.0 - 1_000.0)
+
+    def test_errors_are_delivered_through_the_future(self):
+        def deny(command):
+            raise PermissionError("risk check failed")
+
+        with AsyncApprovalRouter(self.router, review=deny) as desk:
+            denied = desk.submit(WithdrawCommand(self.alice, 1_000.0))
+            overdrawn = desk.submit(WithdrawCommand(self.bob, 100.0))
+            with self.assertRaises(PermissionError):
+                denied.result(timeout=5)
+            with self.assertRaises(ValueError):
+                overdrawn.result(timeout=5)
+        self.assertEqual(self.alice.balance, 100_000.0)
+
+    def test_commands_no_handler_approves_are_rejected(self):
+        router = ApprovalRouter(build_approval_chain(), {"Director": 50_000.0})
+        with AsyncApprovalRouter(router) as desk:
+            rejected = desk.submit(WithdrawCommand(self.alice, 60_000.0))
+            with self.assertRaises(CommandRejected):
+                rejected.result(timeout=5)
+        self.assertEqual(self.alice.balance, 100_000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import contextlib
+import io
+import random
+import threading
+import unittest
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand
+from executor import CommandBatchExecutor
+from handlers import TellerHandler
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+class TestCommandBatchExecutor(unittest.TestCase):
+    def run_quietly(self, executor, commands):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return executor.execute(commands)
+
+    def test_transfers_conserve_total_money(self):
+        rng = random.Random(3)
+        accounts = [Account(f"Customer {i}", balance=1_000.0) for i in range(20)]
+        commands = []
+        for _ in range(20_000):
+            source, target = rng.sample(accounts, 2)
+            # Whole-dollar amounts keep every balance exact, so totals compare with ==
+            commands.append(TransferCommand(source, target, float(rng.randint(1, 300))))
+
+        result = self.run_quietly(CommandBatchExecutor(max_workers=8), commands)
+
+        self.assertEqual(result.executed + len(result.failed), len(commands))
+        self.assertEqual(sum(account.balance for account in accounts), 20 * 1_000.0)
+        self.assertTrue(all(account.balance >= 0 for account in accounts))
+
+    def test_opposite_transfers_do_not_deadlock(self):
+        alice = Account("Alice", balance=1_000_000.0)
+        bob = Account("Bob", balance=1_000_000.0)
+        commands = []
+        for _ in range(5_000):
+            commands.append(TransferCommand(alice, bob, 1.0))
+            commands.append(TransferCommand(bob, alice, 1.0))
+
+        done = threading.Event()
+        worker = threading.Thread(
+            target=lambda: (self.run_quietly(CommandBatchExecutor(max_workers=2), commands), done.set()),
+            daemon=True)
+        worker.start()
+        self.assertTrue(done.wait(timeout=30), "executor did not finish; transfers deadlocked")
+        self.assertEqual(alice.balance + bob.balance, 2_000_000.0)
+
+    def test_each_account_keeps_submission_order(self):
+        account = Account("Alice")
+        commands = [DepositCommand(account, 100.0), WithdrawCommand(account, 100.0),
+                    DepositCommand(account, 50.0)]
+        result = self.run_quietly(CommandBatchExecutor(max_workers=4), commands)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(account.balance, 50.0)
+
+    def test_failures_are_reported_and_the_batch_continues(self):
+        account = Account("Alice", balance=100.0)
+        commands = [WithdrawCommand(account, 500.0), DepositCommand(account, 25.0)]
+        result = self.run_quietly(CommandBatchExecutor(handler=ApprovalRouter(build_approval_chain())),
+                                  commands)
+        self.assertEqual(result.executed, 1)
+        self.assertEqual([command for command, _ in result.failed], [commands[0]])
+        self.assertEqual(account.balance, 125.0)
+
+    def test_transfers_in_match_sequential_order(self):
+        def scenario():
+            alice = Account("Alice", balance=0.0)
+            bob = Account("Bob", balance=100.0)
+            # Alice can only pay once Bob's transfer has landed, and only once
+            return alice, bob, [TransferCommand(bob, alice, 100.0), WithdrawCommand(alice, 60.0),
+                                WithdrawCommand(alice, 60.0), DepositCommand(bob, 10.0)]
+
+        alice, bob, commands = scenario()
+        for command in commands:
+            try:
+                command.execute()
+            except ValueError:
+                pass
+        expected = (alice.balance, bob.balance)
+
+        for _ in range(20):
+            alice, bob, commands = scenario()
+            result = self.run_quietly(CommandBatchExecutor(max_workers=4), commands)
+            self.assertEqual((alice.balance, bob.balance), expected)
+            self.assertEqual([command for command, _ in result.failed], [commands[2]])
+
+    def test_rejected_commands_are_not_counted_as_executed(self):
+        account = Account("Alice", balance=1_000.0)
+        commands = [WithdrawCommand(account, 501.0), DepositCommand(account, 25.0)]
+        result = self.run_quietly(CommandBatchExecutor(handler=ApprovalRouter(TellerHandler())), commands)
+        self.assertEqual(result.executed, 1)
+        self.assertEqual(result.rejected, [commands[0]])
+        self.assertEqual(result.failed, [])
+        self.assertEqual(account.balance, 1_025.0)
+
+    def test_commands_wait_only_for_earlier_commands_on_their_accounts(self):
+        a, b, c, d = (Account(name) for name in "ABCD")
+        commands = [DepositCommand(a, 1.0), TransferCommand(c, b, 1.0), DepositCommand(d, 1.0),
+                    TransferCommand(b, a, 1.0), DepositCommand(c, 1.0), WithdrawCommand(a, 1.0)]
+        waves = CommandBatchExecutor._split_into_waves(commands)
+        self.assertEqual(waves, [commands[0:3], commands[3:5], commands[5:]])
+
+    def test_transfers_between_different_accounts_run_in_parallel(self):
+        a, b, c, d = (Account(name, balance=10.0) for name in "ABCD")
+        both_running = threading.Barrier(2, timeout=5)
+
+        # The last transfer links all four accounts; the first two still share none
+        commands = [TransferCommand(a, b, 1.0), TransferCommand(c, d, 1.0), TransferCommand(b, c, 5.0)]
+
+        class WaitForEachOther:
+            def handle(self, command):
+                if command is not commands[2]:
+                    both_running.wait()
+                command.execute()
+                return True
+
+        result = self.run_quietly(CommandBatchExecutor(handler=WaitForEachOther(), max_workers=2), commands)
+        self.assertEqual((result.executed, result.waves), (3, 2))
+        self.assertEqual([a.balance, b.balance, c.balance, d.balance], [9.0, 6.0, 14.0, 11.0])
+
+if __name__ == "__main__":
+    unittest.main()
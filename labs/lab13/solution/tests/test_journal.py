@@ -0,0 +1,142 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from account import Account
+from commands import (Command, DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand,
+                      MacroCommand)
+from handlers import TellerHandler
+from journal import CommandJournal
+from router import ApprovalRouter
+
+
+class TestCommandJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "commands.ndjson")
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def run_commands(self, journal, alice, bob, rounds):
+        for i in range(rounds):
+            journal.execute(DepositCommand(alice, 10.25 + i))
+            journal.execute(TransferCommand(alice, bob, 3.1))
+            journal.execute(WithdrawCommand(bob, 1.05))
+            journal.execute(BalanceInquiryCommand(alice))
+
+    def test_recovers_balances_after_restart(self):
+        with CommandJournal(self.path, group_size=7, snapshot_every=50, durable=False) as journal:
+            alice = journal.open_account("Alice", 100.0)
+            bob = Account("Bob")
+            self.run_commands(journal, alice, bob, 40)
+            expected = {"Alice": alice.balance, "Bob": bob.balance}
+
+        with CommandJournal(self.path, durable=False) as recovered:
+            self.assertEqual({owner: account.balance for owner, account in recovered.accounts.items()},
+                             expected)
+
+    def test_recovery_without_snapshot_matches_recovery_with_one(self):
+        with CommandJournal(self.path, snapshot_every=10, durable=False) as journal:
+            alice = journal.open_account("Alice", 100.0)
+            bob = journal.open_account("Bob")
+            self.run_commands(journal, alice, bob, 25)
+        with CommandJournal(self.path, durable=False) as journal:
+            from_snapshot = {owner: account.balance for owner, account in journal.accounts.items()}
+
+        os.remove(self.path + ".snapshot")
+        with CommandJournal(self.path, durable=False) as journal:
+            from_replay = {owner: account.balance for owner, account in journal.accounts.items()}
+        self.assertEqual(from_snapshot, from_replay)
+
+    def test_recovered_journal_keeps_appending(self):
+        with CommandJournal(self.path, durable=False) as journal:
+            journal.execute(DepositCommand(journal.open_account("Alice"), 50.0))
+        with CommandJournal(self.path, durable=False) as journal:
+            alice = journal.open_account("Alice")
+            self.assertEqual(alice.balance, 50.0)
+            journal.execute(WithdrawCommand(alice, 20.0))
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 30.0)
+
+    def test_failed_commands_are_not_journaled(self):
+        with CommandJournal(self.path, durable=False) as journal:
+            alice = journal.open_account("Alice", 10.0)
+            with self.assertRaises(ValueError):
+                journal.execute(WithdrawCommand(alice, 500.0))
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 10.0)
+
+    def test_half_written_last_line_is_dropped(self):
+        with CommandJournal(self.path, durable=False) as journal:
+            journal.execute(DepositCommand(journal.open_account("Alice"), 50.0))
+        with open(self.path, "ab") as f:
+            f.write(b'["deposit","Alice",9')
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 50.0)
+            journal.execute(DepositCommand(journal.accounts["Alice"], 1.0))
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 51.0)
+
+    def test_uncommitted_group_is_not_on_disk(self):
+        journal = CommandJournal(self.path, group_size=100, durable=False)
+        journal.execute(DepositCommand(journal.open_account("Alice"), 50.0))
+        self.assertEqual(os.path.getsize(self.path), 0)
+        journal.flush()
+        self.assertGreater(os.path.getsize(self.path), 0)
+        journal.close()
+
+    def test_commands_go_through_the_handler(self):
+        with CommandJournal(self.path, durable=False, handler=ApprovalRouter(TellerHandler())) as journal:
+            alice = journal.open_account("Alice", 1_000.0)
+            self.assertFalse(journal.execute(WithdrawCommand(alice, 501.0)))
+            self.assertTrue(journal.execute(WithdrawCommand(alice, 100.0)))
+            self.assertEqual(alice.balance, 900.0)
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 900.0)
+
+    def test_macro_commands_are_recovered_as_one_unit(self):
+        with CommandJournal(self.path, durable=False) as journal:
+            alice = journal.open_account("Alice", 100.0)
+            bob = Account("Bob", 10.0)
+            journal.execute(MacroCommand([WithdrawCommand(alice, 5.0), TransferCommand(alice, bob, 20.0),
+                                          MacroCommand([DepositCommand(bob, 1.0), BalanceInquiryCommand(bob)])]))
+            self.assertEqual((alice.balance, bob.balance), (75.0, 31.0))
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 75.0)
+            self.assertEqual(journal.accounts["Bob"].balance, 31.0)
+
+        # A macro line cut short by a crash is dropped whole
+        with open(self.path, "ab") as f:
+            f.write(b'["macro",[["withdraw","Alice",5.0],["withdraw","Alice"')
+        with CommandJournal(self.path, durable=False) as journal:
+            self.assertEqual(journal.accounts["Alice"].balance, 75.0)
+
+    def test_commands_it_cannot_record_are_refused(self):
+        class AuditCommand(Command):
+            def execute(self):
+                raise AssertionError("must not run")
+
+            def __str__(self):
+                return "AuditCommand"
+
+        with CommandJournal(self.path, durable=False) as journal:
+            alice = journal.open_account("Alice", 100.0)
+            macro = MacroCommand([WithdrawCommand(alice, 5.0), AuditCommand()])
+            with self.assertRaises(TypeError):
+                journal.execute(macro)
+            self.assertEqual(alice.balance, 100.0)
+
+    def test_owner_names_must_be_unique(self):
+        with CommandJournal(self.path, durable=False) as journal:
+            journal.open_account("Alice")
+            with self.assertRaises(ValueError):
+                journal.execute(DepositCommand(Account("Alice"), 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import random
+import unittest
+import numpy as np
+from account import Account
+from commands import DepositCommand, WithdrawCommand, TransferCommand, MacroCommand
+from ledger import Ledger, LedgerAccount
+from main import build_approval_chain
+
+
+class TestLedger(unittest.TestCase):
+    def setUp(self):
+        self.ledger = Ledger(capacity=2)
+
+    def test_apply_commands_matches_one_by_one_execution(self):
+        rng = random.Random(1)
+        ids = self.ledger.open_accounts(50, balance=100.0)
+        account_ids = [rng.choice(ids) for _ in range(5_000)]
+        amounts = [float(rng.choice((-1, -1, 1)) * rng.randint(1, 80)) for _ in account_ids]
+
+        # Reference: all deposits first, then withdrawals one by one in batch order
+        expected_balances = [100.0] * 50
+        for account_id, amount in zip(account_ids, amounts):
+            if amount > 0:
+                expected_balances[account_id] += amount
+        expected_applied = []
+        for account_id, amount in zip(account_ids, amounts):
+            if amount > 0:
+                expected_applied.append(True)
+            elif -amount <= expected_balances[account_id]:
+                expected_balances[account_id] += amount
+                expected_applied.append(True)
+            else:
+                expected_applied.append(False)
+
+        applied = self.ledger.apply_commands(account_ids, amounts)
+        self.assertEqual(applied.tolist(), expected_applied)
+        self.assertEqual(self.ledger.balances.tolist(), expected_balances)
+        self.assertFalse(applied.all())
+
+    def test_later_smaller_withdrawal_still_applies_after_a_rejected_one(self):
+        account_id = self.ledger.open_account("Alice", 100.0)
+        applied = self.ledger.apply_commands([account_id] * 3, [-80.0, -50.0, -20.0])
+        self.assertEqual(applied.tolist(), [True, False, True])
+        self.assertEqual(self.ledger.balances[account_id], 0.0)
+
+    def test_zero_amounts_and_unknown_ids(self):
+        account_id = self.ledger.open_account(balance=10.0)
+        self.assertEqual(self.ledger.apply_commands([account_id], [0.0]).tolist(), [False])
+        with self.assertRaises(IndexError):
+            self.ledger.apply_commands([account_id + 1], [5.0])
+
+    def test_growing_keeps_balances(self):
+        first = self.ledger.open_account("Alice", 12.5)
+        self.ledger.open_accounts(1_000, balance=1.0)
+        self.assertEqual(len(self.ledger), 1_001)
+        self.assertEqual(self.ledger.balances[first], 12.5)
+        self.assertEqual(self.ledger.owner(first), "Alice")
+        self.assertEqual(self.ledger.owner(first + 1), f"Account {first + 1}")
+
+    def test_account_views_work_with_existing_commands(self):
+        alice = self.ledger.account(self.ledger.open_account("Alice", 1_000.0))
+        bob = Account("Bob", 0.0)
+        self.assertIsInstance(alice, Account)
+        self.assertIs(self.ledger.account(alice.ledger_id), alice)
+
+        chain = build_approval_chain()
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            chain.handle(DepositCommand(alice, 500.0))
+            chain.handle(WithdrawCommand(alice, 300.0))
+            chain.handle(TransferCommand(alice, bob, 700.0))
+        self.assertIn("[Alice] Transfer: $700.00 to [Bob]", out.getvalue())
+        self.assertEqual(self.ledger.balances[alice.ledger_id], 500.0)
+        self.assertEqual(bob.balance, 700.0)
+        with self.assertRaises(ValueError):
+            alice.withdraw(501.0)
+
+    def test_macro_command_on_account_views(self):
+        alice = self.ledger.account(self.ledger.open_account("Alice", 100.0))
+        bob = self.ledger.account(self.ledger.open_account("Bob", 0.0))
+        macro = MacroCommand([WithdrawCommand(alice, 10.0), TransferCommand(alice, bob, 30.0)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            macro.execute()
+            self.assertEqual(self.ledger.balances.tolist(), [60.0, 30.0])
+            macro.undo()
+            self.assertEqual(self.ledger.balances.tolist(), [100.0, 0.0])
+            # A failing step rolls back the ones before it
+            with self.assertRaises(ValueError):
+                MacroCommand([WithdrawCommand(alice, 50.0), WithdrawCommand(bob, 1.0)]).execute()
+        self.assertEqual(self.ledger.balances.tolist(), [100.0, 0.0])
+
+    def test_view_balance_reflects_bulk_updates(self):
+        view = self.ledger.account(self.ledger.open_account(balance=5.0))
+        self.ledger.apply_commands(np.array([view.ledger_id]), np.array([20.0]))
+        self.assertIsInstance(view, LedgerAccount)
+        self.assertEqual(view.balance, 25.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import contextlib
+import io
+import unittest
+from account import Account
+from commands import Command, DepositCommand, WithdrawCommand, TransferCommand, BalanceInquiryCommand
+from handlers import TellerHandler, AssistantManagerHandler, ManagerHandler, DirectorHandler
+from main import build_approval_chain
+from router import ApprovalRouter
+
+
+class LargeWithdrawCommand(WithdrawCommand):
+    pass
+
+
+class AuditCommand(Command):
+    def execute(self) -> None:
+        print("audit")
+
+    def __str__(self) -> str:
+        return "AuditCommand()"
+
+
+class TestApprovalRouter(unittest.TestCase):
+    def setUp(self):
+        self.chain = build_approval_chain()
+        self.router = ApprovalRouter(self.chain)
+        self.account = Account("Alice", balance=10_000_000.00)
+        self.other = Account("Bob")
+
+    def approvals(self, target, command) -> list:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            target.handle(command)
+        return [line for line in out.getvalue().splitlines() if "Processing" in line or "processing" in line]
+
+    def test_routes_like_the_chain(self):
+        commands = [BalanceInquiryCommand(self.account), DepositCommand(self.account, 50_000.00)]
+        for amount in (0.01, 500.00, 500.01, 2_500.00, 2_500.01, 10_000.00, 10_000.01, 250_000.00):
+            commands.append(WithdrawCommand(self.account, amount))
+            commands.append(TransferCommand(self.account, self.other, amount))
+        for command in commands:
+            with self.subTest(command=str(command)):
+                self.assertEqual(self.approvals(self.router, command), self.approvals(self.chain, command))
+
+    def test_route(self):
+        self.assertIsInstance(self.router.route(WithdrawCommand(self.account, 400.00)), TellerHandler)
+        self.assertIsInstance(self.router.route(WithdrawCommand(self.account, 1_000.00)), AssistantManagerHandler)
+        self.assertIsInstance(self.router.route(TransferCommand(self.account, self.other, 5_000.00)), ManagerHandler)
+        self.assertIsInstance(self.router.route(TransferCommand(self.account, self.other, 50_000.00)), DirectorHandler)
+
+    def test_command_subclass_routes_like_its_base(self):
+        self.assertIsInstance(self.router.route(LargeWithdrawCommand(self.account, 5_000.00)), ManagerHandler)
+
+    def test_unknown_command_falls_back_to_the_chain(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.router.handle(AuditCommand())
+        self.assertIn("[Director] Cannot handle command AuditCommand()", out.getvalue())
+
+    def test_rejected_when_no_handler_has_a_high_enough_limit(self):
+        router = ApprovalRouter(TellerHandler())
+        command = WithdrawCommand(self.account, 501.00)
+        self.assertIsNone(router.route(command))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            router.handle(command)
+        self.assertIn("Command rejected", out.getvalue())
+        self.assertEqual(self.account.balance, 10_000_000.00)
+
+
+class TestApprovalRouterReload(unittest.TestCase):
+    approvals = TestApprovalRouter.approvals
+
+    def setUp(self):
+        self.router = ApprovalRouter(build_approval_chain())
+        self.account = Account("Alice", balance=10_000_000.00)
+
+    def test_limits_default_to_handler_constants(self):
+        self.assertEqual(dict(self.router.table.limits),
+                         {"Teller": 500.0, "Assistant Manager": 2_500.0, "Manager": 10_000.0,
+                          "Director": float("inf")})
+
+    def test_reload_changes_routing(self):
+        command = WithdrawCommand(self.account, 1_000.00)
+        old_table = self.router.table
+        self.router.reload({"Teller": 1_000.0, "Assistant Manager": 5_000.0})
+        self.assertIsInstance(self.router.route(command), TellerHandler)
+        self.assertIsInstance(self.router.route(WithdrawCommand(self.account, 4_000.00)), AssistantManagerHandler)
+        # Tables are never changed in place
+        self.assertIsInstance(old_table.route(command), AssistantManagerHandler)
+
+    def test_invalid_limits_keep_the_current_table(self):
+        table = self.router.table
+        for limits in ({"Cashier": 100.0}, {"Manager": 0.0}, {"Manager": float("nan")},
+                       {"Assistant Manager": 400.0}, {"Teller": 2_500.0}):
+            with self.subTest(limits=limits):
+                with self.assertRaises(ValueError):
+                    self.router.reload(limits)
+                self.assertIs(self.router.table, table)
+
+    def test_reload_applies_to_the_chain(self):
+        self.router.reload({"Teller": 1_000.0, "Assistant Manager": 5_000.0, "Manager": 20_000.0})
+        other = Account("Bob")
+        for amount in (900.00, 1_000.01, 4_000.00, 5_000.01, 15_000.00, 20_000.01):
+            for command in (WithdrawCommand(self.account, amount), TransferCommand(self.account, other, amount)):
+                with self.subTest(command=str(command)):
+                    self.assertEqual(self.approvals(self.router.chain, command),
+                                     self.approvals(self.router, command))
+
+    def test_reload_during_a_chain_walk_uses_one_set_of_limits(self):
+        router = None
+
+        class ReloadingTeller(TellerHandler):
+            def handle(self, command, limits=None):
+                limits = self.limits if limits is None else limits
+                # A reload lands after the walk has started
+                router.reload({"Teller": 1_000.0, "Assistant Manager": 5_000.0, "Manager": 20_000.0})
+                return super().handle(command, limits)
+
+        chain = ReloadingTeller()
+        chain.set_next(AssistantManagerHandler()).set_next(ManagerHandler()).set_next(DirectorHandler())
+        router = ApprovalRouter(chain)
+        # $600 is above the old Teller limit and below the new one: the old Assistant Manager approves it
+        self.assertEqual(self.approvals(chain, WithdrawCommand(self.account, 600.00)),
+                         ["[Assistant Manager] Approving and processing WithdrawCommand(account=Alice, amount=$600.00)"])
+        self.assertEqual(chain.get_next().bounds(chain.limits), (1_000.0, 5_000.0))
+
+    def test_limits_are_read_only(self):
+        with self.assertRaises(TypeError):
+            self.router.table.limits["Teller"] = 1.0
+
+
+if __name__ == "__main__":
+    unittest.main()
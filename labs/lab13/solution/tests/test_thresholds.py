@@ -0,0 +1,71 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from account import Account
+from commands import WithdrawCommand
+from handlers import TellerHandler, AssistantManagerHandler, ManagerHandler
+from main import build_approval_chain
+from router import ApprovalRouter
+from thresholds import ThresholdWatcher, load_approval_limits
+
+
+class TestThresholds(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "approval_limits.json")
+        self.router = ApprovalRouter(build_approval_chain())
+        self.command = WithdrawCommand(Account("Alice", 1_000_000.0), 2_000.0)
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def write(self, config, stamp: int) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(config if isinstance(config, str) else json.dumps(config))
+        # Explicit mtimes, so back-to-back writes always look like a change
+        os.utime(self.path, ns=(stamp, stamp))
+
+    def test_shipped_config_matches_handler_constants(self):
+        here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        limits = load_approval_limits(os.path.join(here, "approval_limits.json"))
+        self.assertEqual(limits, dict(ApprovalRouter(build_approval_chain()).table.limits))
+
+    def test_load_approval_limits(self):
+        self.write({"Teller": 750, "Director": None}, 1)
+        self.assertEqual(load_approval_limits(self.path), {"Teller": 750.0, "Director": float("inf")})
+        for config in ('["Teller"]', '{"Teller": "500"}', '{"Teller": true}', '{"Teller": NaN}',
+                       '{"Teller": Infinity}', '{"Teller": 1e999}', '{"Teller": -1}',
+                       '{"Teller": 600, "Assistant Manager": 500}', '{"Director": null, "Manager": 10000}'):
+            with self.subTest(config=config):
+                self.write(config, 2)
+                with self.assertRaises(ValueError):
+                    load_approval_limits(self.path)
+
+    def test_watcher_reloads_only_when_the_file_changes(self):
+        watcher = ThresholdWatcher(self.path, self.router)
+        self.write({"Teller": 2_000.0}, 1)
+        self.assertTrue(watcher.check())
+        self.assertIsInstance(self.router.route(self.command), TellerHandler)
+        self.assertFalse(watcher.check())
+
+        self.write({"Teller": 500.0, "Assistant Manager": 1_000.0}, 2)
+        self.assertTrue(watcher.check())
+        self.assertIsInstance(self.router.route(self.command), ManagerHandler)
+
+    def test_watcher_keeps_limits_when_the_file_is_invalid(self):
+        watcher = ThresholdWatcher(self.path, self.router)
+        self.write({"Teller": 100.0, "Cashier": 5.0}, 1)
+        self.assertFalse(watcher.check())
+        self.write("{not json", 2)
+        self.assertFalse(watcher.check())
+        self.assertIsInstance(self.router.route(self.command), AssistantManagerHandler)
+
+
+if __name__ == "__main__":
+    unittest.main()
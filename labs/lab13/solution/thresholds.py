@@ -0,0 +1,97 @@
+import json
+import math
+import os
+import threading
+from typing import Dict, Optional
+from router import ApprovalRouter
+
+def load_approval_limits(path: str) -> Dict[str, float]:
+    """
+    Read approval limits from a JSON file mapping handler NAMEs to limits,
+    e.g. {"Teller": 500.0, "Manager": 10000.0, "Director": null}.
+    null means no limit. Handlers left out keep their APPROVAL_LIMIT constant.
+    Handlers are listed in chain order, so the limits must increase; NaN,
+    Infinity and non-positive limits are rejected.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must contain a JSON object of handler name -> limit.")
+    limits = {}
+    previous = None
+    for name, limit in config.items():
+        if limit is None:
+            limit = float("inf")
+        elif isinstance(limit, (int, float)) and not isinstance(limit, bool):
+            limit = float(limit)
+            if not math.isfinite(limit) or limit <= 0:
+                raise ValueError(f"Approval limit for {name} in {path} must be a positive finite number "
+                                 f"(null for no limit), got {limit!r}.")
+        else:
+            raise ValueError(f"Approval limit for {name} in {path} must be a number or null, got {limit!r}.")
+        if previous is not None and not limit > limits[previous]:
+            raise ValueError(f"Approval limit for {name} in {path} ({limit}) must be above the limit "
+                             f"for {previous} ({limits[previous]}).")
+        limits[name] = limit
+        previous = name
+    return limits
+
+
+class ThresholdWatcher:
+    """
+    Keeps an ApprovalRouter's limits in sync with a config file. A background
+    thread checks the file's modification time every interval seconds and,
+    when it changes, loads the file and reloads the router. Commands keep
+    being routed throughout; a file that fails to load or validate is
+    reported and the router keeps its current limits.
+    """
+    def __init__(self, path: str, router: ApprovalRouter, interval: float = 1.0):
+        self.path = path
+        self.router = router
+        self.interval = interval
+        self._stamp: Optional[tuple] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """
+        Reload the router if the file changed since the last check. Returns
+        True if new limits were applied.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError as error:
+            print(f"[ThresholdWatcher] Cannot read {self.path}: {error}")
+            return False
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            table = self.router.reload(load_approval_limits(self.path))
+        except (OSError, ValueError) as error:
+            print(f"[ThresholdWatcher] Keeping current limits; {self.path} is invalid: {error}")
+            return False
+        print(f"[ThresholdWatcher] Loaded approval limits {dict(table.limits)}")
+        return True
+
+    def start(self) -> "ThresholdWatcher":
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="ThresholdWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ThresholdWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()